@@ -41,12 +41,25 @@ class Config(object):
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = os.getenv("REDIS_PORT", 6379)
     REDIS_DB = os.getenv("REDIS_DB", 1)
+    # Pooled redis client used for sessions and the cache, see frontstage/common/redis_client.py
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "1"))
+    REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "1"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1"))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+    REDIS_MAX_RETRIES = int(os.getenv("REDIS_MAX_RETRIES", "2"))
+    REDIS_RETRY_BACKOFF_BASE = float(os.getenv("REDIS_RETRY_BACKOFF_BASE", "0.05"))
+    REDIS_RETRY_BACKOFF_CAP = float(os.getenv("REDIS_RETRY_BACKOFF_CAP", "0.5"))
+    REDIS_DEGRADED_BACKOFF = float(os.getenv("REDIS_DEGRADED_BACKOFF", "5"))
+    REDIS_DEGRADED_THRESHOLD = int(os.getenv("REDIS_DEGRADED_THRESHOLD", "3"))
 
     PASSWORD_MATCH_ERROR_TEXT = "Your passwords do not match"
     PASSWORD_CRITERIA_ERROR_TEXT = "Your password doesn't meet the requirements"
     PASSWORD_MIN_LENGTH = 12
     PASSWORD_MAX_LENGTH = 160
     PASSWORD_RESET_ATTEMPTS_TIMEOUT = int(os.getenv("PASSWORD_RESET_ATTEMPTS_TIMEOUT", "86400"))
+    # A session lasts an hour, an authenticated request only extends it once it has less than this many seconds left
+    SESSION_REFRESH_THRESHOLD = int(os.getenv("SESSION_REFRESH_THRESHOLD", "3300"))
 
     AUTH_URL = os.getenv("AUTH_URL")
     CASE_URL = os.getenv("CASE_URL")
@@ -59,6 +72,31 @@ class Config(object):
     SECURE_MESSAGE_VERSION = os.getenv("SECURE_MESSAGE_VERSION", "v1")
     SURVEY_URL = os.getenv("SURVEY_URL")
 
+    # Pooled http sessions used to call the services above, see frontstage/common/http_client.py
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+    HTTP_RETRY_BACKOFF_FACTOR = float(os.getenv("HTTP_RETRY_BACKOFF_FACTOR", "0.1"))
+    HTTP_SERVICE_OVERRIDES = {
+        "banner": {"read_timeout": float(os.getenv("BANNER_READ_TIMEOUT", "2")), "max_retries": 0},
+        "secure_message": {"max_retries": 10},
+    }
+    # Threads shared by every request in a worker for calling services concurrently, see frontstage/common/fan_out.py
+    FAN_OUT_MAX_WORKERS = int(os.getenv("FAN_OUT_MAX_WORKERS", "32"))
+    FAN_OUT_MAX_CONCURRENCY_PER_REQUEST = int(os.getenv("FAN_OUT_MAX_CONCURRENCY_PER_REQUEST", "8"))
+    SURVEY_LIST_TIMEOUT = float(os.getenv("SURVEY_LIST_TIMEOUT", "20"))
+    SURVEY_LIST_PAGE_SIZE = int(os.getenv("SURVEY_LIST_PAGE_SIZE", "0"))
+    SURVEY_LIST_SNAPSHOT_TTL = float(os.getenv("SURVEY_LIST_SNAPSHOT_TTL", "30"))
+    ENROLMENT_CACHE_TTL = float(os.getenv("ENROLMENT_CACHE_TTL", "30"))
+    EQ_LAUNCH_TIMEOUT = float(os.getenv("EQ_LAUNCH_TIMEOUT", "10"))
+    # Collection instrument downloads are passed through to the respondent this many bytes at a time
+    CI_DOWNLOAD_CHUNK_SIZE = int(os.getenv("CI_DOWNLOAD_CHUNK_SIZE", "65536"))
+    # The banner shown on every page is cached in each worker, see frontstage/common/banner_cache.py
+    BANNER_TIMEOUT = float(os.getenv("BANNER_TIMEOUT", "2"))
+    BANNER_CACHE_TTL = float(os.getenv("BANNER_CACHE_TTL", "15"))
+    BANNER_STALE_TTL = float(os.getenv("BANNER_STALE_TTL", "300"))
+
     EMAIL_MATCH_ERROR_TEXT = "Your email addresses do not match"
 
     RAS_NOTIFY_REQUEST_PASSWORD_CHANGE_TEMPLATE = os.getenv(
@@ -82,9 +120,39 @@ class Config(object):
     SEFT_UPLOAD_BUCKET_NAME = os.getenv("SEFT_UPLOAD_BUCKET_NAME", "test-bucket")
     # Prefix only used for dev environments to file in folders within the bucket
     SEFT_UPLOAD_BUCKET_FILE_PREFIX = os.getenv("SEFT_UPLOAD_BUCKET_FILE_PREFIX")
+    # Encrypted responses are uploaded to the bucket in chunks of this many bytes, it must be a multiple of 256KB
+    SEFT_UPLOAD_CHUNK_SIZE = int(os.getenv("SEFT_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    # Cloud Storage and Pub/Sub clients are shared by every request in a worker, see frontstage/common/gcp_clients.py.
+    # Set STORAGE_EMULATOR_HOST or PUBSUB_EMULATOR_HOST to use an emulator instead.
+    GCS_HTTP_POOL_MAXSIZE = int(os.getenv("GCS_HTTP_POOL_MAXSIZE", "10"))
+    PUBSUB_GRPC_KEEPALIVE_TIME_MS = int(os.getenv("PUBSUB_GRPC_KEEPALIVE_TIME_MS", "30000"))
+    PUBSUB_GRPC_KEEPALIVE_TIMEOUT_MS = int(os.getenv("PUBSUB_GRPC_KEEPALIVE_TIMEOUT_MS", "10000"))
+    # Pub/Sub messages are published in the background, see frontstage/common/publish_queue.py
+    PUBSUB_BATCH_MAX_LATENCY = float(os.getenv("PUBSUB_BATCH_MAX_LATENCY", "0.05"))
+    PUBSUB_BATCH_MAX_MESSAGES = int(os.getenv("PUBSUB_BATCH_MAX_MESSAGES", "100"))
+    PUBSUB_MAX_BUFFERED_MESSAGES = int(os.getenv("PUBSUB_MAX_BUFFERED_MESSAGES", "1000"))
+    PUBSUB_MAX_BUFFERED_BYTES = int(os.getenv("PUBSUB_MAX_BUFFERED_BYTES", str(10 * 1024 * 1024)))
+    PUBSUB_PUBLISH_TIMEOUT = float(os.getenv("PUBSUB_PUBLISH_TIMEOUT", "60"))
+    # Unless set, publishing waits for the message to be delivered.  The messages include email addresses and tokens,
+    # so it should be a directory just for them
+    PUBSUB_SPOOL_DIR = os.getenv("PUBSUB_SPOOL_DIR")
+    PUBSUB_SPOOL_REPLAY_INTERVAL = float(os.getenv("PUBSUB_SPOOL_REPLAY_INTERVAL", "60"))
+    # Case events are posted in the background, see frontstage/common/background_queue.py.  0 workers posts them in
+    # the request instead
+    CASE_EVENT_WORKERS = int(os.getenv("CASE_EVENT_WORKERS", "2"))
+    CASE_EVENT_QUEUE_MAXSIZE = int(os.getenv("CASE_EVENT_QUEUE_MAXSIZE", "1000"))
+    CASE_EVENT_QUEUE_TIMEOUT = float(os.getenv("CASE_EVENT_QUEUE_TIMEOUT", "1"))
+    CASE_EVENT_MAX_RETRIES = int(os.getenv("CASE_EVENT_MAX_RETRIES", "5"))
+    CASE_EVENT_RETRY_BACKOFF_FACTOR = float(os.getenv("CASE_EVENT_RETRY_BACKOFF_FACTOR", "0.5"))
+    CASE_EVENT_FLUSH_TIMEOUT = float(os.getenv("CASE_EVENT_FLUSH_TIMEOUT", "10"))
+    # The case event categories are cached in each worker, see frontstage/common/case_category_cache.py
+    CASE_CATEGORIES_CACHE_TTL = float(os.getenv("CASE_CATEGORIES_CACHE_TTL", "3600"))
+    COLLECTION_EXERCISE_CACHE_TTL = float(os.getenv("COLLECTION_EXERCISE_CACHE_TTL", "60"))
     ONS_GNU_RECIPIENT = os.getenv("ONS_GNU_RECIPIENT")
     ONS_GNU_FINGERPRINT = os.getenv("ONS_GNU_FINGERPRINT")
     ONS_GNU_PUBLIC_CRYPTOKEY = os.getenv("ONS_GNU_PUBLIC_CRYPTOKEY")
+    # gpg (the gpg binary) or sequoia (in process, with pysequoia)
+    SEFT_ENCRYPTION_BACKEND = os.getenv("SEFT_ENCRYPTION_BACKEND", "gpg")
 
     CANARY_GENERATE_ERRORS = bool(strtobool(os.getenv("CANARY_GENERATE_ERRORS", "False")))
     MAX_SHARED_SURVEY = int(os.getenv("MAX_SHARED_SURVEY", "50"))
@@ -147,3 +215,10 @@ class TestingConfig(DevelopmentConfig):
     SECURE_APP = bool(strtobool(os.getenv("SECURE_APP", "False")))
     ACCESS_CONTROL_ALLOW_ORIGIN = os.getenv("ACCESS_CONTROL_ALLOW_ORIGIN", "http://localhost")
     UNDER_MAINTENANCE = bool(strtobool(os.getenv("UNDER_MAINTENANCE", "False")))
+    BANNER_CACHE_TTL = 0
+    BANNER_STALE_TTL = 0
+    CASE_EVENT_WORKERS = 0
+    CASE_CATEGORIES_CACHE_TTL = 0
+    COLLECTION_EXERCISE_CACHE_TTL = 0
+    SURVEY_LIST_SNAPSHOT_TTL = 0
+    ENROLMENT_CACHE_TTL = 0
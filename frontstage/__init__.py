@@ -1,14 +1,14 @@
 import logging
 
 import fakeredis
-import redis
 from flask import render_template
 from flask_talisman import Talisman
 from jinja2 import ChainableUndefined
 from structlog import wrap_logger
 
+from frontstage.common.banner_cache import get_banner
 from frontstage.common.jinja_filters import filter_blueprint
-from frontstage.controllers.banner_controller import current_banner
+from frontstage.common.redis_client import create_redis
 from frontstage.create_app import create_app_object
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -55,7 +55,7 @@ talisman = Talisman(
 )
 
 if not app.config["TESTING"]:
-    redis = redis.Redis(host=app.config["REDIS_HOST"], port=app.config["REDIS_PORT"], db=app.config["REDIS_DB"])
+    redis = create_redis(app.config)
     logger.info("Using real redis")
 else:
     redis = fakeredis.FakeRedis()
@@ -69,7 +69,7 @@ app.register_blueprint(filter_blueprint)
 
 @app.context_processor
 def inject_availability_message():
-    banner = current_banner()
+    banner = get_banner()
     if banner:
         return {"availability_message": banner}
     return {}
@@ -3,14 +3,17 @@ from datetime import datetime
 from functools import wraps
 
 from flask import request
-from jwt import decode
 from jwt.exceptions import DecodeError
 from structlog import wrap_logger
 from werkzeug.exceptions import Unauthorized
 
 from frontstage import app
 from frontstage.common.session import Session
-from frontstage.exceptions.exceptions import JWTTimeoutError, JWTValidationError
+from frontstage.exceptions.exceptions import (
+    JWTTimeoutError,
+    JWTValidationError,
+    SessionStoreUnavailable,
+)
 
 logger = wrap_logger(logging.getLogger(__name__))
 
@@ -28,11 +31,11 @@ def jwt_authorization(request, refresh_session=True):
             if not (session_key := request.cookies.get("authorization")):
                 raise Unauthorized(NO_AUTHORIZATION_COOKIE)
 
-            redis_session = Session.from_session_key(session_key)
+            redis_session = Session.from_request_session_key(session_key)
             validate_jwt(redis_session, session_key)
 
             if refresh_session:
-                redis_session.refresh_session()
+                redis_session.refresh_session(threshold=app.config["SESSION_REFRESH_THRESHOLD"])
 
             return original_function(redis_session, *args, **kwargs)
 
@@ -46,7 +49,7 @@ def validate_jwt(redis_session, session_key):
     if not encoded_jwt:
         raise Unauthorized(NO_ENCODED_JWT)
     try:
-        jwt = decode(encoded_jwt, app.config["JWT_SECRET"], algorithms="HS256")
+        jwt = redis_session.get_decoded_jwt()
     except DecodeError:
         raise JWTValidationError(f"{JWT_DECODE_ERROR} {session_key}")
     _validate_jwt_date(jwt)
@@ -65,10 +68,10 @@ def _validate_jwt_date(token):
 def is_authorization() -> bool:
     authorization = False
     if session_key := request.cookies.get("authorization"):
-        redis_session = Session.from_session_key(session_key)
         try:
+            redis_session = Session.from_request_session_key(session_key)
             validate_jwt(redis_session, session_key)
             authorization = True
-        except (Unauthorized, DecodeError, JWTValidationError, JWTTimeoutError):
+        except (Unauthorized, DecodeError, JWTValidationError, JWTTimeoutError, SessionStoreUnavailable):
             pass
     return authorization
@@ -0,0 +1,204 @@
+import atexit
+import heapq
+import itertools
+import logging
+import queue
+import time
+from collections import deque
+from threading import Lock, Thread
+
+from flask import current_app
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+_STOP = object()
+
+
+class BackgroundQueue:
+    """
+    Runs tasks on background threads so the request that submits them doesn't wait for them to finish.
+
+    Tasks with the same key are always run by the same thread, so they run one at a time in the order they were
+    submitted.  A task that raises an exception is retried, with an exponential backoff, up to max_retries times if
+    retryable(exception) says it's worth trying again, otherwise it's logged and dropped.  While a task waits to be
+    retried the tasks submitted after it with the same key wait with it, but the thread goes on running the tasks for
+    other keys.  Each thread holds at most
+    maxsize tasks, once it's full submit waits up to put_timeout seconds for room before logging and dropping the
+    task.  The threads are started on first use, so each gunicorn worker starts its own after it has forked, and when
+    the app exits they finish the tasks they hold, taking no more than flush_timeout seconds between them.
+
+    With workers=0 tasks are run straight away in the caller's thread, and any exception is raised to the caller.
+    """
+
+    def __init__(self, app, name, workers, maxsize, max_retries, backoff_factor, put_timeout, flush_timeout):
+        self.app = app
+        self.name = name
+        self.workers = workers
+        self.maxsize = maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.put_timeout = put_timeout
+        self.flush_timeout = flush_timeout
+        self.lock = Lock()
+        self.queues = []
+        self.threads = []
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self.dropped = 0
+        self.waiting = 0
+        self.sequence = itertools.count()
+
+    def submit(self, key, task, retryable=None):
+        """
+        Queues a task to be run
+
+        :param key: Tasks with the same key are run in the order they were submitted, e.g. a case id
+        :param task: A callable taking no arguments, run inside an app context
+        :param retryable: A callable that's given the exception a task raised and returns whether to try again.  If
+                          it's not given every exception is retried
+        """
+        if not self.workers:
+            task()
+            return
+
+        if not self.threads:
+            self._start()
+        tasks = self.queues[hash(key) % self.workers]
+        try:
+            tasks.put((key, task, retryable), timeout=self.put_timeout)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+            logger.error("Background queue full, task dropped", queue=self.name, key=key, task=repr(task))
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "workers": len(self.threads),
+                "queued": sum(tasks.qsize() for tasks in self.queues),
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "retried": self.retried,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+
+    def close(self):
+        """Stops the threads once they've run the tasks they hold, waiting up to flush_timeout seconds for them"""
+        with self.lock:
+            queues, threads = self.queues, self.threads
+            self.queues, self.threads = [], []
+        deadline = time.monotonic() + self.flush_timeout
+        for tasks in queues:
+            try:
+                tasks.put(_STOP, timeout=max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                pass
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        with self.lock:
+            unfinished = sum(tasks.qsize() for tasks in queues) + self.waiting
+        if unfinished:
+            logger.error("Background queue closed with tasks unfinished", queue=self.name, unfinished=unfinished)
+
+    def _start(self):
+        with self.lock:
+            if self.threads:
+                return
+            self.queues = [queue.Queue(maxsize=self.maxsize) for _ in range(self.workers)]
+            self.threads = [
+                Thread(target=self._run, args=(tasks,), name=f"{self.name}-{number}", daemon=True)
+                for number, tasks in enumerate(self.queues)
+            ]
+            for thread in self.threads:
+                thread.start()
+        atexit.register(self.close)
+
+    def _run(self, tasks):
+        # The tasks waiting for a retry, along with the tasks submitted after them with the same key, by key
+        waiting = {}
+        # When the first task of each key in waiting is next due to be run, soonest first
+        due = []
+        stopping = False
+        while not stopping or waiting:
+            try:
+                item = tasks.get(timeout=max(due[0][0] - time.monotonic(), 0) if due else None)
+            except queue.Empty:
+                item = None
+            if item is not None:
+                try:
+                    if item is _STOP:
+                        stopping = True
+                    elif item[0] in waiting:
+                        waiting[item[0]].append((*item[1:], 0))
+                        with self.lock:
+                            self.waiting += 1
+                    else:
+                        self._run_tasks(item[0], deque([(*item[1:], 0)]), waiting, due)
+                finally:
+                    tasks.task_done()
+            while due and due[0][0] <= time.monotonic():
+                key = heapq.heappop(due)[2]
+                held = waiting.pop(key)
+                with self.lock:
+                    self.waiting -= len(held)
+                self._run_tasks(key, held, waiting, due)
+
+    def _run_tasks(self, key, held, waiting, due):
+        """Runs a key's tasks in order until one of them is to be retried, which then holds up the rest"""
+        while held:
+            task, retryable, attempt = held[0]
+            if self._run_task(key, task, retryable, attempt):
+                held[0] = (task, retryable, attempt + 1)
+                waiting[key] = held
+                with self.lock:
+                    self.waiting += len(held)
+                heapq.heappush(due, (time.monotonic() + self.backoff_factor * 2**attempt, next(self.sequence), key))
+                return
+            held.popleft()
+
+    def _run_task(self, key, task, retryable, attempt) -> bool:
+        """Runs a task, returning whether it's to be retried"""
+        try:
+            with self.app.app_context():
+                task()
+        except Exception as exception:
+            if attempt >= self.max_retries or (retryable and not retryable(exception)):
+                with self.lock:
+                    self.failed += 1
+                logger.error("Background task failed", queue=self.name, key=key, attempts=attempt + 1, exc_info=True)
+                return False
+            with self.lock:
+                self.retried += 1
+            return True
+        with self.lock:
+            self.completed += 1
+        return False
+
+
+def init_app(app):
+    app.extensions["case_event_queue"] = BackgroundQueue(
+        app,
+        "case-events",
+        workers=app.config["CASE_EVENT_WORKERS"],
+        maxsize=app.config["CASE_EVENT_QUEUE_MAXSIZE"],
+        max_retries=app.config["CASE_EVENT_MAX_RETRIES"],
+        backoff_factor=app.config["CASE_EVENT_RETRY_BACKOFF_FACTOR"],
+        put_timeout=app.config["CASE_EVENT_QUEUE_TIMEOUT"],
+        flush_timeout=app.config["CASE_EVENT_FLUSH_TIMEOUT"],
+    )
+
+
+def case_event_queue() -> BackgroundQueue:
+    """
+    Returns the app's queue for posting case events
+
+    :return: A BackgroundQueue
+    """
+    return current_app.extensions["case_event_queue"]
+
+
+def stats() -> dict:
+    return {"case_events": case_event_queue().stats()}
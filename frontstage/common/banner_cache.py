@@ -0,0 +1,114 @@
+import logging
+import time
+from concurrent.futures import Future
+from threading import Lock
+
+from flask import current_app
+from structlog import wrap_logger
+
+from frontstage.common import http_client
+from frontstage.controllers import banner_controller
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+class BannerCache:
+    """
+    Keeps the active banner in memory so rendering a page doesn't call the banner service.
+
+    For BANNER_CACHE_TTL seconds the banner is served as is.  After that, for up to BANNER_STALE_TTL seconds more, it's
+    still served while a single background refresh fetches the new one.  Only once it's older than that (or on the
+    first render) does a render wait on the banner service, and then for no longer than BANNER_TIMEOUT seconds.  Only
+    one of the renders waiting calls the banner service, the others wait for its result.  A failed call keeps the
+    banner already held, and isn't retried until BANNER_CACHE_TTL seconds later.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.ttl = app.config["BANNER_CACHE_TTL"]
+        self.stale_ttl = app.config["BANNER_STALE_TTL"]
+        self.timeout = app.config["BANNER_TIMEOUT"]
+        self.lock = Lock()
+        self.banner = None
+        self.fresh_until = 0
+        self.stale_until = 0
+        self.refreshing = False
+        self.fetching = None
+
+    def get(self) -> str:
+        now = time.monotonic()
+        with self.lock:
+            if self.banner is not None and now < self.fresh_until:
+                return self.banner
+            if self.banner is not None and now < self.stale_until:
+                if not self.refreshing:
+                    self.refreshing = True
+                    self.app.extensions["fan_out_executor"].submit(self._background_refresh)
+                return self.banner
+            fetch = self.fetching
+            if fetch is None:
+                fetch = self.fetching = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            # Another render is already calling the banner service, so wait for its result instead
+            return fetch.result()
+        try:
+            banner = self.refresh()
+        except Exception as exception:
+            fetch.set_exception(exception)
+            raise
+        else:
+            fetch.set_result(banner)
+            return banner
+        finally:
+            with self.lock:
+                self.fetching = None
+
+    def refresh(self) -> str:
+        """
+        Fetches the banner from the banner service and stores it
+
+        :return: The banner now held, which is the previous one if the banner service couldn't be reached
+        """
+        with self.app.app_context():
+            token = http_client.request_deadline.set(time.monotonic() + self.timeout)
+            try:
+                banner = banner_controller.fetch_banner()
+            finally:
+                http_client.request_deadline.reset(token)
+
+        now = time.monotonic()
+        with self.lock:
+            self.fresh_until = now + self.ttl
+            if banner is not None:
+                self.banner = banner
+                self.stale_until = self.fresh_until + self.stale_ttl
+            elif self.banner is None or now >= self.stale_until:
+                self.banner = ""
+                self.stale_until = self.fresh_until + self.stale_ttl
+            return self.banner
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.error("Failed to refresh banner", exc_info=True)
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+
+def init_app(app):
+    app.extensions["banner_cache"] = BannerCache(app)
+
+
+def get_banner() -> str:
+    """
+    Returns the active banner from the app's banner cache
+
+    :return: The banner text, if any, else an empty string
+    """
+    return current_app.extensions["banner_cache"].get()
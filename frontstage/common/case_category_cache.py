@@ -0,0 +1,66 @@
+import logging
+import time
+from threading import Lock
+
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+class CaseCategoryCache:
+    """
+    Keeps the names of the case event categories in memory so validating a case event doesn't call the case service.
+
+    They're fetched on first use.  Once they're older than CASE_CATEGORIES_CACHE_TTL seconds they're refreshed by a
+    single background refresh, while the names already held carry on being used.  A failed refresh keeps the names
+    already held, and isn't retried until CASE_CATEGORIES_CACHE_TTL seconds later.  A TTL of 0 turns the cache off.
+    """
+
+    def __init__(self, app, fetch):
+        """
+        :param app: The app
+        :param fetch: A callable returning the category names, called in an app context
+        """
+        self.app = app
+        self.fetch = fetch
+        self.ttl = app.config["CASE_CATEGORIES_CACHE_TTL"]
+        self.lock = Lock()
+        self.categories = None
+        self.fresh_until = 0
+        self.refreshing = False
+
+    def get(self) -> frozenset:
+        if not self.ttl:
+            return frozenset(self.fetch())
+
+        with self.lock:
+            if self.categories is not None:
+                if time.monotonic() >= self.fresh_until and not self.refreshing:
+                    self.refreshing = True
+                    self.app.extensions["fan_out_executor"].submit(self._background_refresh)
+                return self.categories
+        return self.refresh()
+
+    def refresh(self) -> frozenset:
+        """
+        Fetches the category names from the case service and stores them
+
+        :return: The category names
+        """
+        with self.app.app_context():
+            categories = frozenset(self.fetch())
+        with self.lock:
+            self.categories = categories
+            self.fresh_until = time.monotonic() + self.ttl
+        return categories
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.error("Failed to refresh case categories", exc_info=True)
+            with self.lock:
+                self.fresh_until = time.monotonic() + self.ttl
+        finally:
+            with self.lock:
+                self.refreshing = False
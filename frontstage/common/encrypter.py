@@ -1,20 +1,54 @@
 import json
 import logging
+from threading import Lock
 
+from flask import current_app
 from sdc.crypto.encrypter import encrypt
-from sdc.crypto.key_store import KeyStore, validate_required_keys
+from sdc.crypto.key_store import Key, KeyStore, validate_required_keys
 from structlog import wrap_logger
 
 logger = wrap_logger(logging.getLogger(__name__))
 
 KEY_PURPOSE = "authentication"
 
+_lock = Lock()
+
+
+class _Key(Key):
+    """A Key that builds its JWK once, rather than parsing the PEM (and rebuilding an RSA private key) every time"""
+
+    def __init__(self, key: Key):
+        super().__init__(key.kid, key.purpose, key.key_type, key.value, key.service)
+        self.jwk = super().as_jwk()
+
+    def as_jwk(self):
+        return self.jwk
+
 
 class Encrypter:
+    """
+    Encrypts the tokens used to launch EQ.  The keys are parsed once, so one Encrypter should be kept and shared, see
+    get_encrypter.  reload swaps in a new set of keys, e.g. when they're rotated, without stopping any encryption
+    that's already under way.
+    """
+
     def __init__(self, json_secret_keys):
+        self.json_secret_keys = None
+        self.key_store = None
+        self.reload(json_secret_keys)
+
+    def reload(self, json_secret_keys):
+        """
+        Replaces the keys used to encrypt
+
+        :param json_secret_keys: The key set as a JSON string
+        """
         keys = json.loads(json_secret_keys)
         validate_required_keys(keys, KEY_PURPOSE)
-        self.key_store = KeyStore(keys)
+        key_store = KeyStore(keys)
+        key_store.keys = {kid: _Key(key) for kid, key in key_store.keys.items()}
+        self.key_store, self.json_secret_keys = key_store, json_secret_keys
+        logger.info("Loaded keys for encryption", kids=sorted(key_store.keys))
 
     def encrypt(self, payload, service):
         """
@@ -28,3 +62,30 @@ class Encrypter:
             payload, key_store=self.key_store, key_purpose=KEY_PURPOSE, encryption_for_service=service
         )
         return encrypted_data
+
+
+def init_app(app):
+    # The keys aren't required to start, without them the encrypter is created (and fails) on first use instead
+    if app.config["JSON_SECRET_KEYS"]:
+        app.extensions["eq_encrypter"] = Encrypter(app.config["JSON_SECRET_KEYS"])
+
+
+def get_encrypter() -> Encrypter:
+    """
+    Returns the app's encrypter for EQ launch tokens.  If JSON_SECRET_KEYS has changed since its keys were loaded
+    they're reloaded first, so rotating the keys only needs the config to be updated.
+
+    :return: An Encrypter
+    """
+    app = current_app._get_current_object()
+    json_secret_keys = app.config["JSON_SECRET_KEYS"]
+    encrypter = app.extensions.get("eq_encrypter")
+    if encrypter is None or encrypter.json_secret_keys != json_secret_keys:
+        with _lock:
+            encrypter = app.extensions.get("eq_encrypter")
+            if encrypter is None:
+                encrypter = Encrypter(json_secret_keys)
+                app.extensions["eq_encrypter"] = encrypter
+            elif encrypter.json_secret_keys != json_secret_keys:
+                encrypter.reload(json_secret_keys)
+    return encrypter
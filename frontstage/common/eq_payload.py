@@ -7,6 +7,7 @@ import iso8601
 from flask import current_app
 from structlog import wrap_logger
 
+from frontstage.common.fan_out import FanOut
 from frontstage.common.redis_cache import RedisCache
 from frontstage.controllers import (
     collection_exercise_controller,
@@ -19,44 +20,66 @@ logger = wrap_logger(logging.getLogger(__name__))
 
 
 class EqPayload(object):
-    def create_payload(self, case, ce, party_id: str, business_party_id: str, survey) -> dict:
+    def create_payload(
+        self,
+        case,
+        ce,
+        party_id: str,
+        business_party_id: str,
+        survey,
+        timings: dict = None,
+    ) -> dict:
         """
         Creates the payload needed to communicate with EQ, built from the Case, Collection Exercise, Party,
-        Survey and Collection Instrument services
+        Survey and Collection Instrument services.
+
+        The collection instrument (followed by its registry instrument), the business and the collection exercise
+        events are fetched concurrently, and all within EQ_LAUNCH_TIMEOUT seconds.
         :param case: A dict containing information about the case
         :param ce: A dict containing information about the collection exercise
         :param party_id: The uuid of the respondent
         :param business_party_id: The uuid of the reporting unit
         :param survey: A dict containing information about the survey
+        :param timings: If given, the seconds each fetch took are added to it, keyed by what was fetched
         :returns: Payload for EQ
         """
-        redis_cache = RedisCache()
+        timings = {} if timings is None else timings
         tx_id = str(uuid.uuid4())
         logger.info("Creating payload for JWT", case_id=case["id"], tx_id=tx_id)
         ce_id = ce["id"]
         ci_id = case["collectionInstrumentId"]
-        ci = collection_instrument_controller.get_collection_instrument(
-            ci_id, current_app.config["COLLECTION_INSTRUMENT_URL"], current_app.config["BASIC_AUTH"]
-        )
-        if ci["type"] != "EQ":
-            raise InvalidEqPayLoad(f"Collection instrument {ci_id} type is not EQ")
-
-        classifiers = ci["classifiers"]
-        if not classifiers or not classifiers.get("eq_id") or not classifiers.get("form_type"):
-            raise InvalidEqPayLoad(f"Collection instrument {ci_id} classifiers are incorrect or missing")
 
-        form_type = classifiers["form_type"]
-        eq_id = ci["classifiers"]["eq_id"]
-
-        registry_instrument = redis_cache.get_registry_instrument(ce_id, form_type)
-
-        party = party_controller.get_party_by_business_id(
+        fan_out = FanOut(timeout=current_app.config["EQ_LAUNCH_TIMEOUT"])
+        fan_out.submit("collection_instrument", self._get_instruments, ci_id, ce_id, timings)
+        fan_out.submit(
+            "business_party",
+            self._timed,
+            timings,
+            "business_party",
+            party_controller.get_party_by_business_id,
             business_party_id,
             current_app.config["PARTY_URL"],
             current_app.config["BASIC_AUTH"],
             collection_exercise_id=ce_id,
         )
-        ce_events = collection_exercise_controller.get_collection_exercise_events(ce_id)
+        # Cached, see collection_exercise_controller, so repeat launches for the same collection exercise reuse them
+        fan_out.submit(
+            "ce_events",
+            self._timed,
+            timings,
+            "ce_events",
+            collection_exercise_controller.get_collection_exercise_events,
+            ce_id,
+        )
+        results, failures = fan_out.gather()
+        # Raised in this order so a collection instrument that isn't valid for EQ is reported ahead of anything else
+        for key in ("collection_instrument", "business_party", "ce_events"):
+            if key in failures:
+                raise failures[key]
+
+        form_type, eq_id, registry_instrument = results["collection_instrument"]
+        party = results["business_party"]
+        ce_events = results["ce_events"]
         ru_ref = f"{party['sampleUnitRef'] + party['checkletter']}"
         int_time = int(time.time())
 
@@ -104,6 +127,43 @@ class EqPayload(object):
 
         return payload
 
+    def _get_instruments(self, ci_id, ce_id, timings) -> tuple:
+        """
+        Gets the collection instrument, checks it can be launched in EQ, then gets its registry instrument
+
+        :return: A tuple of the form type, the eq id and the registry instrument (None if there isn't one)
+        :raises InvalidEqPayLoad: If the collection instrument isn't an EQ or is missing its eq_id or form_type
+        """
+        ci = self._timed(
+            timings,
+            "collection_instrument",
+            collection_instrument_controller.get_collection_instrument,
+            ci_id,
+            current_app.config["COLLECTION_INSTRUMENT_URL"],
+            current_app.config["BASIC_AUTH"],
+        )
+        if ci["type"] != "EQ":
+            raise InvalidEqPayLoad(f"Collection instrument {ci_id} type is not EQ")
+
+        classifiers = ci["classifiers"]
+        if not classifiers or not classifiers.get("eq_id") or not classifiers.get("form_type"):
+            raise InvalidEqPayLoad(f"Collection instrument {ci_id} classifiers are incorrect or missing")
+
+        form_type = classifiers["form_type"]
+        eq_id = classifiers["eq_id"]
+        registry_instrument = self._timed(
+            timings, "registry_instrument", RedisCache().get_registry_instrument, ce_id, form_type
+        )
+        return form_type, eq_id, registry_instrument
+
+    @staticmethod
+    def _timed(timings, stage, function, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings[stage] = round(time.monotonic() - start, 3)
+
     def _find_event_date_by_tag(self, search_param, collex_events, collex_id, mandatory=True):
         """
         Finds the required date from the list of all the events
@@ -0,0 +1,113 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from flask import current_app
+from structlog import wrap_logger
+
+from frontstage.common import http_client
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, key):
+        super().__init__(f"Deadline exceeded before {key} completed")
+        self.key = key
+
+
+class FanOut:
+    """
+    Runs independent downstream calls for a single request concurrently on the app's shared thread pool.
+
+    At most max_concurrency calls from one FanOut are in flight at a time, the rest wait in a backlog.  Every call
+    inherits the FanOut's deadline, which also caps the http timeouts of any service calls it makes.  A failing call
+    never stops the others; its exception is handed back to the caller alongside the successful results.
+    """
+
+    def __init__(self, max_concurrency: int = None, timeout: float = None):
+        self.app = current_app._get_current_object()
+        self.executor = self.app.extensions["fan_out_executor"]
+        self.max_concurrency = max_concurrency or self.app.config["FAN_OUT_MAX_CONCURRENCY_PER_REQUEST"]
+        self.deadline = http_client.request_deadline.get()
+        if timeout:
+            own_deadline = time.monotonic() + timeout
+            self.deadline = min(self.deadline, own_deadline) if self.deadline else own_deadline
+        self.backlog = []
+        self.in_flight = {}
+
+    def submit(self, key, function, *args, **kwargs):
+        """
+        Queues function(*args, **kwargs) to run, its outcome is reported against key
+
+        :param key: A hashable identifier for the call, unique within this FanOut
+        :param function: The function to call
+        """
+        self.backlog.append((key, function, args, kwargs))
+        self._fill()
+
+    def as_completed(self):
+        """
+        Yields (key, result, exception) for each call as it finishes, including calls submitted while iterating.
+        Calls still outstanding when the deadline passes are cancelled and reported with a DeadlineExceeded.
+        """
+        while self.in_flight:
+            done, _ = wait(self.in_flight, timeout=self._remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                yield from self._expire()
+                return
+            for future in done:
+                key = self.in_flight.pop(future)
+                self._fill()
+                exception = future.exception()
+                yield key, None if exception else future.result(), exception
+
+    def gather(self) -> tuple[dict, dict]:
+        """
+        Waits for every submitted call
+
+        :return: A pair of dicts keyed on the submitted keys, the first of results and the second of exceptions
+        """
+        results, failures = {}, {}
+        for key, result, exception in self.as_completed():
+            if exception:
+                failures[key] = exception
+            else:
+                results[key] = result
+        return results, failures
+
+    def _fill(self):
+        while self.backlog and len(self.in_flight) < self.max_concurrency:
+            key, function, args, kwargs = self.backlog.pop(0)
+            future = self.executor.submit(self._run, function, args, kwargs)
+            self.in_flight[future] = key
+
+    def _run(self, function, args, kwargs):
+        with self.app.app_context():
+            token = http_client.request_deadline.set(self.deadline)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                http_client.request_deadline.reset(token)
+
+    def _remaining(self):
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0)
+
+    def _expire(self):
+        outstanding = list(self.in_flight.values()) + [key for key, *_ in self.backlog]
+        logger.error("Deadline exceeded waiting for downstream calls", outstanding=len(outstanding))
+        for future in self.in_flight:
+            future.cancel()
+        self.in_flight = {}
+        self.backlog = []
+        for key in outstanding:
+            yield key, None, DeadlineExceeded(key)
+
+
+def init_app(app):
+    # Threads are only started on first submit, so none exist before gunicorn forks the workers
+    app.extensions["fan_out_executor"] = ThreadPoolExecutor(
+        max_workers=app.config["FAN_OUT_MAX_WORKERS"], thread_name_prefix="fan-out"
+    )
@@ -0,0 +1,115 @@
+import functools
+import logging
+import os
+from threading import Lock
+
+from flask import current_app
+from google.cloud import pubsub_v1, storage
+from google.pubsub_v1.services.publisher.transports import PublisherGrpcTransport
+from requests.adapters import HTTPAdapter
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+class GcpClients:
+    """
+    Holds one Cloud Storage client and one Pub/Sub publisher for the lifetime of the app, so SEFT uploads and notify
+    messages reuse their credentials, connections and (for Pub/Sub) gRPC channel and batching threads rather than
+    creating them for every request.
+
+    The clients are created on first use rather than at start up, so each gunicorn worker creates its own after it has
+    forked.  If STORAGE_EMULATOR_HOST or PUBSUB_EMULATOR_HOST is set the client talks to that emulator instead, without
+    credentials.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = Lock()
+        self._storage = None
+        self._publisher = None
+
+    def storage_client(self) -> storage.Client:
+        if self._storage is None:
+            with self.lock:
+                if self._storage is None:
+                    self._storage = self._create_storage()
+        return self._storage
+
+    def publisher(self) -> pubsub_v1.PublisherClient:
+        if self._publisher is None:
+            with self.lock:
+                if self._publisher is None:
+                    self._publisher = self._create_publisher()
+        return self._publisher
+
+    def close(self):
+        with self.lock:
+            if self._storage is not None:
+                self._storage.close()
+                self._storage = None
+            if self._publisher is not None:
+                self._publisher.stop()
+                self._publisher = None
+
+    def _create_storage(self) -> storage.Client:
+        pool_maxsize = self.config["GCS_HTTP_POOL_MAXSIZE"]
+        logger.info("Creating storage client", emulator=os.getenv("STORAGE_EMULATOR_HOST"), pool_maxsize=pool_maxsize)
+        client = storage.Client(project=self.config["SEFT_UPLOAD_PROJECT"])
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        client._http.mount("http://", adapter)
+        client._http.mount("https://", adapter)
+        return client
+
+    def _create_publisher(self) -> pubsub_v1.PublisherClient:
+        emulator = os.getenv("PUBSUB_EMULATOR_HOST")
+        logger.info("Creating pubsub publisher", emulator=emulator)
+        batch_settings = pubsub_v1.types.BatchSettings(
+            max_latency=self.config["PUBSUB_BATCH_MAX_LATENCY"],
+            max_messages=self.config["PUBSUB_BATCH_MAX_MESSAGES"],
+        )
+        publisher_options = pubsub_v1.types.PublisherOptions(
+            flow_control=pubsub_v1.types.PublishFlowControl(
+                message_limit=self.config["PUBSUB_MAX_BUFFERED_MESSAGES"],
+                byte_limit=self.config["PUBSUB_MAX_BUFFERED_BYTES"],
+                limit_exceeded_behavior=pubsub_v1.types.LimitExceededBehavior.ERROR,
+            ),
+            timeout=self.config["PUBSUB_PUBLISH_TIMEOUT"],
+        )
+        if emulator:
+            # The publisher creates an insecure channel to the emulator itself
+            return pubsub_v1.PublisherClient(batch_settings, publisher_options)
+        transport = functools.partial(PublisherGrpcTransport, channel=self._create_channel)
+        return pubsub_v1.PublisherClient(batch_settings, publisher_options, transport=transport)
+
+    def _create_channel(self, host, options=(), **kwargs):
+        channel_options = dict(options)
+        channel_options.update(
+            {
+                "grpc.keepalive_time_ms": self.config["PUBSUB_GRPC_KEEPALIVE_TIME_MS"],
+                "grpc.keepalive_timeout_ms": self.config["PUBSUB_GRPC_KEEPALIVE_TIMEOUT_MS"],
+            }
+        )
+        return PublisherGrpcTransport.create_channel(host, options=list(channel_options.items()), **kwargs)
+
+
+def init_app(app):
+    app.extensions["gcp_clients"] = GcpClients(app.config)
+
+
+def storage_client() -> storage.Client:
+    """
+    Returns the app's Cloud Storage client
+
+    :return: A storage client shared by every request in the worker
+    """
+    return current_app.extensions["gcp_clients"].storage_client()
+
+
+def publisher() -> pubsub_v1.PublisherClient:
+    """
+    Returns the app's Pub/Sub publisher
+
+    :return: A publisher client shared by every request in the worker
+    """
+    return current_app.extensions["gcp_clients"].publisher()
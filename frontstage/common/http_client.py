@@ -0,0 +1,159 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from structlog import wrap_logger
+from urllib3 import Retry
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+RETRY_STATUS_CODES = (502, 503, 504)
+
+# A time.monotonic() value that calls made in the current context must finish by, see frontstage.common.fan_out
+request_deadline = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline(timeout: float):
+    """
+    Gives the calls made inside the block, including by any FanOut started in it, timeout seconds between them.  An
+    earlier deadline already in place is kept.
+
+    :param timeout: The seconds the calls have
+    """
+    own_deadline = time.monotonic() + timeout
+    current = request_deadline.get()
+    token = request_deadline.set(min(current, own_deadline) if current is not None else own_deadline)
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+
+class ServiceSession(requests.Session):
+    """
+    A requests session for a single downstream service.  Connections are kept alive in per-host pools so repeated
+    calls to the same service reuse an open TCP connection rather than opening a new one each time.
+    """
+
+    def __init__(self, name, pool_maxsize, connect_timeout, read_timeout, max_retries, backoff_factor):
+        super().__init__()
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        retries = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retries)
+        self.mount("http://", self.adapter)
+        self.mount("https://", self.adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        if (deadline := request_deadline.get()) is not None:
+            kwargs["timeout"] = self._cap_timeout(kwargs["timeout"], deadline - time.monotonic())
+        return super().request(method, url, **kwargs)
+
+    def _cap_timeout(self, timeout, remaining):
+        if remaining <= 0:
+            raise requests.exceptions.Timeout(f"Deadline exceeded before calling {self.name}")
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) if value else remaining for value in timeout)
+        return min(timeout, remaining) if timeout else remaining
+
+    def stats(self) -> dict:
+        """
+        Returns the connection counters for this session.  A pool hit is a request served on a connection that was
+        already open, a pool miss is a request that had to open a new connection.
+        """
+        pools = self.adapter.poolmanager.pools
+        requests_made = 0
+        connections_opened = 0
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                # The pool was evicted between listing the keys and reading it
+                continue
+            requests_made += pool.num_requests
+            connections_opened += pool.num_connections
+
+        pool_hits = max(requests_made - connections_opened, 0)
+        return {
+            "host_pools": len(pools),
+            "requests": requests_made,
+            "pool_hits": pool_hits,
+            "pool_misses": connections_opened,
+            "connection_reuse_ratio": round(pool_hits / requests_made, 3) if requests_made else 0.0,
+        }
+
+
+class HttpClient:
+    """
+    Holds one ServiceSession per downstream service for the lifetime of the app.  Pool size, timeouts and retry
+    policy come from the HTTP_* config values and can be overridden per service with HTTP_SERVICE_OVERRIDES.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.sessions = {}
+        self.lock = Lock()
+
+    def service(self, name: str) -> ServiceSession:
+        session = self.sessions.get(name)
+        if session is None:
+            with self.lock:
+                session = self.sessions.get(name)
+                if session is None:
+                    session = self._create_session(name)
+                    self.sessions[name] = session
+        return session
+
+    def stats(self) -> dict:
+        # Copied under the lock as another thread may be adding a session, the counters are then read outside it
+        with self.lock:
+            sessions = dict(self.sessions)
+        return {name: session.stats() for name, session in sessions.items()}
+
+    def close(self):
+        with self.lock:
+            sessions, self.sessions = self.sessions, {}
+        for session in sessions.values():
+            session.close()
+
+    def _create_session(self, name: str) -> ServiceSession:
+        settings = {
+            "pool_maxsize": self.config["HTTP_POOL_MAXSIZE"],
+            "connect_timeout": self.config["HTTP_CONNECT_TIMEOUT"],
+            "read_timeout": self.config["HTTP_READ_TIMEOUT"],
+            "max_retries": self.config["HTTP_MAX_RETRIES"],
+            "backoff_factor": self.config["HTTP_RETRY_BACKOFF_FACTOR"],
+        }
+        settings.update(self.config["HTTP_SERVICE_OVERRIDES"].get(name, {}))
+        logger.info("Creating pooled http session", service=name, **settings)
+        return ServiceSession(name, **settings)
+
+
+def init_app(app):
+    app.extensions["http_client"] = HttpClient(app.config)
+
+
+def service(name: str) -> ServiceSession:
+    """
+    Returns the pooled session for the named downstream service, e.g. service("party").get(url, auth=...)
+
+    :param name: The name of the service (party, case, collection_exercise, etc)
+    :return: A requests session with keep-alive connection pools, default timeouts and retries
+    """
+    return current_app.extensions["http_client"].service(name)
+
+
+def stats() -> dict:
+    return current_app.extensions["http_client"].stats()
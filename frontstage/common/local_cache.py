@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+MISSING = object()
+
+_caches = {}
+
+
+class LocalCache:
+    """
+    A bounded in-memory cache private to the worker process.  Entries expire after a TTL and, once the cache is
+    full, the least recently used entry is evicted to make room for a new one.
+
+    Values are stored already decoded and the same object is handed to every caller, so callers must not mutate
+    what they get back.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl: float):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _caches[namespace] = self
+
+    def get(self, key, default=MISSING):
+        """
+        Gets a value from the cache
+
+        :param key: The key of the value
+        :param default: Returned if the key isn't in the cache or has expired.  Defaults to MISSING so that a cached
+                        None can be told apart from a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def stats() -> dict:
+    """Returns the hit, miss and eviction counts of every local cache, keyed by namespace"""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+def clear_all():
+    for cache in _caches.values():
+        cache.clear()
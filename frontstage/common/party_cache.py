@@ -0,0 +1,176 @@
+import json
+import logging
+import math
+from threading import Lock
+
+from flask import current_app as app
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
+from frontstage import redis
+from frontstage.common import redis_client
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+VERSION = "version"
+
+_caches = {}
+
+
+class PartyCache:
+    """
+    Values cached in redis per respondent, e.g. their enrolments.  Being in redis they're shared by every worker, so
+    invalidating a respondent's values takes effect everywhere at once.  Each respondent's values are kept in one
+    hash, so a read is a single round trip and invalidating drops all of them together.
+
+    Invalidating bumps a version kept in the hash, and a value is only used while the version it was fetched at is
+    still the current one, so a value fetched while the respondent's data was changing is never used.  The version is
+    counted by redis rather than taken from a clock, so it doesn't depend on the clocks of the pods agreeing.  Values
+    expire with the hash, which expires at most the TTL after the first value is saved in it.  Values are decoded
+    afresh on every read, so callers are free to change what they get back.
+    """
+
+    def __init__(self, namespace: str, ttl_setting: str):
+        """
+        :param namespace: Names the cache in its redis keys and stats
+        :param ttl_setting: The config setting holding how many seconds values are used for, 0 turns the cache off
+        """
+        self.namespace = namespace
+        self.ttl_setting = ttl_setting
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated_misses = 0
+        self.saves = 0
+        self.invalidations = 0
+        self.errors = 0
+        _caches[namespace] = self
+
+    def get(self, party_id: str, name: str):
+        """
+        Gets one of a respondent's values
+
+        :param party_id: The uuid of the respondent
+        :param name: Which of the respondent's values to get
+        :return: The value, or None if there isn't one, it's expired, or it was fetched before the respondent's values
+                 were last invalidated
+        """
+        ttl = app.config[self.ttl_setting]
+        if not ttl or redis_client.cache.degraded():
+            return None
+        try:
+            cached, version = redis.hmget(self._key(party_id), name, VERSION)
+        except RedisError:
+            self._count("errors")
+            redis_client.cache.record_failure()
+            logger.error("Error getting from party cache", namespace=self.namespace, party_id=party_id, exc_info=True)
+            return None
+        redis_client.cache.record_success()
+
+        if cached is None:
+            self._count("misses")
+            return None
+        cached = json.loads(cached)
+        if cached["version"] != int(version or 0):
+            self._count("misses", "invalidated_misses")
+            return None
+        self._count("hits")
+        return cached["value"]
+
+    def version(self, party_id: str):
+        """
+        Gets the version of a respondent's values, to be read before fetching a value and passed to save
+
+        :param party_id: The uuid of the respondent
+        :return: The version, or None if the cache isn't being used
+        """
+        ttl = app.config[self.ttl_setting]
+        if not ttl or redis_client.cache.degraded():
+            return None
+        try:
+            version = redis.hget(self._key(party_id), VERSION)
+        except RedisError:
+            self._count("errors")
+            redis_client.cache.record_failure()
+            logger.error(
+                "Error getting party cache version", namespace=self.namespace, party_id=party_id, exc_info=True
+            )
+            return None
+        redis_client.cache.record_success()
+        return int(version or 0)
+
+    def save(self, party_id: str, name: str, value, version: int):
+        """
+        Saves one of a respondent's values, to be used until it expires or the respondent's values are invalidated
+
+        :param party_id: The uuid of the respondent
+        :param name: Which of the respondent's values it is
+        :param value: The value, which must be JSON serialisable
+        :param version: The version from before the value started being fetched, so a value that was being fetched
+                        while the respondent's data changed isn't used.  None doesn't save the value.
+        """
+        ttl = app.config[self.ttl_setting]
+        if not ttl or version is None or redis_client.cache.degraded():
+            return
+        try:
+            pipeline = redis.pipeline()
+            pipeline.hset(self._key(party_id), name, json.dumps({"version": version, "value": value}))
+            # Saving doesn't push back when the hash expires, so the values already in it don't outlive the TTL
+            pipeline.expire(self._key(party_id), math.ceil(ttl), nx=True)
+            pipeline.execute()
+            redis_client.cache.record_success()
+            self._count("saves")
+        except RedisError:
+            self._count("errors")
+            redis_client.cache.record_failure()
+            # Not bubbling the exception up as the cache is only an optimisation
+            logger.error("Error saving to party cache", namespace=self.namespace, party_id=party_id, exc_info=True)
+
+    def invalidate(self, *party_ids: str):
+        """
+        Stops the values of respondents being used, called when frontstage changes their data.  Changes made
+        elsewhere are picked up once the values expire.
+
+        :param party_ids: The uuids of the respondents
+        """
+        ttl = app.config[self.ttl_setting]
+        if not ttl or redis_client.cache.degraded():
+            return
+        try:
+            pipeline = redis.pipeline()
+            for party_id in party_ids:
+                # The old values are left to expire, but no longer match the version, nor does a value already being
+                # fetched when it's saved.  The version is kept for the TTL, as a value may be fetched for that long.
+                pipeline.hincrby(self._key(party_id), VERSION, 1)
+                pipeline.expire(self._key(party_id), math.ceil(ttl))
+            pipeline.execute()
+            redis_client.cache.record_success()
+            self._count("invalidations")
+        except RedisError:
+            self._count("errors")
+            redis_client.cache.record_failure()
+            logger.error("Error invalidating party cache", namespace=self.namespace, party_ids=party_ids, exc_info=True)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidated_misses": self.invalidated_misses,
+                "saves": self.saves,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+    def _count(self, *counters: str):
+        with self.lock:
+            for counter in counters:
+                setattr(self, counter, getattr(self, counter) + 1)
+
+    def _key(self, party_id: str) -> str:
+        return f"frontstage:{self.namespace}:{party_id}"
+
+
+def stats() -> dict:
+    """Returns the hit, miss and invalidation counts of this worker's party caches, keyed by namespace"""
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
@@ -0,0 +1,282 @@
+import base64
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from threading import Event, Lock, Thread
+
+from flask import current_app
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+SPOOL_SUFFIX = ".json"
+
+
+class PublishQueue:
+    """
+    Publishes Pub/Sub messages without making the request wait for them to be delivered, once there's a spool to keep
+    the messages that can't be.
+
+    The publisher batches messages (PUBSUB_BATCH_*) and sends them from its own thread, retrying transient errors for
+    up to PUBSUB_PUBLISH_TIMEOUT seconds.  No more than PUBSUB_MAX_BUFFERED_MESSAGES (or _BYTES) are held waiting to
+    be sent.
+
+    With PUBSUB_SPOOL_DIR set, publish() hands the message to the publisher and returns straight away.  A message that
+    doesn't fit or still couldn't be delivered is written to a file in the spool, and published again after the next
+    successful delivery, at most every PUBSUB_SPOOL_REPLAY_INTERVAL seconds, by the queue's own replay thread.  The
+    messages hold email addresses and tokens, so the directory is only readable by the app's user.  Spooled messages
+    survive a Pub/Sub outage and a restart of the app, but not the loss of the disk they're on.
+
+    Without it, a message that couldn't be delivered would be lost with the caller none the wiser, so publish() waits
+    for it to be delivered and raises if it isn't, as publishing did before the queue.
+    """
+
+    def __init__(self, config):
+        self.spool_dir = config["PUBSUB_SPOOL_DIR"]
+        self.publish_timeout = config["PUBSUB_PUBLISH_TIMEOUT"]
+        self.replay_interval = config["PUBSUB_SPOOL_REPLAY_INTERVAL"]
+        self.lock = Lock()
+        self.next_replay = 0
+        self.replay_requested = Event()
+        self.replay_publisher = None
+        self.replay_thread = None
+        self.pending = 0
+        self.published = 0
+        self.failed = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        if self.spool_dir:
+            self._make_spool_dir()
+            self._recover_claimed()
+
+    def publish(self, publisher, topic_path: str, data: bytes, **attributes):
+        """
+        Queues a message to be published, or publishes it if there's no spool
+
+        :param publisher: The pubsub publisher to publish with
+        :param topic_path: The topic to publish to
+        :param data: The message
+        :param attributes: Any attributes of the message
+        :raises OSError: If the message couldn't be queued and couldn't be spooled either
+        :raises Exception: Whatever the publisher raised, if there's no spool and the message couldn't be delivered
+        """
+        if not self.spool_dir:
+            self._publish_and_wait(publisher, topic_path, data, attributes)
+        elif not self._publish(publisher, topic_path, data, attributes):
+            self._spool(topic_path, data, attributes)
+
+    def replay_spool(self, publisher):
+        """
+        Publishes the messages in the spool again.  Each is claimed by renaming it first, so a message is only
+        replayed by one worker at a time, and it's deleted once it's been delivered.
+
+        :param publisher: The pubsub publisher to publish with
+        """
+        if not self.spool_dir:
+            return
+        try:
+            file_names = sorted(name for name in os.listdir(self.spool_dir) if name.endswith(SPOOL_SUFFIX))
+        except FileNotFoundError:
+            return
+
+        for file_name in file_names:
+            path = os.path.join(self.spool_dir, file_name)
+            claimed_path = f"{path}.{os.getpid()}"
+            try:
+                os.rename(path, claimed_path)
+                with open(claimed_path) as spooled_file:
+                    message = json.load(spooled_file)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError):
+                logger.error("Unable to read spooled pubsub message", path=path, exc_info=True)
+                continue
+
+            logger.info("Replaying spooled pubsub message", path=path, topic_path=message["topic_path"])
+            data = base64.b64decode(message["data"])
+            if not self._publish(publisher, message["topic_path"], data, message["attributes"], claimed_path):
+                self._release(claimed_path)
+                return
+
+    def stats(self) -> dict:
+        try:
+            spool_files = sum(1 for name in os.listdir(self.spool_dir) if name.endswith(SPOOL_SUFFIX))
+        except (FileNotFoundError, TypeError):
+            spool_files = 0
+        with self.lock:
+            return {
+                "pending": self.pending,
+                "published": self.published,
+                "failed": self.failed,
+                "spooled": self.spooled,
+                "replayed": self.replayed,
+                "spool_files": spool_files,
+                "average_latency": round(self.total_latency / self.published, 3) if self.published else 0.0,
+                "max_latency": round(self.max_latency, 3),
+            }
+
+    def _publish_and_wait(self, publisher, topic_path, data, attributes):
+        queued_at = time.monotonic()
+        future = publisher.publish(topic_path, data=data, **attributes)
+        with self.lock:
+            self.pending += 1
+        try:
+            msg_id = future.result(timeout=self.publish_timeout)
+        except Exception:
+            with self.lock:
+                self.pending -= 1
+                self.failed += 1
+            logger.error("Publish to pubsub failed", topic_path=topic_path, exc_info=True)
+            raise
+        self._published(msg_id, topic_path, time.monotonic() - queued_at)
+
+    def _published(self, msg_id, topic_path, latency):
+        with self.lock:
+            self.pending -= 1
+            self.published += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+        logger.info("Publish succeeded", msg_id=msg_id, topic_path=topic_path, latency=round(latency, 3))
+
+    def _publish(self, publisher, topic_path, data, attributes, claimed_path=None) -> bool:
+        try:
+            future = publisher.publish(topic_path, data=data, **attributes)
+        except Exception:
+            # Most likely more messages are waiting to be sent than PUBSUB_MAX_BUFFERED_MESSAGES allows
+            logger.warning("Unable to queue message for pubsub", topic_path=topic_path, exc_info=True)
+            return False
+
+        with self.lock:
+            self.pending += 1
+        callback = functools.partial(
+            self._on_delivery, publisher, topic_path, data, attributes, claimed_path, time.monotonic()
+        )
+        future.add_done_callback(callback)
+        return True
+
+    def _on_delivery(self, publisher, topic_path, data, attributes, claimed_path, queued_at, future):
+        latency = time.monotonic() - queued_at
+        try:
+            msg_id = future.result()
+        except Exception:
+            with self.lock:
+                self.pending -= 1
+                self.failed += 1
+            logger.error("Publish to pubsub failed", topic_path=topic_path, exc_info=True)
+            if claimed_path:
+                self._release(claimed_path)
+                return
+            try:
+                self._spool(topic_path, data, attributes)
+            except OSError:
+                logger.critical("Pubsub message lost", topic_path=topic_path, attributes=attributes, exc_info=True)
+            return
+
+        self._published(msg_id, topic_path, latency)
+        with self.lock:
+            replay = time.monotonic() >= self.next_replay
+            if replay:
+                self.next_replay = time.monotonic() + self.replay_interval
+
+        if claimed_path:
+            with self.lock:
+                self.replayed += 1
+            try:
+                os.remove(claimed_path)
+            except FileNotFoundError:
+                pass
+        if replay:
+            self._request_replay(publisher)
+
+    def _request_replay(self, publisher):
+        # Delivery callbacks run on the publisher's threads, which shouldn't be kept busy reading files
+        with self.lock:
+            self.replay_publisher = publisher
+            if self.replay_thread is None:
+                self.replay_thread = Thread(target=self._replay, name="pubsub-spool-replay", daemon=True)
+                self.replay_thread.start()
+        self.replay_requested.set()
+
+    def _replay(self):
+        while True:
+            self.replay_requested.wait()
+            self.replay_requested.clear()
+            try:
+                self.replay_spool(self.replay_publisher)
+            except Exception:
+                logger.error("Unable to replay the pubsub spool", exc_info=True)
+
+    def _make_spool_dir(self):
+        os.makedirs(self.spool_dir, mode=0o700, exist_ok=True)
+        # makedirs doesn't change an existing directory
+        os.chmod(self.spool_dir, 0o700)
+
+    def _recover_claimed(self):
+        """Returns messages claimed by a process that's no longer running, e.g. one killed mid-replay, to the spool"""
+        try:
+            file_names = os.listdir(self.spool_dir)
+        except FileNotFoundError:
+            return
+        for file_name in file_names:
+            spooled_name, _, pid = file_name.rpartition(".")
+            if not spooled_name.endswith(SPOOL_SUFFIX) or not pid.isdigit() or _is_running(int(pid)):
+                continue
+            logger.info("Recovering pubsub message claimed by a stopped process", file_name=file_name)
+            self._release(os.path.join(self.spool_dir, file_name))
+
+    def _spool(self, topic_path, data, attributes):
+        self._make_spool_dir()
+        message = {"topic_path": topic_path, "data": base64.b64encode(data).decode(), "attributes": attributes}
+        path = os.path.join(self.spool_dir, f"{time.time_ns()}-{uuid.uuid4()}{SPOOL_SUFFIX}")
+        # Written under another name first, so replay_spool never sees half a file
+        with os.fdopen(os.open(f"{path}.tmp", os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as spool_file:
+            json.dump(message, spool_file)
+        os.replace(f"{path}.tmp", path)
+        with self.lock:
+            self.spooled += 1
+        logger.warning("Spooled pubsub message to be published later", path=path, topic_path=topic_path)
+
+    @staticmethod
+    def _release(claimed_path):
+        try:
+            os.rename(claimed_path, claimed_path.rsplit(".", 1)[0])
+        except OSError:
+            logger.error("Unable to return pubsub message to the spool", path=claimed_path, exc_info=True)
+
+
+def _is_running(pid: int) -> bool:
+    if pid == os.getpid():
+        # This process hasn't claimed anything yet, so it's a previous process that had the same pid
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def init_app(app):
+    app.extensions["publish_queue"] = PublishQueue(app.config)
+
+
+def publish(publisher, topic_path: str, data: bytes, **attributes):
+    """
+    Queues a message to be published by the app's publish queue, see PublishQueue
+
+    :param publisher: The pubsub publisher to publish with
+    :param topic_path: The topic to publish to
+    :param data: The message
+    :param attributes: Any attributes of the message
+    """
+    current_app.extensions["publish_queue"].publish(publisher, topic_path, data, **attributes)
+
+
+def stats() -> dict:
+    return current_app.extensions["publish_queue"].stats()
@@ -6,6 +6,9 @@ from redis.exceptions import RedisError
 from structlog import wrap_logger
 
 from frontstage import redis
+from frontstage.common import redis_client
+from frontstage.common.fan_out import FanOut
+from frontstage.common.local_cache import MISSING, LocalCache
 from frontstage.controllers.collection_instrument_controller import (
     get_collection_instrument,
     get_registry_instrument,
@@ -15,57 +18,222 @@ logger = wrap_logger(logging.getLogger(__name__))
 
 
 class RedisCache:
+    """
+    Caches reference data from other services in redis, shared by every worker.  In front of redis each worker
+    keeps its own small in-memory cache of already decoded values, so repeat lookups don't need a round trip to
+    redis at all.  The in-memory entries expire before the redis ones, so a worker is never more out of date than
+    redis is.
+
+    The cache is only an optimisation, so if redis can't be reached it's treated as a miss and, while redis is in
+    degraded mode, not called at all.
+    """
+
     COLLECTION_INSTRUMENT_EXPIRY_IN_SECONDS = 600
     COLLECTION_REGISTRY_EXPIRY_IN_SECONDS = 600
+    COLLECTION_REGISTRY_NOT_FOUND_EXPIRY_IN_SECONDS = 60
+    LOCAL_EXPIRY_IN_SECONDS = 300
+    LOCAL_MAX_ENTRIES = 1000
+
+    collection_instruments = LocalCache("collection-instrument", LOCAL_MAX_ENTRIES, LOCAL_EXPIRY_IN_SECONDS)
+    registry_instruments = LocalCache("registry-instrument", LOCAL_MAX_ENTRIES, LOCAL_EXPIRY_IN_SECONDS)
 
     def get_collection_instrument(self, key):
         """
-        Gets the collection-instrument from redis or the collection-instrument service
+        Gets the collection-instrument from the local cache, redis or the collection-instrument service
 
         :param key: Key in redis (for this example will be a frontstage:collection-instrument:id)
         :return: Result from either the cache or collection instrument service
         """
-        redis_key = f"frontstage:collection-instrument:{key}"
-        try:
-            result = redis.get(redis_key)
-        except RedisError:
-            logger.error("Error getting value from cache, please investigate", key=redis_key, exc_info=True)
-            result = None
+        result = self.collection_instruments.get(key)
+        if result is not MISSING:
+            return result
 
+        redis_key = f"frontstage:collection-instrument:{key}"
+        result = self._get(redis_key)
         if not result:
             logger.info("Key not in cache, getting value from collection instrument service", key=redis_key)
             result = get_collection_instrument(key, app.config["COLLECTION_INSTRUMENT_URL"], app.config["BASIC_AUTH"])
             self.save(redis_key, result, self.COLLECTION_INSTRUMENT_EXPIRY_IN_SECONDS)
-            return result
+        else:
+            result = json.loads(result.decode("utf-8"))
+
+        self.collection_instruments.set(key, result)
+        return result
+
+    def get_collection_instruments(self, collection_instrument_ids) -> dict:
+        """
+        Gets many collection-instruments at once.  Those not in the local cache are read from redis in a single MGET,
+        only the ones missing from redis too are fetched from the collection-instrument service (concurrently), and
+        those are written back to redis in a single pipeline.
 
-        return json.loads(result.decode("utf-8"))
+        :param collection_instrument_ids: The ids of the collection instruments
+        :return: A dict of collection instruments keyed by id.  Any that couldn't be retrieved are logged and left out
+        """
+        collection_instruments = {}
+        not_local = []
+        for collection_instrument_id in dict.fromkeys(collection_instrument_ids):
+            result = self.collection_instruments.get(collection_instrument_id)
+            if result is MISSING:
+                not_local.append(collection_instrument_id)
+            else:
+                collection_instruments[collection_instrument_id] = result
+
+        if not not_local:
+            return collection_instruments
+
+        redis_keys = [f"frontstage:collection-instrument:{key}" for key in not_local]
+        cached = self._mget(redis_keys)
+
+        misses = []
+        for collection_instrument_id, result in zip(not_local, cached):
+            if result:
+                result = json.loads(result.decode("utf-8"))
+                collection_instruments[collection_instrument_id] = result
+                self.collection_instruments.set(collection_instrument_id, result)
+            else:
+                misses.append(collection_instrument_id)
+
+        if not misses:
+            return collection_instruments
+
+        logger.info("Keys not in cache, getting values from collection instrument service", keys=len(misses))
+        fan_out = FanOut()
+        for collection_instrument_id in misses:
+            fan_out.submit(
+                collection_instrument_id,
+                get_collection_instrument,
+                collection_instrument_id,
+                app.config["COLLECTION_INSTRUMENT_URL"],
+                app.config["BASIC_AUTH"],
+            )
+        fetched, failures = fan_out.gather()
+        for collection_instrument_id, exception in failures.items():
+            logger.error(
+                "Failed to get collection instrument",
+                collection_instrument_id=collection_instrument_id,
+                error=repr(exception),
+            )
 
-    def get_registry_instrument(self, collection_exercise_id: str, form_type: str) -> dict:
+        self.save_many(
+            {f"frontstage:collection-instrument:{key}": value for key, value in fetched.items()},
+            self.COLLECTION_INSTRUMENT_EXPIRY_IN_SECONDS,
+        )
+        for collection_instrument_id, result in fetched.items():
+            self.collection_instruments.set(collection_instrument_id, result)
+        collection_instruments.update(fetched)
+        return collection_instruments
+
+    def get_registry_instrument(self, collection_exercise_id: str, form_type: str) -> dict | None:
         """
-        Gets the registry-instrument from redis or the collection-instrument service
+        Gets the registry-instrument from the local cache, redis or the collection-instrument service.  Not finding
+        one is cached too, but only for a short time so a registry instrument added later (or a transient error from
+        the collection-instrument service) isn't remembered for long.
 
         :param collection_exercise_id: Key in redis
         :param form_type: Key in redis
-        :return: Result from either the cache or collection instrument service
+        :return: Result from either the cache or collection instrument service, None if there isn't one
         """
-        redis_key = f"frontstage:registry-instrument:{collection_exercise_id}:{form_type})"
-        result = redis.get(redis_key)
+        result = self.registry_instruments.get((collection_exercise_id, form_type))
+        if result is not MISSING:
+            return result
+
+        redis_key = self._registry_instrument_key(collection_exercise_id, form_type)
+        result = self._get(redis_key)
         if not result:
             logger.info("Key not in cache, getting value from collection instrument service", key=redis_key)
             result = get_registry_instrument(collection_exercise_id, form_type)
-            self.save(redis_key, result, self.COLLECTION_REGISTRY_EXPIRY_IN_SECONDS)
-            return result
+            expiry = (
+                self.COLLECTION_REGISTRY_EXPIRY_IN_SECONDS
+                if result is not None
+                else self.COLLECTION_REGISTRY_NOT_FOUND_EXPIRY_IN_SECONDS
+            )
+            self.save(redis_key, result, expiry)
+        else:
+            result = json.loads(result.decode("utf-8"))
+
+        ttl = None if result is not None else self.COLLECTION_REGISTRY_NOT_FOUND_EXPIRY_IN_SECONDS
+        self.registry_instruments.set((collection_exercise_id, form_type), result, ttl=ttl)
+        return result
 
-        return json.loads(result.decode("utf-8"))
+    def invalidate_registry_instrument(self, collection_exercise_id: str, form_type: str):
+        """
+        Removes a registry-instrument from the local cache and redis, so the next lookup goes to the
+        collection-instrument service.  Other workers will keep their local copy until it expires.
+
+        :param collection_exercise_id: The collection exercise the registry instrument is for
+        :param form_type: The form type the registry instrument is for
+        """
+        self.registry_instruments.delete((collection_exercise_id, form_type))
+        redis_key = self._registry_instrument_key(collection_exercise_id, form_type)
+        try:
+            redis.delete(redis_key)
+        except RedisError:
+            redis_client.cache.record_failure()
+            logger.error("Error deleting key, please investigate", key=redis_key, exc_info=True)
+            return
+        redis_client.cache.record_success()
+
+    @staticmethod
+    def _registry_instrument_key(collection_exercise_id: str, form_type: str) -> str:
+        return f"frontstage:registry-instrument:{collection_exercise_id}:{form_type}"
+
+    @staticmethod
+    def _get(key):
+        if redis_client.cache.degraded():
+            return None
+        try:
+            value = redis.get(key)
+        except RedisError:
+            redis_client.cache.record_failure()
+            logger.error("Error getting value from cache, please investigate", key=key, exc_info=True)
+            return None
+        redis_client.cache.record_success()
+        return value
+
+    @staticmethod
+    def _mget(keys):
+        if redis_client.cache.degraded():
+            return [None] * len(keys)
+        try:
+            values = redis.mget(keys)
+        except RedisError:
+            redis_client.cache.record_failure()
+            logger.error("Error getting values from cache, please investigate", keys=len(keys), exc_info=True)
+            return [None] * len(keys)
+        redis_client.cache.record_success()
+        return values
 
     @staticmethod
     def save(key, value, expiry):
         if not expiry:
             logger.error("Expiry must be provided")
             raise ValueError("Expiry must be provided")
+        if redis_client.cache.degraded():
+            return
         try:
             redis.set(key, json.dumps(value), ex=expiry)
+            redis_client.cache.record_success()
         except RedisError:
+            redis_client.cache.record_failure()
             # Not bubbling the exception up as not being able to save to the cache isn't fatal, it'll just impact
             # performance
             logger.error("Error saving key, please investigate", key=key, exc_info=True)
+
+    @staticmethod
+    def save_many(values: dict, expiry):
+        if not expiry:
+            logger.error("Expiry must be provided")
+            raise ValueError("Expiry must be provided")
+        if not values or redis_client.cache.degraded():
+            return
+        try:
+            pipeline = redis.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.set(key, json.dumps(value), ex=expiry)
+            pipeline.execute()
+            redis_client.cache.record_success()
+        except RedisError:
+            redis_client.cache.record_failure()
+            # Not bubbling the exception up as not being able to save to the cache isn't fatal, it'll just impact
+            # performance
+            logger.error("Error saving keys, please investigate", keys=len(values), exc_info=True)
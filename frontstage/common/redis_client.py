@@ -0,0 +1,117 @@
+import logging
+import time
+from threading import Lock
+
+import redis
+from flask import current_app
+from redis.backoff import ExponentialWithJitterBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+from redis.retry import Retry
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+def create_redis(config) -> redis.Redis:
+    """
+    Creates the redis client shared by the whole worker.  Connections come from a bounded pool (a thread waits up to
+    REDIS_POOL_TIMEOUT for one rather than opening more), every command has a socket timeout, idle connections are
+    health checked before reuse, and connection errors and timeouts are retried with a jittered exponential backoff.
+
+    :param config: The app config
+    :return: A redis client
+    """
+    retry = Retry(
+        ExponentialWithJitterBackoff(cap=config["REDIS_RETRY_BACKOFF_CAP"], base=config["REDIS_RETRY_BACKOFF_BASE"]),
+        config["REDIS_MAX_RETRIES"],
+    )
+    pool = redis.BlockingConnectionPool(
+        host=config["REDIS_HOST"],
+        port=config["REDIS_PORT"],
+        db=config["REDIS_DB"],
+        max_connections=config["REDIS_MAX_CONNECTIONS"],
+        timeout=config["REDIS_POOL_TIMEOUT"],
+        socket_connect_timeout=config["REDIS_CONNECT_TIMEOUT"],
+        socket_timeout=config["REDIS_SOCKET_TIMEOUT"],
+        socket_keepalive=True,
+        health_check_interval=config["REDIS_HEALTH_CHECK_INTERVAL"],
+        retry=retry,
+        retry_on_error=[ConnectionError, TimeoutError],
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+class Breaker:
+    """
+    Tracks whether one kind of redis use (e.g. sessions) has been failing.  After REDIS_DEGRADED_THRESHOLD consecutive
+    failures it's degraded for REDIS_DEGRADED_BACKOFF seconds: callers that can manage without redis (e.g. the caches)
+    should skip it rather than wait on another timeout, and those that can't (e.g. sessions) should fail fast.  A
+    single failure once the backoff is over degrades it again, until a success resets it.
+
+    Each kind of use has its own breaker, so a failing optional cache can't stop respondents signing in.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = Lock()
+        self.degraded_until = 0
+        self.consecutive_failures = 0
+        self.failures = 0
+
+    def degraded(self) -> bool:
+        return time.monotonic() < self.degraded_until
+
+    def record_failure(self):
+        config = current_app.config
+        with self.lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            tripped = self.consecutive_failures >= config["REDIS_DEGRADED_THRESHOLD"]
+            if tripped:
+                self.degraded_until = time.monotonic() + config["REDIS_DEGRADED_BACKOFF"]
+        if tripped:
+            logger.warning(
+                "Redis unavailable, running in degraded mode",
+                breaker=self.name,
+                consecutive_failures=self.consecutive_failures,
+            )
+
+    def record_success(self):
+        if self.consecutive_failures:
+            with self.lock:
+                self.consecutive_failures = 0
+
+    def reset(self):
+        with self.lock:
+            self.degraded_until = 0
+            self.consecutive_failures = 0
+
+    def stats(self) -> dict:
+        return {
+            "degraded": self.degraded(),
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+        }
+
+
+# Sessions can't work without redis, the caches (collection instruments, survey list snapshots, enrolments) can
+sessions = Breaker("sessions")
+cache = Breaker("cache")
+
+
+def stats(client: redis.Redis) -> dict:
+    """Returns the connection pool utilisation of the client and whether each kind of redis use is degraded"""
+    pool = client.connection_pool
+    if isinstance(pool, redis.BlockingConnectionPool):
+        created = sum(1 for connection in pool._connections if connection is not None)
+        available = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+    else:
+        created = pool._created_connections
+        available = len(pool._available_connections)
+    return {
+        "max_connections": pool.max_connections,
+        "connections": created,
+        "in_use": created - available,
+        "available": available,
+        "breakers": {breaker.name: breaker.stats() for breaker in (sessions, cache)},
+    }
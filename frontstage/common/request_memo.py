@@ -0,0 +1,38 @@
+import logging
+from functools import wraps
+
+from flask import g, has_request_context
+from structlog import wrap_logger
+
+logger = wrap_logger(logging.getLogger(__name__))
+
+
+def request_memoized(original_function):
+    """
+    Remembers what a function returned for the rest of the current request, so calling it again with the same
+    arguments doesn't go back to the downstream service.  Exceptions aren't remembered, and outside of a request
+    (e.g. in a fan-out thread) the function is always called.
+
+    The same object is handed to every caller in the request, so callers must not mutate what they get back.
+    """
+
+    @wraps(original_function)
+    def request_memoized_wrapper(*args, **kwargs):
+        if not has_request_context():
+            return original_function(*args, **kwargs)
+
+        key = (original_function, args, tuple(sorted(kwargs.items())))
+        memo = g.setdefault("request_memo", {})
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable arguments, can't be remembered
+            return original_function(*args, **kwargs)
+
+        result = original_function(*args, **kwargs)
+        memo[key] = result
+        return result
+
+    return request_memoized_wrapper
@@ -1,13 +1,32 @@
+import logging
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+from flask import g, has_request_context
+from redis.exceptions import RedisError
+from structlog import wrap_logger
+
 from frontstage import jwt, redis
+from frontstage.common import redis_client
+from frontstage.exceptions.exceptions import SessionStoreUnavailable
+
+logger = wrap_logger(logging.getLogger(__name__))
 
 
 class Session(object):
-    def __init__(self, session_key, encoded_jwt_token):
+    """
+    A respondent's signed in session, a JWT held in redis under the key in their authorization cookie.
+
+    If redis can't be reached, reading or creating a session raises SessionStoreUnavailable (straight away while
+    redis is in degraded mode) rather than treating the respondent as signed out.  Failing to extend or delete a
+    session is only logged, the session just expires at its previous time.
+    """
+
+    def __init__(self, session_key, encoded_jwt_token, decoded_jwt=None):
         self.encoded_jwt_token = encoded_jwt_token
         self.session_key = session_key
+        # The decoded claims are kept so the JWT is only decoded once however many times they're read
+        self.decoded_jwt = decoded_jwt
 
     @classmethod
     def from_session_key(cls, session_key):
@@ -15,11 +34,23 @@ class Session(object):
         if session_key is None:
             encoded_jwt_token = None
         else:
-            encoded_jwt_token = redis.get(session_key)
+            encoded_jwt_token = _call_redis("get", session_key)
         session = cls(session_key, encoded_jwt_token)
 
         return session
 
+    @classmethod
+    def from_request_session_key(cls, session_key):
+        """Get the session for the current request, it's only read from redis (and the JWT decoded) once per
+        request however many times it's asked for"""
+        if not has_request_context():
+            return cls.from_session_key(session_key)
+        session = g.get("redis_session")
+        if session is None or session.session_key != session_key:
+            session = cls.from_session_key(session_key)
+            g.redis_session = session
+        return session
+
     @classmethod
     def from_party_id(cls, party_id):
         """Create a new session object from a party_id, this will encode a JWT
@@ -31,21 +62,38 @@ class Session(object):
         }
         encoded_jwt_token = jwt.encode(data_dict)
         session_key = str(uuid4())
-        session = cls(session_key, encoded_jwt_token)
+        session = cls(session_key, encoded_jwt_token, data_dict)
         session.set()
         return session
 
-    def refresh_session(self):
-        """Refresh a session by setting a new expiry timestamp"""
-        decoded_jwt = self.get_decoded_jwt()
-        decoded_jwt["expires_in"] = _get_new_timestamp()
-        self.encoded_jwt_token = jwt.encode(decoded_jwt)
-        self.set()
+    def refresh_session(self, threshold=None):
+        """Refresh a session by setting a new expiry timestamp.  If a threshold is given the session is only refreshed
+        once it has less than that many seconds left, so a respondent clicking around doesn't cause a redis write on
+        every request
+
+        :param threshold: Seconds of the session left below which it's refreshed, None to always refresh
+        :return: True if the session was refreshed
+        """
+        if threshold is not None and self.get_expires_in() - datetime.now().timestamp() > threshold:
+            return False
+        previous = self.encoded_jwt_token, self.decoded_jwt
+        self.decoded_jwt = dict(self.get_decoded_jwt(), expires_in=_get_new_timestamp())
+        self.encoded_jwt_token = jwt.encode(self.decoded_jwt)
+        try:
+            self.set()
+        except SessionStoreUnavailable:
+            logger.error("Failed to refresh session", exc_info=True)
+            self.encoded_jwt_token, self.decoded_jwt = previous
+            return False
+        return True
 
     def delete_session(self):
         # Redis client throws an error if you try to .delete(None)
         if self.session_key:
-            redis.delete(self.session_key)
+            try:
+                _call_redis("delete", self.session_key)
+            except SessionStoreUnavailable:
+                logger.error("Failed to delete session", exc_info=True)
 
     def get_party_id(self):
         return self.get_decoded_jwt()["party_id"]
@@ -54,18 +102,32 @@ class Session(object):
         return self.encoded_jwt_token
 
     def get_decoded_jwt(self):
-        return jwt.decode(self.encoded_jwt_token)
+        if self.decoded_jwt is None:
+            self.decoded_jwt = jwt.decode(self.encoded_jwt_token)
+        return self.decoded_jwt
 
     def get_expires_in(self):
-        return jwt.decode(self.encoded_jwt_token)["expires_in"]
+        return self.get_decoded_jwt()["expires_in"]
 
     def set(self):
-        redis.setex(self.session_key, 3600, self.encoded_jwt_token)
+        _call_redis("setex", self.session_key, 3600, self.encoded_jwt_token)
 
     def get_formatted_expires_in(self):
         return datetime.fromtimestamp(self.get_expires_in(), tz=timezone.utc).isoformat()
 
 
+def _call_redis(command, *args):
+    if redis_client.sessions.degraded():
+        raise SessionStoreUnavailable("The session store is in degraded mode")
+    try:
+        result = getattr(redis, command)(*args)
+    except RedisError as error:
+        redis_client.sessions.record_failure()
+        raise SessionStoreUnavailable(f"Failed to {command} session: {error!r}") from error
+    redis_client.sessions.record_success()
+    return result
+
+
 def _get_new_timestamp(ttl=3600):
     current_time = datetime.now()
     expires_in = current_time + timedelta(seconds=ttl)
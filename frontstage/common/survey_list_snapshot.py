@@ -0,0 +1,11 @@
+from frontstage.common.party_cache import PartyCache
+
+# Snapshots of respondents' survey lists, named by which list (and page) they are, used for SURVEY_LIST_SNAPSHOT_TTL
+# seconds.  Invalidated when frontstage changes a respondent's surveys or cases, changes made elsewhere (e.g. to a
+# colleague's cases) are picked up once the snapshot expires.
+snapshots = PartyCache("survey-list", "SURVEY_LIST_SNAPSHOT_TTL")
+
+get = snapshots.get
+version = snapshots.version
+save = snapshots.save
+invalidate = snapshots.invalidate
@@ -4,6 +4,7 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from frontstage.common import http_client
 from frontstage.common.utilities import obfuscate_email
 from frontstage.exceptions.exceptions import ApiError, AuthError
 
@@ -34,7 +35,7 @@ def sign_in(username, password):
         "Accept": "application/json",
         "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
     }
-    response = requests.post(url, headers=headers, auth=app.config["BASIC_AUTH"], data=data)
+    response = http_client.service("auth").post(url, headers=headers, auth=app.config["BASIC_AUTH"], data=data)
 
     try:
         response.raise_for_status()
@@ -58,7 +59,7 @@ def delete_account(username: str):
     url = f'{app.config["AUTH_URL"]}/api/account/user'
     # force_delete will always be true if deletion is initiated by user
     form_data = {"username": username, "force_delete": True}
-    response = requests.delete(url, data=form_data, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("auth").delete(url, data=form_data, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
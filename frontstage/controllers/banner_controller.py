@@ -4,6 +4,8 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from frontstage.common import http_client
+
 logger = wrap_logger(logging.getLogger(__name__))
 
 
@@ -14,18 +16,29 @@ def current_banner():
 
     :return: The banner text, if any, else an empty string
     """
+    return fetch_banner() or ""
+
+
+def fetch_banner() -> str | None:
+    """
+    Calls the banner service to get the currently active banner, telling a failed call apart from there being no
+    active banner.
+
+    :return: The banner text, an empty string if there isn't an active banner, or None if the call failed
+    """
     url = f"{app.config['BANNER_SERVICE_URL']}/banner"
     try:
-        response = requests.get(url)
-    except requests.exceptions.ConnectionError:
+        response = http_client.service("banner").get(url)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
         logger.error("Failed to connect to banner", exc_info=True)
-        return ""
+        return None
 
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
         if response.status_code != 404:
             logger.error("Failed to retrieve Banner from api", status_code=response.status_code)
+            return None
         return ""
 
     banner = response.json()
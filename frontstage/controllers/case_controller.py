@@ -1,11 +1,16 @@
 import logging
+import time
+from functools import partial
+from threading import Lock
 
 import requests
 from flask import abort
 from flask import current_app as app
 from structlog import wrap_logger
 
-from frontstage.common.encrypter import Encrypter
+from frontstage.common import background_queue, http_client, survey_list_snapshot
+from frontstage.common.case_category_cache import CaseCategoryCache
+from frontstage.common.encrypter import get_encrypter
 from frontstage.common.eq_payload import EqPayload
 from frontstage.controllers import (
     collection_exercise_controller,
@@ -21,6 +26,8 @@ from frontstage.exceptions.exceptions import (
 
 logger = wrap_logger(logging.getLogger(__name__))
 
+_case_category_cache_lock = Lock()
+
 
 def calculate_case_status(case_group_status: str, collection_instrument_type: str) -> str:
     """
@@ -49,7 +56,7 @@ def get_case_by_case_id(case_id):
     logger.info("Attempting to retrieve case by case id", case_id=case_id)
 
     url = f"{app.config['CASE_URL']}/cases/{case_id}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("case").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -65,7 +72,7 @@ def get_case_by_enrolment_code(enrolment_code):
     logger.info("Attempting to retrieve case by enrolment code", enrolment_code=enrolment_code)
 
     url = f"{app.config['CASE_URL']}/cases/iac/{enrolment_code}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("case").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -81,7 +88,7 @@ def get_case_categories():
     logger.info("Attempting to retrieve case categories")
 
     url = f"{app.config['CASE_URL']}/categories"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("case").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -131,7 +138,7 @@ def get_cases_by_party_id(party_id, case_url, case_auth, case_events=False, iac=
         else:
             url = f"{url}?"
         url = f"{url}iac=false"
-    response = requests.get(url, auth=case_auth)
+    response = http_client.service("case").get(url, auth=case_auth)
 
     try:
         response.raise_for_status()
@@ -151,16 +158,23 @@ def get_eq_url(case, collection_exercise, party_id, business_party_id, survey_sh
         logger.info("The case group status is complete, opening an EQ is forbidden", case_id=case_id, party_id=party_id)
         abort(403)
 
+    timings = {}
+    start = time.monotonic()
     survey = survey_controller.get_survey_by_short_name(survey_short_name)
-    if not party_controller.is_respondent_enrolled(party_id, business_party_id, survey["id"]):
+    enrolled = party_controller.is_respondent_enrolled(party_id, business_party_id, survey["id"])
+    timings["permission"] = round(time.monotonic() - start, 3)
+    if not enrolled:
         raise NoSurveyPermission(party_id, case_id)
 
-    payload = EqPayload().create_payload(case, collection_exercise, party_id, business_party_id, survey)
-
-    json_secret_keys = app.config["JSON_SECRET_KEYS"]
-    encrypter = Encrypter(json_secret_keys)
+    start = time.monotonic()
+    payload = EqPayload().create_payload(
+        case, collection_exercise, party_id, business_party_id, survey, timings=timings
+    )
+    timings["payload"] = round(time.monotonic() - start, 3)
 
-    token = encrypter.encrypt(payload, "eq_v3")
+    start = time.monotonic()
+    token = get_encrypter().encrypt(payload, "eq_v3")
+    timings["encrypt"] = round(time.monotonic() - start, 3)
     eq_url = app.config["EQ_V3_URL"] + token
 
     category = "EQ_LAUNCH"
@@ -181,11 +195,29 @@ def get_eq_url(case, collection_exercise, party_id, business_party_id, survey_sh
         business_party_id=business_party_id,
         survey_short_name=survey_short_name,
         tx_id=payload["tx_id"],
+        timings=timings,
     )
     return eq_url
 
 
 def post_case_event(case_id, party_id, category, description):
+    """
+    Queues a case event to be posted to the case service in the background, so the request doesn't wait on it.
+    Events for the same case are posted in the order they were raised.  Connection errors and 5xx responses from the
+    case service are retried, anything else is logged.
+
+    :param case_id: The case the event is for
+    :param party_id: The party the event was raised by
+    :param category: The case event category
+    :param description: A description of the event
+    """
+    logger.info("Queueing case event", case_id=case_id, category=category)
+    background_queue.case_event_queue().submit(
+        case_id, partial(send_case_event, case_id, party_id, category, description), retryable=_is_retryable
+    )
+
+
+def send_case_event(case_id, party_id, category, description):
     logger.info("Posting case event", case_id=case_id)
 
     validate_case_category(category)
@@ -196,7 +228,7 @@ def post_case_event(case_id, party_id, category, description):
         "metadata": {"partyId": party_id},
         "createdBy": "RAS_FRONTSTAGE",
     }
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=message)
+    response = http_client.service("case").post(url, auth=app.config["BASIC_AUTH"], json=message)
 
     try:
         response.raise_for_status()
@@ -205,19 +237,43 @@ def post_case_event(case_id, party_id, category, description):
         raise ApiError(logger, response)
 
     logger.info("Successfully posted case event", case_id=case_id)
+    # The event may have changed the status of the case, e.g. an EQ launch or a SEFT upload
+    survey_list_snapshot.invalidate(party_id)
+
+
+def _is_retryable(exception) -> bool:
+    if isinstance(exception, ApiError):
+        return exception.status_code >= 500
+    return isinstance(exception, requests.exceptions.RequestException)
 
 
 def validate_case_category(category):
     logger.info("Validating case category", category=category)
 
-    categories = get_case_categories()
-    category_names = [cat["name"] for cat in categories]
-    if category not in category_names:
+    if category not in get_case_category_names():
         raise InvalidCaseCategory(category)
 
     logger.info("Successfully validated case category", category=category)
 
 
+def get_case_category_names() -> frozenset:
+    """
+    Returns the names of the case event categories from the app's cache of them, see CaseCategoryCache
+
+    :return: A frozenset of category names
+    """
+    if (cache := app.extensions.get("case_category_cache")) is None:
+        with _case_category_cache_lock:
+            if (cache := app.extensions.get("case_category_cache")) is None:
+                cache = CaseCategoryCache(app._get_current_object(), _fetch_case_category_names)
+                app.extensions["case_category_cache"] = cache
+    return cache.get()
+
+
+def _fetch_case_category_names():
+    return [category["name"] for category in get_case_categories()]
+
+
 def get_cases_for_list_type_by_party_id(party_id, case_url, case_auth, list_type="todo"):
     logger.info("Get cases for party for list", party_id=party_id, list_type=list_type)
 
@@ -1,11 +1,15 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 
 import requests
 from flask import current_app as app
 from iso8601 import ParseError, parse_date
 from structlog import wrap_logger
 
+from frontstage.common import http_client
+from frontstage.common.local_cache import MISSING, LocalCache
+from frontstage.common.request_memo import request_memoized
 from frontstage.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -13,11 +17,27 @@ logger = wrap_logger(logging.getLogger(__name__))
 date_format = "%d %b %Y"
 
 
+# The collection exercises are cached as returned by the collection exercise service, along with their events already
+# parsed, so only the fields that depend on today's date are worked out on each read
+LOCAL_MAX_ENTRIES = 1000
+collection_exercises = LocalCache("collection-exercise", LOCAL_MAX_ENTRIES, 60)
+collection_exercise_events = LocalCache("collection-exercise-events", LOCAL_MAX_ENTRIES, 60)
+collection_exercises_for_surveys = LocalCache("collection-exercises-for-surveys", LOCAL_MAX_ENTRIES, 60)
+
+
+@request_memoized
 def get_collection_exercise(collection_exercise_id):
+    collection_exercise, events = _cached(
+        collection_exercises, collection_exercise_id, _fetch_collection_exercise, collection_exercise_id
+    )
+    return _with_events(collection_exercise, events)
+
+
+def _fetch_collection_exercise(collection_exercise_id):
     logger.info("Attempting to retrieve collection exercise", collection_exercise_id=collection_exercise_id)
     url = f"{app.config['COLLECTION_EXERCISE_URL']}/collectionexercises/{collection_exercise_id}"
 
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("collection_exercise").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -27,18 +47,27 @@ def get_collection_exercise(collection_exercise_id):
 
     logger.info("Successfully retrieved collection exercise", collection_exercise_id=collection_exercise_id)
     collection_exercise = response.json()
+    return collection_exercise, prepare_events(collection_exercise["events"] or [])
 
-    if collection_exercise["events"]:
-        collection_exercise["events"] = convert_events_to_new_format(collection_exercise["events"])
 
-    return collection_exercise
+def get_collection_exercise_events(collection_exercise_id):
+    """
+    Gets the events of a collection exercise, as returned by the collection exercise service.  They may be cached, so
+    mustn't be changed
+
+    :param collection_exercise_id: The uuid of the collection exercise
+    :return: A list of the events
+    """
+    return _cached(
+        collection_exercise_events, collection_exercise_id, _fetch_collection_exercise_events, collection_exercise_id
+    )
 
 
-def get_collection_exercise_events(collection_exercise_id):
+def _fetch_collection_exercise_events(collection_exercise_id):
     logger.info("Attempting to retrieve collection exercise events", collection_exercise_id=collection_exercise_id)
     url = f"{app.config['COLLECTION_EXERCISE_URL']}/collectionexercises/{collection_exercise_id}/events"
 
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("collection_exercise").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -51,10 +80,27 @@ def get_collection_exercise_events(collection_exercise_id):
 
 
 def get_collection_exercises_for_surveys(survey_ids, live_only=None):
+    surveys_with_collection_exercises = _cached(
+        collection_exercises_for_surveys,
+        (tuple(sorted(survey_ids)), live_only),
+        _fetch_collection_exercises_for_surveys,
+        survey_ids,
+        live_only,
+    )
+    if surveys_with_collection_exercises is None:
+        return []
+
+    return {
+        survey_id: [_with_events(collection_exercise, events) for collection_exercise, events in collection_exercises]
+        for survey_id, collection_exercises in surveys_with_collection_exercises.items()
+    }
+
+
+def _fetch_collection_exercises_for_surveys(survey_ids, live_only):
     logger.info("Retrieving collection exercises for surveys", survey_ids=survey_ids)
     params = {"surveyIds": survey_ids, "liveOnly": live_only}
 
-    response = requests.get(
+    response = http_client.service("collection_exercise").get(
         f"{app.config["COLLECTION_EXERCISE_URL"]}/collectionexercises/surveys",
         params=params,
         auth=app.config["BASIC_AUTH"],
@@ -68,34 +114,93 @@ def get_collection_exercises_for_surveys(survey_ids, live_only=None):
 
     if response.status_code == 204:
         logger.info("No live exercises found for surveys", survey_ids=survey_ids)
-        return []
+        return None
     logger.info("Successfully retrieved collection exercises", survey_ids=survey_ids)
-    surveys_with_collection_exercises = response.json()
 
-    for collection_exercises in surveys_with_collection_exercises.values():
-        for collection_exercise in collection_exercises:
-            if collection_exercise["events"]:
-                collection_exercise["events"] = convert_events_to_new_format(collection_exercise["events"])
+    return {
+        survey_id: [
+            (collection_exercise, prepare_events(collection_exercise["events"] or []))
+            for collection_exercise in collection_exercises
+        ]
+        for survey_id, collection_exercises in response.json().items()
+    }
+
+
+def _cached(cache, key, fetch, *args):
+    """
+    Gets a value from one of the local caches, fetching and caching it if it's not there.  With a
+    COLLECTION_EXERCISE_CACHE_TTL of 0 it's always fetched
+    """
+    ttl = app.config["COLLECTION_EXERCISE_CACHE_TTL"]
+    if not ttl:
+        return fetch(*args)
+
+    value = cache.get(key)
+    if value is MISSING:
+        value = fetch(*args)
+        cache.set(key, value, ttl)
+    return value
+
 
-    return surveys_with_collection_exercises
+def _with_events(collection_exercise, events):
+    """Returns a copy of a cached collection exercise, with its events in the new format as of now"""
+    collection_exercise = dict(collection_exercise)
+    if collection_exercise["events"]:
+        collection_exercise["events"] = format_prepared_events(events)
+    return collection_exercise
 
 
 def convert_events_to_new_format(events):
-    formatted_events = {}
+    return format_prepared_events(prepare_events(events))
+
+
+def prepare_events(events) -> list:
+    """
+    Parses the timestamps of the events and formats the fields that don't change from one day to the next
+
+    :param events: The events as returned by the collection exercise service
+    :return: A list of tuples of the tag, the parsed timestamp and a dict of the fields already formatted.  The dicts
+             are shared between events on the same date, so mustn't be changed
+    """
+    prepared_events = []
     for event in events:
         try:
-            date_time = parse_date(event["timestamp"])
+            date_time = _parse_timestamp(event["timestamp"])
         except ParseError:
             raise ParseError
 
-        formatted_events[event["tag"]] = {
-            "date": date_time.strftime(date_format),
-            "month": date_time.strftime("%m"),
-            "is_in_future": date_time > parse_date(datetime.now().isoformat()),
-            "formatted_date": ordinal_date_formatter("{S} %B %Y", date_time),
-            "due_time": due_date_converter(date_time),
-        }
-    return formatted_events
+        prepared_events.append((event["tag"], date_time, _format_event_date(date_time.date())))
+    return prepared_events
+
+
+def format_prepared_events(prepared_events) -> dict:
+    """
+    Adds the fields that depend on today's date to events from prepare_events
+
+    :param prepared_events: The list returned by prepare_events
+    :return: A dict of the formatted events keyed by tag
+    """
+    # The same as parsing datetime.now().isoformat(), which is read as UTC as it has no timezone
+    now = datetime.now()
+    utc_now = now.replace(tzinfo=timezone.utc)
+    return {
+        tag: {**fields, "is_in_future": date_time > utc_now, "due_time": due_date_converter(date_time, now)}
+        for tag, date_time, fields in prepared_events
+    }
+
+
+# Collection exercises share a handful of timestamps, and the dates they fall on, so both are parsed and formatted once
+_parse_timestamp = lru_cache(maxsize=4096)(parse_date)
+
+
+@lru_cache(maxsize=4096)
+def _format_event_date(event_date: date) -> dict:
+    return {
+        "date": event_date.strftime(date_format),
+        "month": event_date.strftime("%m"),
+        "formatted_date": ordinal_date_formatter("{S} %B %Y", event_date),
+        "iso_date": event_date.isoformat(),
+    }
 
 
 def suffix(day: int):
@@ -122,7 +227,7 @@ def ordinal_date_formatter(date_format_required: str, date_to_be_formatted: date
     )
 
 
-def due_date_converter(date: datetime) -> str:
+def due_date_converter(date: datetime, now: datetime = None) -> str:
     """
     This function provides the custom due date based on the difference between now and the date passed.
     The logic for the due date is based on the following.
@@ -134,33 +239,69 @@ def due_date_converter(date: datetime) -> str:
     Due date is 90-119 days - Due in 3 months
     Due date is 120+ days - Due in over 3 months
 
+    The thresholds are worked out once a day, and the due date of each day they're asked for is kept until the day
+    changes.  Only "Due in X days" depends on the time of day as well, so it's the only one worked out every time.
+
     :param: date: the datetime date for which due date is to be evaluated.
+    :param: now: the time to evaluate it against, defaults to now
     :return: due date
     """
-    now = datetime.now()
+    now = now or datetime.now()
+    due_dates = _due_dates_for(return_date_time(now))
     event_day = datetime(date.year, date.month, date.day)
-    today = return_date_time(now)
-    tomorrow = return_date_time(now + timedelta(days=1))
-    day_after = return_date_time(now + timedelta(days=2))
-    a_month = return_date_time(now + timedelta(days=29))
-    two_months = return_date_time(now + timedelta(days=60))
-    three_months = return_date_time(now + timedelta(days=90))
-    four_months = return_date_time(now + timedelta(days=120))
-    if event_day == today:
-        return "Due today"
-    if event_day == tomorrow:
-        return "Due tomorrow"
-    if day_after <= event_day < a_month:
+    due_date = due_dates.labels.get(event_day, MISSING)
+    if due_date is MISSING:
+        due_date = due_dates.label(event_day)
+        due_dates.labels[event_day] = due_date
+    if due_date is _DUE_IN_DAYS:
         delta = date.replace(tzinfo=None) - now.replace(tzinfo=None)
         return f"Due in {delta.days} days"
-    if a_month <= event_day < two_months:
-        return "Due in a month"
-    if two_months <= event_day < three_months:
-        return "Due in 2 months"
-    if three_months <= event_day < four_months:
-        return "Due in 3 months"
-    if four_months <= event_day:
-        return "Due in over 3 months"
+    return due_date
+
+
+_DUE_IN_DAYS = object()
+
+
+class _DueDates:
+    """The due date thresholds for one day, and the due dates already worked out against them"""
+
+    def __init__(self, today: datetime):
+        self.today = today
+        self.tomorrow = today + timedelta(days=1)
+        self.day_after = today + timedelta(days=2)
+        self.a_month = today + timedelta(days=29)
+        self.two_months = today + timedelta(days=60)
+        self.three_months = today + timedelta(days=90)
+        self.four_months = today + timedelta(days=120)
+        self.labels = {}
+
+    def label(self, event_day: datetime):
+        if event_day == self.today:
+            return "Due today"
+        if event_day == self.tomorrow:
+            return "Due tomorrow"
+        if self.day_after <= event_day < self.a_month:
+            return _DUE_IN_DAYS
+        if self.a_month <= event_day < self.two_months:
+            return "Due in a month"
+        if self.two_months <= event_day < self.three_months:
+            return "Due in 2 months"
+        if self.three_months <= event_day < self.four_months:
+            return "Due in 3 months"
+        if self.four_months <= event_day:
+            return "Due in over 3 months"
+
+
+_due_dates = None
+
+
+def _due_dates_for(today: datetime) -> _DueDates:
+    global _due_dates
+    due_dates = _due_dates
+    if due_dates is None or due_dates.today != today:
+        # Replaced rather than cleared, so a thread still using yesterday's isn't affected
+        due_dates = _due_dates = _DueDates(today)
+    return due_dates
 
 
 def return_date_time(timedelta_now: datetime) -> datetime:
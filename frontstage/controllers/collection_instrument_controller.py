@@ -1,6 +1,5 @@
 import logging
 import os
-from functools import lru_cache
 
 import requests
 from flask import current_app as app
@@ -8,8 +7,12 @@ from structlog import wrap_logger
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
+from frontstage.common import http_client
+from frontstage.common.request_memo import request_memoized
 from frontstage.controllers import case_controller
 from frontstage.controllers.gcp_survey_response import (
+    MAX_FILE_SIZE_ERROR,
+    FileTooLargeError,
     GcpSurveyResponse,
     SurveyResponseError,
 )
@@ -21,15 +24,27 @@ MISSING_FILE_ERROR = "Select a file that follows guidance for uploading."
 MISSING_DATA = "Data needed to create the file name is missing"
 UPLOAD_SUCCESSFUL = "Upload successful"
 UPLOAD_UNSUCCESSFUL = "Upload failed"
-
-
-def download_collection_instrument(collection_instrument_id, case_id, party_id):
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def download_collection_instrument(collection_instrument_id, case_id, party_id, stream=False):
     """
     Downloads the collection instrument and updates the case with the record that the instrument has been downloaded.
 
     :param collection_instrument_id: UUID of the collection instrument
     :param case_id: UUID of the case
     :param party_id: UUID of the party
+    :param stream: If True the instrument isn't read into memory, it's returned as an iterator over the upstream body
+                   (passed through as is, a chunk at a time) that closes the upstream connection once it's exhausted
     :return: A tuple containing the collection instrument and the headers
     """
     bound_logger = logger.bind(collection_instrument_id=collection_instrument_id, party_id=party_id, case_id=case_id)
@@ -37,7 +52,7 @@ def download_collection_instrument(collection_instrument_id, case_id, party_id):
     url = (
         f"{app.config['COLLECTION_INSTRUMENT_URL']}/collection-instrument-api/1.0.2/download/{collection_instrument_id}"
     )
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("collection_instrument").get(url, auth=app.config["BASIC_AUTH"], stream=stream)
 
     # Post relevant download case event
     category = "COLLECTION_INSTRUMENT_DOWNLOADED" if response.ok else "COLLECTION_INSTRUMENT_ERROR"
@@ -51,6 +66,7 @@ def download_collection_instrument(collection_instrument_id, case_id, party_id):
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
+        response.close()
         bound_logger.error("Failed to download collection instrument")
         bound_logger.unbind("collection_instrument_id", "party_id", "case_id")
         raise ApiError(logger, response)
@@ -60,14 +76,27 @@ def download_collection_instrument(collection_instrument_id, case_id, party_id):
     bound_logger.debug(f"Setting Access-Control-Allow-Origin header to {acao}")
     headers["Access-Control-Allow-Origin"] = acao
     bound_logger.unbind("collection_instrument_id", "party_id", "case_id")
+    if stream:
+        # Hop-by-hop headers describe the upstream connection, not the one to the respondent
+        headers = [(key, value) for key, value in headers.items() if key.lower() not in HOP_BY_HOP_HEADERS]
+        return _stream_content(response, app.config["CI_DOWNLOAD_CHUNK_SIZE"]), headers
     return response.content, headers.items()
 
 
+def _stream_content(response, chunk_size):
+    try:
+        # decode_content=False so the body (and its Content-Encoding and Content-Length) is passed on untouched
+        yield from response.raw.stream(chunk_size, decode_content=False)
+    finally:
+        response.close()
+
+
+@request_memoized
 def get_collection_instrument(collection_instrument_id, collection_instrument_url, collection_instrument_auth):
     logger.info("Attempting to retrieve collection instrument", collection_instrument_id=collection_instrument_id)
 
     url = f"{collection_instrument_url}/collection-instrument-api/1.0.2/{collection_instrument_id}"
-    response = requests.get(url, auth=collection_instrument_auth)
+    response = http_client.service("collection_instrument").get(url, auth=collection_instrument_auth)
 
     try:
         response.raise_for_status()
@@ -79,13 +108,20 @@ def get_collection_instrument(collection_instrument_id, collection_instrument_ur
     return response.json()
 
 
-@lru_cache
 def get_registry_instrument(exercise_id: str, form_type: str) -> dict | None:
+    """
+    Gets the registry instrument for a collection exercise and form type.  This always goes to the
+    collection-instrument service, use RedisCache.get_registry_instrument to get a cached one.
+
+    :param exercise_id: The collection exercise id
+    :param form_type: The form type
+    :return: The registry instrument, or None if there isn't one
+    """
     url = (
         f"{app.config["COLLECTION_INSTRUMENT_URL"]}/collection-instrument-api/1.0.2/registry-instrument/exercise-id/"
         f"{exercise_id}/formtype/{form_type}"
     )
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("collection_instrument").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -123,7 +159,6 @@ def upload_collection_instrument(
         return [MISSING_FILE_ERROR]
 
     file_name, file_extension = os.path.splitext(secure_filename(file.filename))
-    file_contents = file.read()
     gcp_survey_response = GcpSurveyResponse(app.config)
     validation_errors = gcp_survey_response.validate_file(file_name, file_extension, file_size)
 
@@ -137,9 +172,14 @@ def upload_collection_instrument(
     if not file_name:
         raise CiUploadError(MISSING_DATA)
     try:
-        gcp_survey_response.upload_seft_survey_response(case, file_contents, file_name, survey_ref)
+        # The upload is passed on as a stream (werkzeug spools large uploads to disk) rather than read into memory
+        gcp_survey_response.upload_seft_survey_response(case, file.stream, file_name, survey_ref)
         ci_post_case_event(case_id, party_id, "SUCCESSFUL_RESPONSE_UPLOAD")
         return None
+    except FileTooLargeError:
+        # Content-Length said the file was small enough, but more than that was streamed
+        ci_post_case_event(case_id, party_id, "UNSUCCESSFUL_RESPONSE_UPLOAD")
+        return [MAX_FILE_SIZE_ERROR]
     except SurveyResponseError:
         ci_post_case_event(case_id, party_id, "UNSUCCESSFUL_RESPONSE_UPLOAD")
         raise CiUploadError(UPLOAD_UNSUCCESSFUL)
@@ -6,11 +6,10 @@ from uuid import UUID
 
 from flask import current_app, request
 from requests import Session as request_session
-from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, HTTPError, Timeout
 from structlog import wrap_logger
-from urllib3 import Retry
 
+from frontstage.common import http_client
 from frontstage.common.session import Session
 from frontstage.exceptions.exceptions import (
     ApiError,
@@ -48,12 +47,8 @@ SUBJECT_OPTIONS = [
 ]
 
 
-def _get_session():
-    session = request_session()
-    retries = Retry(total=10, backoff_factor=0.1)
-    session.mount("http://", HTTPAdapter(max_retries=retries))
-    session.mount("https://", HTTPAdapter(max_retries=retries))
-    return session
+def _get_session() -> request_session:
+    return http_client.service("secure_message")
 
 
 def get_conversation(thread_id):
@@ -62,16 +57,16 @@ def get_conversation(thread_id):
     headers = _create_get_conversation_headers()
     url = f"{current_app.config['SECURE_MESSAGE_URL']}/threads/{thread_id}"
 
-    with _get_session() as session:
-        response = session.get(url, headers=headers)
-        try:
-            response.raise_for_status()
-        except HTTPError as exception:
-            if exception.response.status_code == 403:
-                raise IncorrectAccountAccessError(message="Access not granted for thread", thread_id=thread_id)
-            else:
-                logger.error("Thread retrieval failed", thread_id=thread_id)
-                raise ApiError(logger, response)
+    session = _get_session()
+    response = session.get(url, headers=headers)
+    try:
+        response.raise_for_status()
+    except HTTPError as exception:
+        if exception.response.status_code == 403:
+            raise IncorrectAccountAccessError(message="Access not granted for thread", thread_id=thread_id)
+        else:
+            logger.error("Thread retrieval failed", thread_id=thread_id)
+            raise ApiError(logger, response)
 
     logger.info("Successfully retrieved conversation thread", thread_id=thread_id)
 
@@ -88,13 +83,13 @@ def get_conversation_list(params):
     headers = _create_get_conversation_headers()
     url = f"{current_app.config['SECURE_MESSAGE_URL']}/threads"
 
-    with _get_session() as session:
-        response = session.get(url, headers=headers, params=params)
-        try:
-            response.raise_for_status()
-        except HTTPError:
-            logger.error("Threads retrieval failed")
-            raise ApiError(logger, response)
+    session = _get_session()
+    response = session.get(url, headers=headers, params=params)
+    try:
+        response.raise_for_status()
+    except HTTPError:
+        logger.error("Threads retrieval failed")
+        raise ApiError(logger, response)
 
     logger.info("Successfully retrieved threads list")
 
@@ -246,7 +241,7 @@ def _create_formatted_option_list(options: list, selected: str, disabled_option:
 def _create_get_conversation_headers(encoded_jwt=None) -> dict:
     try:
         if encoded_jwt is None:
-            encoded_jwt = Session.from_session_key(request.cookies["authorization"]).get_encoded_jwt()
+            encoded_jwt = Session.from_request_session_key(request.cookies["authorization"]).get_encoded_jwt()
     except KeyError:
         logger.error("Authorization token missing in cookie")
         raise AuthorizationTokenMissing
@@ -255,7 +250,7 @@ def _create_get_conversation_headers(encoded_jwt=None) -> dict:
 
 def _create_send_message_headers() -> dict:
     try:
-        encoded_jwt = Session.from_session_key(request.cookies["authorization"]).get_encoded_jwt()
+        encoded_jwt = Session.from_request_session_key(request.cookies["authorization"]).get_encoded_jwt()
     except KeyError:
         logger.error("Authorization token missing in cookie")
         raise AuthorizationTokenMissing
@@ -269,12 +264,12 @@ def remove_unread_label(message_id: str):
     data = '{"label": "UNREAD", "action": "remove"}'
     headers = _create_send_message_headers()
 
-    with _get_session() as session:
-        response = session.put(url, headers=headers, data=data)
-        try:
-            response.raise_for_status()
-        except HTTPError:
-            logger.error("Failed to remove unread label", message_id=message_id, status=response.status_code)
+    session = _get_session()
+    response = session.put(url, headers=headers, data=data)
+    try:
+        response.raise_for_status()
+    except HTTPError:
+        logger.error("Failed to remove unread label", message_id=message_id, status=response.status_code)
 
     logger.info("Successfully removed unread label", message_id=message_id)
 
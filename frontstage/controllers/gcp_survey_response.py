@@ -1,18 +1,21 @@
 import hashlib
+import io
 import json
 import logging
+import os
+import tempfile
 import time
 import uuid
 
 import structlog
 from flask import current_app
-from google.cloud import pubsub_v1, storage
 from google.cloud.exceptions import GoogleCloudError
 
+from frontstage.common import gcp_clients, publish_queue
 from frontstage.controllers.collection_exercise_controller import (
     get_collection_exercise,
 )
-from frontstage.controllers.gnu_encryptor import GNUEncrypter
+from frontstage.controllers.gnu_encryptor import get_encrypter
 from frontstage.controllers.survey_controller import get_survey
 
 log = structlog.wrap_logger(logging.getLogger(__name__))
@@ -22,12 +25,44 @@ FILE_NAME_LENGTH_ERROR = "The file name must be less than 50 characters."
 UPLOAD_FILE_EXTENSIONS = "xls,xlsx"
 MAX_FILE_SIZE_ERROR = "The file must be smaller than 20MB."
 MIN_FILE_SIZE_ERROR = "The file must be larger than 6KB."
+# Resumable uploads to GCS are sent in chunks that must be a multiple of 256KB
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 class SurveyResponseError(Exception):
     pass
 
 
+class FileTooLargeError(SurveyResponseError):
+    pass
+
+
+class _SizeLimitedFile:
+    """
+    Reads a file, counting the bytes as they're read.  Once more than limit bytes have been read it reads as the end of
+    the file and sets exceeded, rather than raising, as gpg reads the file on a thread of its own that would swallow
+    the exception and encrypt what it had been given.
+    """
+
+    def __init__(self, file, limit: int):
+        self.file = file
+        self.limit = limit
+        self.size = 0
+        self.exceeded = False
+
+    def read(self, size=-1) -> bytes:
+        if self.exceeded:
+            return b""
+        # One byte more than the limit allows is read, to tell a file of exactly the limit from a larger one
+        left = self.limit - self.size + 1
+        data = self.file.read(left if size is None or size < 0 else min(size, left))
+        self.size += len(data)
+        if self.size > self.limit:
+            self.exceeded = True
+            return b""
+        return data
+
+
 class GcpSurveyResponse:
     def __init__(self, config):
         self.config = config
@@ -36,6 +71,7 @@ class GcpSurveyResponse:
         self.storage_client = None
         self.seft_upload_bucket_name = self.config["SEFT_UPLOAD_BUCKET_NAME"]
         self.seft_upload_bucket_file_prefix = self.config.get("SEFT_UPLOAD_BUCKET_FILE_PREFIX")
+        self.seft_upload_chunk_size = self.config.get("SEFT_UPLOAD_CHUNK_SIZE", DEFAULT_UPLOAD_CHUNK_SIZE)
 
         # Pubsub config
         self.publisher = None
@@ -46,12 +82,12 @@ class GcpSurveyResponse:
     The survey response from a respondent
     """
 
-    def upload_seft_survey_response(self, case: dict, file_contents, file_name: str, survey_ref: str):
+    def upload_seft_survey_response(self, case: dict, file, file_name: str, survey_ref: str):
         """
         Encrypt and upload survey response to gcp bucket, and put metadata about it in pubsub.
 
         :param case: A case
-        :param file_contents: The contents of the file that has been uploaded
+        :param file: A file-like object (or the contents) of the file that has been uploaded
         :param file_name: The filename
         :param survey_ref: The survey ref e.g 134 MWSS
         """
@@ -62,7 +98,7 @@ class GcpSurveyResponse:
         bound_log.info("Putting response into bucket and sending pubsub message")
 
         try:
-            results = self.put_file_into_gcp_bucket(file_contents, file_name)
+            results = self.put_file_into_gcp_bucket(file, file_name)
         except (GoogleCloudError, KeyError):
             bound_log.exception("Something went wrong putting into the bucket")
             raise SurveyResponseError()
@@ -75,26 +111,29 @@ class GcpSurveyResponse:
 
         try:
             self.put_message_into_pubsub(payload, tx_id)
-        except TimeoutError:
-            bound_log.exception("Publish to pubsub timed out", payload=payload)
-            raise SurveyResponseError()
         except Exception as e:  # noqa
-            bound_log.exception("A non-timeout error was raised when publishing to pubsub", payload=payload)
+            bound_log.exception("An error was raised when queueing a message for pubsub", payload=payload)
 
             raise SurveyResponseError()
 
         bound_log.unbind("filename", "case_id", "survey_id", "tx_id")
 
-    def put_file_into_gcp_bucket(self, file_contents, filename: str):
+    def put_file_into_gcp_bucket(self, file, filename: str):
         """
-        Takes the file_contents and puts it into a GCP bucket in encrypted form to be later used by SDX.
+        Takes the file and puts it into a GCP bucket in encrypted form to be later used by SDX.
+
+        The file is never read into memory whole.  gpg encrypts it to a temporary file, the md5 and size are worked
+        out from that a chunk at a time, and it's then sent to the bucket as a resumable upload in chunks of
+        SEFT_UPLOAD_CHUNK_SIZE.  The file is counted as it's read, and nothing is sent once it's over MAX_UPLOAD_SIZE,
+        whatever the request's Content-Length said.
 
         Note: The payload will almost certainly change once the encryption method between us and SDX is decided.
 
-        :param file_contents: contents of the collection instrument
+        :param file: file-like object (or the contents) of the collection instrument
         :param filename that was uploaded
 
         returns a dict os the size of the encrypted string and an md5
+        :raises FileTooLargeError: If the file is larger than MAX_UPLOAD_SIZE
         """
         bound_log = log.bind(project=self.seft_upload_project, bucket=self.seft_upload_bucket_name)
         bound_log.info("Starting to put file in bucket")
@@ -103,42 +142,56 @@ class GcpSurveyResponse:
             bound_log.info("Error with filename for bucket", filename=filename)
             raise ValueError("Error with filename for bucket")
 
+        if isinstance(file, str):
+            file = file.encode()
+        if isinstance(file, bytes):
+            file = io.BytesIO(file)
+        file = _SizeLimitedFile(file, int(current_app.config["MAX_UPLOAD_SIZE"]))
+
         if self.storage_client is None:
-            self.storage_client = storage.Client(project=self.seft_upload_project)
+            self.storage_client = gcp_clients.storage_client()
 
         bucket = self.storage_client.bucket(self.seft_upload_bucket_name)
         if self.seft_upload_bucket_file_prefix:
             filename = f"{self.seft_upload_bucket_file_prefix}/{filename}"
-        blob = bucket.blob(filename)
-        gnugpg_secret_keys = current_app.config["ONS_GNU_PUBLIC_CRYPTOKEY"]
+        blob = bucket.blob(filename, chunk_size=self.seft_upload_chunk_size)
         ons_gnu_fingerprint = current_app.config["ONS_GNU_FINGERPRINT"]
-        encrypter = GNUEncrypter(gnugpg_secret_keys)
-        encrypted_message = encrypter.encrypt(file_contents, ons_gnu_fingerprint)
-        md5sum = hashlib.md5(str(encrypted_message).encode()).hexdigest()
-        size_in_bytes = len(encrypted_message)
-        blob.upload_from_string(encrypted_message)
+        encrypter = get_encrypter()
+        with tempfile.TemporaryDirectory() as encrypted_dir:
+            encrypted_path = os.path.join(encrypted_dir, "encrypted")
+            encrypter.encrypt_file(file, ons_gnu_fingerprint, encrypted_path)
+            if file.exceeded:
+                bound_log.info("File is too large to put in bucket", limit=file.limit)
+                raise FileTooLargeError()
+            with open(encrypted_path, "rb") as encrypted_file:
+                md5 = hashlib.md5()
+                for chunk in iter(lambda: encrypted_file.read(self.seft_upload_chunk_size), b""):
+                    md5.update(chunk)
+                size_in_bytes = encrypted_file.tell()
+                encrypted_file.seek(0)
+                blob.upload_from_file(encrypted_file, size=size_in_bytes, content_type="text/plain")
         bound_log.info("Successfully put file in bucket", filename=filename)
         bound_log.unbind("project", "bucket")
 
-        results = {"md5sum": md5sum, "fileSizeInBytes": size_in_bytes}
+        results = {"md5sum": md5.hexdigest(), "fileSizeInBytes": size_in_bytes}
         return results
 
     def put_message_into_pubsub(self, payload: dict, tx_id: str):
         """
-        Takes some metadata about the collection instrument and puts a message on pubsub for SDX to consume.
+        Takes some metadata about the collection instrument and puts a message on pubsub for SDX to consume.  The
+        message is published in the background if there's a spool to keep it in, see frontstage.common.publish_queue
 
         :param tx_id: An id used by SDX to identify the transaction
         :param payload: The payload to be put onto the pubsub topic
         """
         if self.publisher is None:
-            self.publisher = pubsub_v1.PublisherClient()
+            self.publisher = gcp_clients.publisher()
 
         topic_path = self.publisher.topic_path(self.seft_upload_project, self.seft_upload_pubsub_topic)
         payload_bytes = json.dumps(payload).encode()
         log.info("About to publish to pubsub", topic_path=topic_path)
-        future = self.publisher.publish(topic_path, data=payload_bytes, tx_id=tx_id)
-        message = future.result(timeout=15)
-        log.info("Publish succeeded", msg_id=message)
+        publish_queue.publish(self.publisher, topic_path, payload_bytes, tx_id=tx_id)
+        log.info("Queued message for pubsub", tx_id=tx_id)
 
     def create_pubsub_payload(self, case, md5sum, size_bytes, file_name, tx_id: str) -> dict:
         log.info("Creating pubsub payload", case_id=case["id"])
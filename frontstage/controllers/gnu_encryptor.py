@@ -1,14 +1,33 @@
+import atexit
 import logging
+import os
+import shutil
+import tempfile
+from threading import Lock
 
 import gnupg
+import pysequoia
+from flask import current_app
 from structlog import wrap_logger
 
 logger = wrap_logger(logging.getLogger(__name__))
 
+_lock = Lock()
+# The keyring of this process's encrypters, as (pid, directory), so a forked worker makes its own
+_gnupghome = None
+_gnupghome_lock = Lock()
+
 
 class GNUEncrypter:
-    def __init__(self, public_key, passphrase=None, always_trust=True):
-        self.gpg = gnupg.GPG()
+    """
+    Encrypts using the gpg binary.  The public key is imported once, when the encrypter is created, into a keyring
+    rather than the user's default one.  Unless gnupghome is given that's a temporary directory shared by the process,
+    which is removed when it exits.
+    """
+
+    def __init__(self, public_key, passphrase=None, always_trust=True, gnupghome=None):
+        self.gnupghome = gnupghome or _process_gnupghome()
+        self.gpg = gnupg.GPG(gnupghome=self.gnupghome)
         self.gpg.import_keys(public_key.encode("utf-8"))
 
     def encrypt(self, payload, recipient):
@@ -20,6 +39,23 @@ class GNUEncrypter:
         :return: string of encrypted data
         """
         enc_data = self.gpg.encrypt(payload, recipient, always_trust=True)
+        self._check(enc_data, recipient)
+        return str(enc_data)
+
+    def encrypt_file(self, file, recipient, output):
+        """
+        Encrypts a file to another file.  gpg reads and writes the data a block at a time, so neither the file nor the
+        encrypted data is ever held in memory
+
+        :param file: file-like object to encrypt
+        :param recipient: who is it for
+        :param output: path of the file to write the (ascii armored) encrypted data to
+        """
+        enc_data = self.gpg.encrypt_file(file, recipient, always_trust=True, output=output)
+        self._check(enc_data, recipient)
+
+    @staticmethod
+    def _check(enc_data, recipient):
         if not enc_data.ok:
             logger.error(
                 "Failed to encrypt with gpg", status=enc_data.status, error=enc_data.stderr, recipient=recipient
@@ -28,4 +64,81 @@ class GNUEncrypter:
                 "Failed to GNU encrypt bag: {}."
                 "  Have you installed a valid public key and or recipient?".format(enc_data.status)
             )
-        return str(enc_data)
+
+
+class SequoiaEncrypter:
+    """
+    Encrypts in process using Sequoia-PGP, rather than starting a gpg process for every upload.  The public key is
+    parsed once, when the encrypter is created.  It produces the same ascii armored OpenPGP messages as GNUEncrypter,
+    though without compressing first.
+    """
+
+    def __init__(self, public_key):
+        self.cert = pysequoia.Cert.from_bytes(public_key.encode("utf-8"))
+
+    def encrypt(self, payload, recipient):
+        """
+        Encrypts the payload using the recipient values
+
+        :param payload: the value to encrypt
+        :param recipient: who is it for
+        :return: string of encrypted data
+        """
+        self._check_recipient(recipient)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        return pysequoia.encrypt(payload, recipients=[self.cert]).decode("ascii")
+
+    def encrypt_file(self, file, recipient, output):
+        """
+        Encrypts a file to another file.  Sequoia encrypts in memory, so the whole file is read (a file that's limited
+        in size should be given) and only the encrypted data is written to disk
+
+        :param file: file-like object to encrypt
+        :param recipient: who is it for
+        :param output: path of the file to write the (ascii armored) encrypted data to
+        """
+        self._check_recipient(recipient)
+        enc_data = pysequoia.encrypt(file.read(), recipients=[self.cert])
+        with open(output, "wb") as output_file:
+            output_file.write(enc_data)
+
+    def _check_recipient(self, recipient):
+        if not self.cert.fingerprint.upper().endswith(recipient.replace(" ", "").upper()):
+            logger.error("Failed to encrypt with sequoia, recipient doesn't match key", recipient=recipient)
+            raise ValueError(
+                f"Failed to encrypt: {recipient} doesn't match the imported public key {self.cert.fingerprint}"
+            )
+
+
+def create_encrypter(config):
+    public_key = config["ONS_GNU_PUBLIC_CRYPTOKEY"]
+    if config["SEFT_ENCRYPTION_BACKEND"] == "sequoia":
+        return SequoiaEncrypter(public_key)
+    return GNUEncrypter(public_key)
+
+
+def _process_gnupghome():
+    global _gnupghome
+    with _gnupghome_lock:
+        if _gnupghome is None or _gnupghome[0] != os.getpid():
+            gnupghome = tempfile.mkdtemp(prefix="frontstage-gnupg-")
+            atexit.register(shutil.rmtree, gnupghome, ignore_errors=True)
+            _gnupghome = (os.getpid(), gnupghome)
+        return _gnupghome[1]
+
+
+def get_encrypter():
+    """
+    Returns the app's encrypter for SEFT uploads, it's created (and the public key imported) on first use and then
+    kept for the life of the app
+
+    :return: A GNUEncrypter, or a SequoiaEncrypter if SEFT_ENCRYPTION_BACKEND is sequoia
+    """
+    app = current_app._get_current_object()
+    if (encrypter := app.extensions.get("seft_encrypter")) is None:
+        with _lock:
+            if (encrypter := app.extensions.get("seft_encrypter")) is None:
+                encrypter = create_encrypter(app.config)
+                app.extensions["seft_encrypter"] = encrypter
+    return encrypter
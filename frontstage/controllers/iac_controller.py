@@ -5,6 +5,7 @@ import requests
 from flask import current_app as app
 from structlog import wrap_logger
 
+from frontstage.common import http_client
 from frontstage.exceptions.exceptions import ApiError
 
 logger = wrap_logger(logging.getLogger(__name__))
@@ -21,7 +22,7 @@ def get_iac_from_enrolment(enrolment_code):
     """
     logger.info("Attempting to retrieve IAC", enrolment_code=enrolment_code)
     url = f"{app.config['IAC_URL']}/iacs/{enrolment_code}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("iac").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -2,8 +2,8 @@ import json
 import logging
 
 import structlog
-from google.cloud import pubsub_v1
 
+from frontstage.common import gcp_clients, publish_queue
 from frontstage.exceptions import exceptions
 
 logger = structlog.wrap_logger(logging.getLogger(__name__))
@@ -21,13 +21,14 @@ class NotifyGateway:
 
     def _send_message(self, email, personalisation=None, reference=None):
         """
-        Send message to gov.uk notify wrapper
+        Send message to gov.uk notify wrapper.  The message is published in the background if there's a spool to keep
+        it in, see frontstage.common.publish_queue
         :param email: email address of recipient
         :param personalisation: placeholder values in the template
         :param reference: reference to be generated if not using Notify's id
         :returns: 201 if success
         :raises KeyError: Raised when the template name provided doesn't exist
-        :raises RasNotifyError: Raised when there is an error sending a message to the gov notify service
+        :raises RasNotifyError: Raised when the message couldn't be queued, or delivered when there's no spool
         """
 
         bound_logger = logger.bind(
@@ -52,24 +53,18 @@ class NotifyGateway:
 
             payload_str = json.dumps(payload)
             if self.publisher is None:
-                self.publisher = pubsub_v1.PublisherClient()
+                self.publisher = gcp_clients.publisher()
 
             topic_path = self.publisher.topic_path(self.project_id, self.topic_id)
 
             bound_logger.info("About to publish to pubsub", topic_path=topic_path)
-            future = self.publisher.publish(topic_path, data=payload_str.encode())
-
-            msg_id = future.result()
-            bound_logger.info("Publish succeeded", msg_id=msg_id)
-            bound_logger.unbind("template_id", "project_id", "topic_id")
-        except TimeoutError as e:
-            bound_logger.error("Publish to pubsub timed out", exc_info=True)
+            publish_queue.publish(self.publisher, topic_path, payload_str.encode())
+            bound_logger.info("Queued message for pubsub")
             bound_logger.unbind("template_id", "project_id", "topic_id")
-            raise exceptions.RasNotifyError("Publish to pubsub timed out", error=e)
         except Exception as e:  # noqa
-            bound_logger.error("A non-timeout error was raised when publishing to pubsub", exc_info=True)
+            bound_logger.error("An error was raised when queueing a message for pubsub", exc_info=True)
             bound_logger.unbind("template_id", "project_id", "topic_id")
-            raise exceptions.RasNotifyError("A non-timeout error was raised when publishing to pubsub", error=e)
+            raise exceptions.RasNotifyError("An error was raised when queueing a message for pubsub", error=e)
 
     def request_to_notify(self, email, personalisation=None, reference=None):
         self._send_message(email, personalisation, reference)
@@ -1,5 +1,6 @@
 import json
 import logging
+import math
 
 import requests
 from flask import current_app as app
@@ -7,7 +8,10 @@ from requests.exceptions import ConnectionError, HTTPError, Timeout
 from structlog import wrap_logger
 from werkzeug.exceptions import NotFound
 
-from frontstage.common.thread_wrapper import ThreadWrapper
+from frontstage.common import http_client, survey_list_snapshot
+from frontstage.common.fan_out import FanOut
+from frontstage.common.party_cache import PartyCache
+from frontstage.common.request_memo import request_memoized
 from frontstage.common.utilities import obfuscate_email
 from frontstage.common.verification import decode_email_token
 from frontstage.controllers import case_controller
@@ -24,12 +28,15 @@ CLOSED_STATE = ["COMPLETE", "COMPLETEDBYPHONE", "NOLONGERREQUIRED"]
 
 logger = wrap_logger(logging.getLogger(__name__))
 
+# Respondents' enabled enrolments, named by the filter they were fetched with, used for ENROLMENT_CACHE_TTL seconds
+enrolments = PartyCache("enrolments", "ENROLMENT_CACHE_TTL")
+
 
 def get_respondent_party_by_id(party_id: str) -> dict:
     logger.info("Retrieving party from party service by id", party_id=party_id)
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/party_id/{party_id}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
 
     if response.status_code == 404:
         return
@@ -44,12 +51,30 @@ def get_respondent_party_by_id(party_id: str) -> dict:
     return response.json()
 
 
-def get_respondent_enrolments(party_id: str, payload: dict = {}) -> dict:
-    payload["status"] = "ENABLED"
+def get_respondent_enrolments(party_id: str, payload: dict = {}) -> list:
+    """
+    Gets a respondent's enabled enrolments.  They're cached for ENROLMENT_CACHE_TTL seconds, see
+    invalidate_respondents for how a change to them is picked up sooner.
+
+    :param party_id: The uuid of the respondent
+    :param payload: Filters the enrolments, e.g. by business_id
+    :return: A list of the enrolments
+    """
+    payload = dict(payload, status="ENABLED")
+    name = json.dumps(payload, sort_keys=True)
+    respondent_enrolments = enrolments.get(party_id, name)
+    if respondent_enrolments is None:
+        version = enrolments.version(party_id)
+        respondent_enrolments = _fetch_respondent_enrolments(party_id, payload)
+        enrolments.save(party_id, name, respondent_enrolments, version)
+    return respondent_enrolments
+
+
+def _fetch_respondent_enrolments(party_id: str, payload: dict) -> list:
     url = f"{app.config['PARTY_URL']}/party-api/v1/enrolments/respondent/{party_id}"
 
     try:
-        response = requests.get(url, auth=app.config["BASIC_AUTH"], json=payload)
+        response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"], json=payload)
         response.raise_for_status()
     except HTTPError as e:
         logger.error(
@@ -72,7 +97,7 @@ def add_survey(party_id, enrolment_code):
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/add_survey"
     request_json = {"party_id": party_id, "enrolment_code": enrolment_code}
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=request_json)
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"], json=request_json)
 
     try:
         response.raise_for_status()
@@ -81,6 +106,18 @@ def add_survey(party_id, enrolment_code):
         raise ApiError(logger, response)
 
     logger.info("Successfully added a survey", party_id=party_id, enrolment_code=enrolment_code)
+    invalidate_respondents(party_id)
+
+
+def invalidate_respondents(*party_ids: str):
+    """
+    Stops the cached enrolments and survey lists of respondents being used, called once frontstage has changed which
+    surveys they're enrolled on
+
+    :param party_ids: The uuids of the respondents
+    """
+    enrolments.invalidate(*party_ids)
+    survey_list_snapshot.invalidate(*party_ids)
 
 
 def change_password(email, password):
@@ -89,7 +126,7 @@ def change_password(email, password):
 
     data = {"email_address": email, "new_password": password}
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/change_password"
-    response = requests.put(url, auth=app.config["BASIC_AUTH"], json=data)
+    response = http_client.service("party").put(url, auth=app.config["BASIC_AUTH"], json=data)
 
     try:
         response.raise_for_status()
@@ -107,7 +144,7 @@ def create_account(registration_data: dict) -> None:
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents"
     registration_data["status"] = "CREATED"
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=registration_data)
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"], json=registration_data)
 
     try:
         response.raise_for_status()
@@ -125,7 +162,7 @@ def update_account(respondent_data):
     logger.info("Attempting to update account", party_id=respondent_data["id"])
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/id/{respondent_data['id']}"
-    response = requests.put(url, auth=app.config["BASIC_AUTH"], json=respondent_data)
+    response = http_client.service("party").put(url, auth=app.config["BASIC_AUTH"], json=respondent_data)
 
     try:
         response.raise_for_status()
@@ -147,7 +184,7 @@ def get_party_by_business_id(party_id, party_url, party_auth, collection_exercis
         params["collection_exercise_id"] = collection_exercise_id
     if verbose:
         params["verbose"] = True
-    response = requests.get(url, params=params, auth=party_auth)
+    response = http_client.service("party").get(url, params=params, auth=party_auth)
 
     try:
         response.raise_for_status()
@@ -175,7 +212,7 @@ def get_respondent_by_email(email):
     bound_logger.info("Attempting to find respondent party by email")
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/email"
-    response = requests.get(url, json={"email": email}, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, json={"email": email}, auth=app.config["BASIC_AUTH"])
 
     if response.status_code == 404:
         bound_logger.info("Failed to retrieve party by email")
@@ -194,7 +231,7 @@ def get_respondent_by_email(email):
 def resend_verification_email(party_id):
     logger.info("Re-sending verification email", party_id=party_id)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/resend-verification-email/{party_id}'
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -207,7 +244,7 @@ def resend_verification_email(party_id):
 def resend_verification_email_expired_token(token):
     logger.info("Re-sending verification email", token=token)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/resend-verification-email-expired-token/{token}'
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -220,7 +257,7 @@ def resend_verification_email_expired_token(token):
 def resend_account_email_change_expired_token(token):
     logger.info("Re-sending account email change verification email", token=token)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/resend-account-email-change-expired-token/{token}'
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -236,7 +273,7 @@ def reset_password_request(username):
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/request_password_change"
     data = {"email_address": username}
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=data)
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"], json=data)
 
     try:
         response.raise_for_status()
@@ -252,7 +289,7 @@ def reset_password_request(username):
 def resend_password_email_expired_token(token):
     logger.info("Re-sending password email", token=token)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/resend-password-email-expired-token/{token}'
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -266,7 +303,7 @@ def verify_email(token):
     logger.info("Attempting to verify email address", token=token)
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/emailverification/{token}"
-    response = requests.put(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").put(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -281,7 +318,7 @@ def verify_token(token):
     logger.info("Attempting to verify token with party service", token=token)
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/tokens/verify/{token}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -299,7 +336,7 @@ def verify_pending_survey_token(token):
     logger.info("Attempting to verify share/transfer survey token with party service", token=token)
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/pending-survey/verification/{token}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -311,14 +348,18 @@ def verify_pending_survey_token(token):
     return response
 
 
-def confirm_pending_survey(batch_number):
+def confirm_pending_survey(batch_number, party_ids: list):
     """
     gives call to party service to confirm pending share/transfer survey
+
+    :param batch_number: The batch number of the pending surveys
+    :param party_ids: The respondents whose enrolments change, i.e. the one accepting and, for a transfer, the one
+                      transferring
     """
     logger.info("Attempting to confirm share/transfer survey with party service", batch_number=batch_number)
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/pending-survey/confirm-pending-surveys/{batch_number}"
-    response = requests.post(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -327,6 +368,7 @@ def confirm_pending_survey(batch_number):
         raise ApiError(logger, response)
 
     logger.info("Successfully confirmed share/transfer survey", batch_number=batch_number)
+    invalidate_respondents(*party_ids)
     return response
 
 
@@ -346,24 +388,9 @@ def get_unique_survey_and_business_ids(respondent_enrolments):
     return surveys_ids, business_ids
 
 
-def caching_case_data(cache_data, business_ids, tag):
-    # Creates a list of threads which will call functions to set the case in the cache_data.
-    threads = []
-
-    for business_id in business_ids:
-        threads.append(
-            ThreadWrapper(get_case, cache_data, business_id, app.config["CASE_URL"], app.config["BASIC_AUTH"], tag)
-        )
-
-    for thread in threads:
-        thread.start()
-
-    # We do a thread join to make sure that the threads have all terminated before it carries on
-    for thread in threads:
-        thread.join()
-
-
-def get_case_list_for_respondent(respondent_enrolments: list, tag: str, business_party_id: str, survey_id: str):
+def get_case_list_for_respondent(
+    respondent_enrolments: list, tag: str, business_party_id: str, survey_id: str, failures: list = None
+):
     """
     Gets a list of cases for a respondent.
 
@@ -386,23 +413,97 @@ def get_case_list_for_respondent(respondent_enrolments: list, tag: str, business
     :param tag: This is the page that is being called e.g. to-do, history
     :param business_party_id: This is the businesses uuid
     :param survey_id: This is the surveys uuid
+    :param failures: If given, what's left out of the list because it couldn't be retrieved is added to it, see
+                     get_case_list_data
 
     """
 
     # Gets the survey ids and business ids from the enrolment data that has been generated.
-    # Converted to list to avoid multiple calls to party (and the list size is small).
     surveys_ids, business_ids = get_unique_survey_and_business_ids(respondent_enrolments)
 
-    # This is a dictionary that will store all the data that is going to be cached instead of making multiple calls
-    # inside the for loop for get_respondent_enrolments.
-    cache_data = {"cases": dict()}
-    redis_cache = RedisCache()
+    cases, collection_exercises, collection_instruments = get_case_list_data(surveys_ids, business_ids, tag, failures)
+
+    for respondent_enrolment, survey, case, collection_exercise in _enrolled_cases(
+        respondent_enrolments, cases, collection_exercises
+    ):
+        collection_instrument = collection_instruments.get(case["collectionInstrumentId"])
+        if collection_instrument is None:
+            # The lookup failed and has been logged, the rest of the list can still be shown
+            _add_failure(failures, "collection_instrument", case["collectionInstrumentId"])
+            continue
+        yield _case_list_entry(
+            respondent_enrolment, survey, case, collection_exercise, collection_instrument, business_party_id, survey_id
+        )
 
-    # Populate the cache with all case data
-    caching_case_data(cache_data, business_ids, tag)
 
-    #  Populate the enrolments by creating a dictionary using the redis_cache
-    collection_exercises = get_collection_exercises_for_surveys(surveys_ids, live_only=True)
+def get_case_list_page_for_respondent(
+    respondent_enrolments: list,
+    tag: str,
+    business_party_id: str,
+    survey_id: str,
+    page: int,
+    page_size: int,
+    failures: list = None,
+) -> tuple[list, int, int]:
+    """
+    Gets one page of the list of cases for a respondent, in the order sort_case_list puts the whole list in.
+
+    Every case and live collection exercise is needed to put the cases in order, but the collection instruments are
+    only fetched for the cases on the page, and only they are built into the list.  So how long the page takes, and
+    how big it is, doesn't grow with the number of cases the respondent has.
+
+    :param respondent_enrolments: A list containing enrolment data
+    :param tag: This is the page that is being called e.g. to-do, history
+    :param business_party_id: This is the businesses uuid
+    :param survey_id: This is the surveys uuid
+    :param page: The number of the page, starting at 1, a page past the end gets the last page
+    :param page_size: The most cases on a page
+    :param failures: If given, what's left out of the page because it couldn't be retrieved is added to it, see
+                     get_case_list_data
+    :return: The cases on the page, the number of cases in the whole list and the number of the page.  Cases left
+             off the page, because their collection instrument couldn't be fetched, aren't counted in the list.
+    """
+    surveys_ids, business_ids = get_unique_survey_and_business_ids(respondent_enrolments)
+    with http_client.deadline(app.config["SURVEY_LIST_TIMEOUT"]):
+        cases, collection_exercises = _get_cases_and_collection_exercises(surveys_ids, business_ids, tag, failures)
+
+        enrolled_cases = sorted(
+            _enrolled_cases(respondent_enrolments, cases, collection_exercises),
+            key=lambda enrolled_case: enrolled_case[3]["events"]["return_by"]["iso_date"],
+            reverse=True,
+        )
+        page = min(page, max(math.ceil(len(enrolled_cases) / page_size), 1))
+        page_cases = enrolled_cases[(page - 1) * page_size : page * page_size]
+        collection_instruments = RedisCache().get_collection_instruments(
+            [case["collectionInstrumentId"] for _, _, case, _ in page_cases]
+        )
+
+    case_list = []
+    for respondent_enrolment, survey, case, collection_exercise in page_cases:
+        collection_instrument = collection_instruments.get(case["collectionInstrumentId"])
+        if collection_instrument is None:
+            # The lookup failed and has been logged, the rest of the page can still be shown
+            _add_failure(failures, "collection_instrument", case["collectionInstrumentId"])
+            continue
+        case_list.append(
+            _case_list_entry(
+                respondent_enrolment,
+                survey,
+                case,
+                collection_exercise,
+                collection_instrument,
+                business_party_id,
+                survey_id,
+            )
+        )
+    return case_list, len(enrolled_cases) - (len(page_cases) - len(case_list)), page
+
+
+def _enrolled_cases(respondent_enrolments: list, cases: dict, collection_exercises: dict):
+    """
+    Yields each case the respondent is involved in, through being enrolled for its survey and business, along with
+    the enrolment, survey and collection exercise it's for
+    """
     for respondent_enrolment in respondent_enrolments:
 
         for survey in respondent_enrolment["survey_details"]:
@@ -411,69 +512,157 @@ def get_case_list_for_respondent(respondent_enrolments: list, tag: str, business
 
             live_collection_exercises = collection_exercises[survey["id"]]
             collection_exercises_by_id = dict((ce["id"], ce) for ce in live_collection_exercises)
-            cases_for_business = cache_data["cases"][respondent_enrolment["business_id"]]
+            cases_for_business = cases.get(respondent_enrolment["business_id"], [])
 
             # Gets all the cases for reporting unit, and by extension the user (because it's related to the business)
-            enrolled_cases = [
-                case
-                for case in cases_for_business
-                if case["caseGroup"]["collectionExerciseId"] in collection_exercises_by_id.keys()
-            ]
-
-            for case in enrolled_cases:
-                collection_exercise = collection_exercises_by_id[case["caseGroup"]["collectionExerciseId"]]
-                collection_instrument = redis_cache.get_collection_instrument(case["collectionInstrumentId"])
-                collection_instrument_type = collection_instrument["type"]
-                added_survey = (
-                    True
-                    if business_party_id == respondent_enrolment["business_id"] and survey_id == survey["id"]
-                    else None
-                )
-                display_access_button = display_button(case["caseGroup"]["caseGroupStatus"], collection_instrument_type)
-
-                yield {
-                    "case_id": case["id"],
-                    "status": case_controller.calculate_case_status(
-                        case["caseGroup"]["caseGroupStatus"],
-                        collection_instrument_type,
-                    ),
-                    "collection_instrument_type": collection_instrument_type,
-                    "survey_id": survey["id"],
-                    "survey_long_name": survey["long_name"],
-                    "survey_short_name": survey["short_name"],
-                    "survey_ref": survey["ref"],
-                    "business_party_id": respondent_enrolment["business_id"],
-                    "business_name": respondent_enrolment["business_name"],
-                    "trading_as": respondent_enrolment["trading_as"],
-                    "business_ref": respondent_enrolment["ru_ref"],
-                    "period": collection_exercise["userDescription"],
-                    "submit_by": collection_exercise["events"]["return_by"]["date"],
-                    "formatted_submit_by": collection_exercise["events"]["return_by"]["formatted_date"],
-                    "due_in": collection_exercise["events"]["return_by"]["due_time"],
-                    "collection_exercise_ref": collection_exercise["exerciseRef"],
-                    "collection_exercise_id": collection_exercise["id"],
-                    "added_survey": added_survey,
-                    "display_button": display_access_button,
-                }
-
-
-def get_case(cache_data, business_id, case_url, case_auth, tag):
-    cache_data["cases"][business_id] = case_controller.get_cases_for_list_type_by_party_id(
-        business_id, case_url, case_auth, tag
+            for case in cases_for_business:
+                collection_exercise = collection_exercises_by_id.get(case["caseGroup"]["collectionExerciseId"])
+                if collection_exercise is not None:
+                    yield respondent_enrolment, survey, case, collection_exercise
+
+
+def _case_list_entry(
+    respondent_enrolment, survey, case, collection_exercise, collection_instrument, business_party_id, survey_id
+) -> dict:
+    collection_instrument_type = collection_instrument["type"]
+    added_survey = (
+        True if business_party_id == respondent_enrolment["business_id"] and survey_id == survey["id"] else None
     )
+    display_access_button = display_button(case["caseGroup"]["caseGroupStatus"], collection_instrument_type)
+
+    return {
+        "case_id": case["id"],
+        "status": case_controller.calculate_case_status(
+            case["caseGroup"]["caseGroupStatus"],
+            collection_instrument_type,
+        ),
+        "collection_instrument_type": collection_instrument_type,
+        "survey_id": survey["id"],
+        "survey_long_name": survey["long_name"],
+        "survey_short_name": survey["short_name"],
+        "survey_ref": survey["ref"],
+        "business_party_id": respondent_enrolment["business_id"],
+        "business_name": respondent_enrolment["business_name"],
+        "trading_as": respondent_enrolment["trading_as"],
+        "business_ref": respondent_enrolment["ru_ref"],
+        "period": collection_exercise["userDescription"],
+        "submit_by": collection_exercise["events"]["return_by"]["date"],
+        "submit_by_iso_date": collection_exercise["events"]["return_by"]["iso_date"],
+        "formatted_submit_by": collection_exercise["events"]["return_by"]["formatted_date"],
+        "due_in": collection_exercise["events"]["return_by"]["due_time"],
+        "collection_exercise_ref": collection_exercise["exerciseRef"],
+        "collection_exercise_id": collection_exercise["id"],
+        "added_survey": added_survey,
+        "display_button": display_access_button,
+    }
+
+
+def sort_case_list(case_list) -> list:
+    """
+    Sorts a list of cases by the date they're to be submitted by, latest first.  Cases due on the same date stay in
+    the order they were in.
+
+    :param case_list: An iterable of cases, e.g. from get_case_list_for_respondent
+    :return: A list of the cases
+    """
+    return sorted(case_list, key=_submit_by, reverse=True)
+
+
+def _submit_by(case) -> str:
+    # An ISO 8601 date, so it sorts as a string
+    return case["submit_by_iso_date"]
+
+
+def get_case_list_data(surveys_ids: set, business_ids: set, tag: str, failures: list = None) -> tuple[dict, dict, dict]:
+    """
+    Fetches the cases for every business and the live collection exercises for every survey concurrently, then
+    gets the collection instruments for the cases in the live collection exercises in one batch.  The whole fetch
+    takes about as long as the slowest of the concurrent calls plus the batch, rather than the sum of every call, and
+    all of it has to finish within SURVEY_LIST_TIMEOUT seconds.
+
+    A business whose cases can't be retrieved, or a case whose collection instrument can't be retrieved, is logged
+    and left out so the rest of the list can still be shown.  Without the collection exercises nothing can be shown,
+    so a failure to get them is raised, as is a failure to get the cases for every business.
+
+    :param surveys_ids: The ids of the surveys the respondent is enrolled on
+    :param business_ids: The ids of the businesses the respondent is enrolled for
+    :param tag: This is the page that is being called e.g. to-do, history
+    :param failures: If given, a (kind, id) pair is added to it for each business whose cases are left out, e.g.
+                     ("cases", business_id), so the caller can tell the list is incomplete
+    :return: The cases keyed by business id, the live collection exercises keyed by survey id and the collection
+             instruments keyed by id
+    """
+    with http_client.deadline(app.config["SURVEY_LIST_TIMEOUT"]):
+        cases, collection_exercises = _get_cases_and_collection_exercises(surveys_ids, business_ids, tag, failures)
+
+        live_collection_exercise_ids = {ce["id"] for ces in collection_exercises.values() for ce in ces}
+        collection_instrument_ids = [
+            case["collectionInstrumentId"]
+            for business_cases in cases.values()
+            for case in business_cases
+            if case["caseGroup"]["collectionExerciseId"] in live_collection_exercise_ids
+        ]
+        # Whatever's left of the deadline is all the collection instruments that aren't cached have
+        collection_instruments = RedisCache().get_collection_instruments(collection_instrument_ids)
+
+    return cases, collection_exercises, collection_instruments
+
+
+def _get_cases_and_collection_exercises(
+    surveys_ids: set, business_ids: set, tag: str, failures: list = None
+) -> tuple[dict, dict]:
+    """
+    Fetches the cases for every business and the live collection exercises for every survey concurrently, within the
+    caller's deadline, see get_case_list_data
+
+    :return: The cases keyed by business id and the live collection exercises keyed by survey id
+    """
+    fan_out = FanOut()
+    fan_out.submit(("collection_exercises", None), get_collection_exercises_for_surveys, surveys_ids, live_only=True)
+    for business_id in business_ids:
+        fan_out.submit(
+            ("cases", business_id),
+            case_controller.get_cases_for_list_type_by_party_id,
+            business_id,
+            app.config["CASE_URL"],
+            app.config["BASIC_AUTH"],
+            tag,
+        )
+    results, fetch_failures = fan_out.gather()
+
+    if ("collection_exercises", None) in fetch_failures:
+        logger.error("Failed to retrieve collection exercises for survey list", survey_ids=surveys_ids)
+        raise fetch_failures[("collection_exercises", None)]
+    # The collection exercise service returns an empty list when there are no live exercises
+    collection_exercises = results.pop(("collection_exercises", None)) or {}
+
+    for (_, business_id), exception in fetch_failures.items():
+        logger.error("Failed to retrieve cases for survey list", business_id=business_id, error=repr(exception))
+        _add_failure(failures, "cases", business_id)
+    if fetch_failures and len(fetch_failures) == len(business_ids):
+        raise next(iter(fetch_failures.values()))
+    cases = {business_id: business_cases for (_, business_id), business_cases in results.items()}
+
+    return cases, collection_exercises
+
+
+def _add_failure(failures: list | None, kind: str, failed_id: str):
+    if failures is not None:
+        failures.append((kind, failed_id))
 
 
 def display_button(status, ci_type):
     return not (ci_type == "EQ" and status in CLOSED_STATE)
 
 
+@request_memoized
 def is_respondent_enrolled(party_id: str, business_party_id: str, survey_id: str) -> bool:
     url = (
         f"{app.config['PARTY_URL']}/party-api/v1/enrolments/is_respondent_enrolled/{party_id}"
         f"/business_id/{business_party_id}/survey_id/{survey_id}"
     )
     try:
-        response = requests.get(url, auth=app.config["BASIC_AUTH"])
+        response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
         response.raise_for_status()
     except HTTPError as e:
         logger.error(
@@ -497,7 +686,7 @@ def notify_party_and_respondent_account_locked(respondent_id, email_address, sta
 
     data = {"respondent_id": respondent_id, "email_address": email_address, "status_change": status}
 
-    response = requests.put(url, json=data, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").put(url, json=data, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -519,7 +708,7 @@ def get_business_by_id(business_ids: list) -> list:
     logger.info("Attempting to fetch businesses", business_ids=business_ids)
     params = {"id": business_ids}
     url = f'{app.config["PARTY_URL"]}/party-api/v1/businesses'
-    response = requests.get(url, params=params, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, params=params, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -550,7 +739,7 @@ def get_user_count_registered_against_business_and_survey(business_id: str, surv
     logger.info("Attempting to get user count", business_ids=business_id, survey_id=survey_id)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/pending-survey-users-count'
     data = {"business_id": business_id, "survey_id": survey_id, "is_transfer": is_transfer}
-    response = requests.get(url, params=data, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, params=data, auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -561,7 +750,7 @@ def get_user_count_registered_against_business_and_survey(business_id: str, surv
 def register_pending_surveys(payload: json, party_id: str) -> requests.Response:
     logger.info("Attempting register pending transfer", party_id=party_id)
     url = f'{app.config["PARTY_URL"]}/party-api/v1/pending-surveys'
-    response = requests.post(url, json=json.loads(payload), auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").post(url, json=json.loads(payload), auth=app.config["BASIC_AUTH"])
     try:
         response.raise_for_status()
     except requests.exceptions.HTTPError:
@@ -572,6 +761,8 @@ def register_pending_surveys(payload: json, party_id: str) -> requests.Response:
         )
         if response.status_code != 400:
             raise ApiError(logger, response)
+    else:
+        invalidate_respondents(party_id)
     return response
 
 
@@ -586,7 +777,7 @@ def get_pending_surveys_batch_number(batch_no):
     """
     logger.info("Attempting to retrieve share surveys by batch number", batch_no=batch_no)
     url = f"{app.config['PARTY_URL']}/party-api/v1/pending-surveys/{batch_no}"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -610,7 +801,7 @@ def create_pending_survey_account(registration_data):
 
     url = f"{app.config['PARTY_URL']}/party-api/v1/pending-survey-respondent"
     registration_data["status"] = "ACTIVE"
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=registration_data)
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"], json=registration_data)
 
     try:
         response.raise_for_status()
@@ -632,7 +823,7 @@ def get_verification_token(party_id):
     """
     logger.info("Attempting to retrieve respondent verification token", party_id=party_id)
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/{party_id}/password-verification-token"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -664,7 +855,7 @@ def post_verification_token(email, token):
     payload = {
         "token": token,
     }
-    response = requests.post(url, auth=app.config["BASIC_AUTH"], json=payload)
+    response = http_client.service("party").post(url, auth=app.config["BASIC_AUTH"], json=payload)
 
     try:
         response.raise_for_status()
@@ -692,7 +883,7 @@ def delete_verification_token(token):
 
     party_id = get_respondent_by_email(email)["id"]
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/{party_id}/password-verification-token/{token}"
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").delete(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -717,7 +908,7 @@ def get_password_reset_counter(party_id):
 
     logger.info("Attempting to retrieve respondent password reset counter", party_id=party_id)
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/{party_id}/password-reset-counter"
-    response = requests.get(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").get(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -740,7 +931,7 @@ def reset_password_reset_counter(party_id):
 
     logger.info("Attempting to reset respondent password reset counter", party_id=party_id)
     url = f"{app.config['PARTY_URL']}/party-api/v1/respondents/{party_id}/password-reset-counter"
-    response = requests.delete(url, auth=app.config["BASIC_AUTH"])
+    response = http_client.service("party").delete(url, auth=app.config["BASIC_AUTH"])
 
     try:
         response.raise_for_status()
@@ -5,6 +5,15 @@ from flask import Flask, request
 from flask_wtf.csrf import CSRFProtect
 from structlog import wrap_logger
 
+from frontstage.common import (
+    background_queue,
+    banner_cache,
+    encrypter,
+    fan_out,
+    gcp_clients,
+    http_client,
+    publish_queue,
+)
 from frontstage.exceptions.exceptions import MissingEnvironmentVariable
 from frontstage.filters.file_size_filter import file_size_filter
 from frontstage.filters.subject_filter import subject_filter
@@ -54,6 +63,14 @@ def create_app_object():
     app.jinja_env.filters["file_size_filter"] = file_size_filter
     app.jinja_env.filters["subject_filter"] = subject_filter
 
+    http_client.init_app(app)
+    fan_out.init_app(app)
+    banner_cache.init_app(app)
+    gcp_clients.init_app(app)
+    publish_queue.init_app(app)
+    background_queue.init_app(app)
+    encrypter.init_app(app)
+
     csrf = CSRFProtect(app)
     csrf.exempt("frontstage.views.session.session_refresh_expires_at")
 
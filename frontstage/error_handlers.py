@@ -2,7 +2,7 @@ import logging
 
 from flask import request, session, url_for
 from flask_wtf.csrf import CSRFError
-from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectionError, Timeout
 from structlog import wrap_logger
 from werkzeug.exceptions import Unauthorized
 from werkzeug.utils import redirect
@@ -15,6 +15,7 @@ from frontstage.exceptions.exceptions import (
     InvalidEqPayLoad,
     JWTTimeoutError,
     JWTValidationError,
+    SessionStoreUnavailable,
 )
 from frontstage.views.template_helper import render_template
 
@@ -73,6 +74,19 @@ def connection_error(error):
     return render_template("errors/500-error.html"), 500
 
 
+@app.errorhandler(Timeout)
+def timeout_error(error):
+    api_url = error.request.url if error.request else None
+    logger.error("Timed out waiting for external service", url=request.url, status_code=500, api_url=api_url)
+    return render_template("errors/500-error.html"), 500
+
+
+@app.errorhandler(SessionStoreUnavailable)
+def session_store_unavailable(error):
+    logger.error(error.message, url=request.url, status_code=503)
+    return render_template("errors/500-error.html"), 503
+
+
 @app.errorhandler(JWTValidationError)
 def jwt_validation_error(error):
     logger.error(error.message, status_code=500)
@@ -130,3 +130,9 @@ class ServiceUnavailableException(Exception):
 
     def to_dict(self):
         return {"errors": self.errors}
+
+
+class SessionStoreUnavailable(Exception):
+    def __init__(self, message="The session store is unavailable"):
+        super().__init__(message)
+        self.message = message
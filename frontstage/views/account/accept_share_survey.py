@@ -122,7 +122,7 @@ def accept_share_surveys_existing_account(session, batch):
         flash("Invalid share survey login. This share survey is not assigned to you.", "error")
         return redirect(url_for("surveys_bp.get_survey_list", tag="todo"))
     try:
-        party_controller.confirm_pending_survey(batch)
+        party_controller.confirm_pending_survey(batch, [party_id])
     except ApiError as exc:
         logger.error("Failed to confirm share survey for existing account", status=exc.status_code, batch_number=batch)
         raise exc
@@ -125,7 +125,8 @@ def accept_transfer_surveys_existing_account(session, batch):
         flash("Invalid transfer survey login. This transfer survey is not assigned to you.", "error")
         return redirect(url_for("surveys_bp.get_survey_list", tag="todo"))
     try:
-        party_controller.confirm_pending_survey(batch)
+        # The surveys move from the respondent that transferred them to this one
+        party_controller.confirm_pending_survey(batch, [party_id, response.json()[0]["shared_by"]])
     except ApiError as exc:
         logger.error(
             "Failed to confirm transfer survey for existing account", status=exc.status_code, batch_number=batch
@@ -5,7 +5,15 @@ from pathlib import Path
 from flask import Blueprint, jsonify, make_response
 from structlog import wrap_logger
 
-from frontstage import talisman
+from frontstage import redis, talisman
+from frontstage.common import (
+    background_queue,
+    http_client,
+    local_cache,
+    party_cache,
+    publish_queue,
+    redis_client,
+)
 
 logger = wrap_logger(logging.getLogger(__name__))
 
@@ -26,3 +34,18 @@ def get_info():
     info = dict(_health_check, **info)
 
     return make_response(jsonify(info), 200)
+
+
+@info_bp.route("/metrics", methods=["GET"])
+@talisman(force_https=False)
+def get_metrics():
+    metrics = {
+        "http": http_client.stats(),
+        "local_cache": local_cache.stats(),
+        "party_cache": party_cache.stats(),
+        "redis": redis_client.stats(redis),
+        "pubsub": publish_queue.stats(),
+        "background_queues": background_queue.stats(),
+    }
+
+    return make_response(jsonify(metrics), 200)
@@ -86,7 +86,7 @@ def pending_surveys_register_enter_your_details():
     is_transfer = request.args.get("is_transfer", None)
     form = PendingSurveyRegistrationForm(request.values, batch_no=batch_no, email=email, is_transfer=is_transfer)
     # Validate batch_no before rendering or checking the form
-    party_controller.get_pending_surveys_batch_number(batch_no)
+    pending_surveys = party_controller.get_pending_surveys_batch_number(batch_no)
     if request.method == "POST" and form.validate():
         logger.info("Attempting to create account against share/transfer surveys email address")
         email_address = form.email.data
@@ -117,6 +117,9 @@ def pending_surveys_register_enter_your_details():
                 raise exc
 
         logger.info("Successfully created/registered new account against pending surveys email address")
+        if bool(strtobool(is_transfer)):
+            # The surveys have moved away from the respondent that transferred them
+            party_controller.invalidate_respondents(pending_surveys.json()[0]["shared_by"])
         return render_template(
             "register/register-pending-survey-registration-complete.html", is_transfer=bool(strtobool(is_transfer))
         )
@@ -12,6 +12,8 @@ def session_expires_at(session):
 
 
 @session_bp.route("/expires-at", methods=["PATCH"])
-@jwt_authorization(request)
+@jwt_authorization(request, refresh_session=False)
 def session_refresh_expires_at(session):
+    # The respondent asked to stay signed in, so this always refreshes regardless of SESSION_REFRESH_THRESHOLD
+    session.refresh_session()
     return jsonify(expires_at=session.get_formatted_expires_in())
@@ -16,8 +16,7 @@ def logout():
     flashed_messages = get_flashed_messages(with_categories=True)
     # Delete user session in redis
     session_key = request.cookies.get("authorization")
-    session = Session.from_session_key(session_key)
-    session.delete_session()
+    Session(session_key, None).delete_session()
     if len(flashed_messages) > 0:
         for category, message in flashed_messages:
             flash(message=message, category=category)
@@ -1,6 +1,6 @@
 import logging
 
-from flask import request
+from flask import Response, request
 from structlog import wrap_logger
 
 from frontstage.common.authorisation import jwt_authorization
@@ -32,9 +32,9 @@ def download_survey(session):
         raise NoSurveyPermission(party_id, case_id)
 
     collection_instrument, headers = collection_instrument_controller.download_collection_instrument(
-        case["collectionInstrumentId"], case_id, party_id
+        case["collectionInstrumentId"], case_id, party_id, stream=True
     )
 
-    logger.info("Successfully downloaded collection instrument", case_id=case_id, party_id=party_id)
+    logger.info("Streaming collection instrument", case_id=case_id, party_id=party_id)
 
-    return collection_instrument, 200, headers
+    return Response(collection_instrument, 200, headers)
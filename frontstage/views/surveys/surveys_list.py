@@ -1,10 +1,13 @@
 import logging
-from datetime import datetime
+import math
 
+from flask import current_app as app
 from flask import make_response, request
 from flask import session as flask_session
+from flask import url_for
 from structlog import wrap_logger
 
+from frontstage.common import survey_list_snapshot
 from frontstage.common.authorisation import jwt_authorization
 from frontstage.controllers import party_controller
 from frontstage.views.surveys import surveys_bp
@@ -38,11 +41,23 @@ def get_survey_list(session, tag):
         tag=tag,
     )
 
-    respondent_enrolments = party_controller.get_respondent_enrolments(party_id)
-    survey_list = party_controller.get_case_list_for_respondent(
-        respondent_enrolments, tag, business_party_id=business_id, survey_id=survey_id
+    page_size = app.config["SURVEY_LIST_PAGE_SIZE"]
+    page = max(request.args.get("page", 1, type=int), 1) if page_size else None
+    # The list highlighting a survey that's just been added isn't a snapshot, or taken from one
+    use_snapshot = tag in ("todo", "history") and not business_id and not survey_id
+    snapshot_name = f"{tag}:{page}:{page_size}" if page_size else tag
+    survey_list = survey_list_snapshot.get(party_id, snapshot_name) if use_snapshot else None
+    if survey_list is None:
+        version = survey_list_snapshot.version(party_id) if use_snapshot else None
+        failures = []
+        survey_list = _get_survey_list(party_id, tag, business_id, survey_id, page, page_size, failures)
+        # A list missing what couldn't be retrieved is shown, but not kept, so it's fetched again on a refresh
+        if use_snapshot and not failures:
+            survey_list_snapshot.save(party_id, snapshot_name, survey_list, version)
+    sorted_survey_list = survey_list["cases"]
+    pagination = (
+        _get_pagination(tag, survey_list["page"], math.ceil(survey_list["total"] / page_size)) if page_size else None
     )
-    sorted_survey_list = sorted(survey_list, key=lambda k: datetime.strptime(k["submit_by"], "%d %b %Y"), reverse=True)
     logger.info(
         "Successfully retrieved survey list",
         party_id=party_id,
@@ -64,9 +79,10 @@ def get_survey_list(session, tag):
                 sorted_surveys_list=sorted_survey_list,
                 added_survey=added_survey,
                 already_enrolled=already_enrolled,
-                delete_option_allowed=True if len(respondent_enrolments) == 0 else False,
+                delete_option_allowed=True if survey_list["enrolment_count"] == 0 else False,
                 survey_shared=survey_shared,
                 transferred_surveys=transferred_surveys,
+                pagination=pagination,
             )
         )
 
@@ -80,4 +96,57 @@ def get_survey_list(session, tag):
             session=session,
             sorted_surveys_list=sorted_survey_list,
             history=True,
+            pagination=pagination,
+        )
+
+
+def _get_survey_list(party_id, tag, business_id, survey_id, page, page_size, failures) -> dict:
+    """
+    Gets a respondent's survey list, or one page of it if page_size is given.  What's left out of it because it
+    couldn't be retrieved is added to failures.
+
+    :return: The number of enrolments the respondent has, the sorted cases and, for a page, the number of cases in the
+             whole list and the number of the page, which is the last page if the one asked for is past the end
+    """
+    respondent_enrolments = party_controller.get_respondent_enrolments(party_id)
+    if page_size:
+        cases, total, page = party_controller.get_case_list_page_for_respondent(
+            respondent_enrolments,
+            tag,
+            business_party_id=business_id,
+            survey_id=survey_id,
+            page=page,
+            page_size=page_size,
+            failures=failures,
         )
+    else:
+        survey_list = party_controller.get_case_list_for_respondent(
+            respondent_enrolments, tag, business_party_id=business_id, survey_id=survey_id, failures=failures
+        )
+        cases = party_controller.sort_case_list(survey_list)
+        total = None
+    return {"enrolment_count": len(respondent_enrolments), "cases": cases, "total": total, "page": page}
+
+
+def _get_pagination(tag, page, page_count):
+    """
+    Returns the pagination for a survey list, or None if the list fits on one page
+
+    :param tag: The tag of the list e.g. todo, history
+    :param page: The number of the page being shown
+    :param page_count: The number of pages in the list
+    :return: The current page number and a url for every page, as the pagination component takes them.  The urls keep
+             the rest of the request's query args, e.g. the survey that's been added.
+    """
+    # A page whose cases all failed to be fetched isn't counted in the list, but it's still the page being shown
+    page_count = max(page_count, page)
+    if page_count <= 1:
+        return None
+    args = request.args.to_dict()
+    return {
+        "currentPageNumber": page,
+        "pages": [
+            {"url": url_for("surveys_bp.get_survey_list", **{**args, "tag": tag, "page": number})}
+            for number in range(1, page_count + 1)
+        ],
+    }
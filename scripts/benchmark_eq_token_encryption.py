@@ -0,0 +1,58 @@
+import json
+import logging
+import os
+import sys
+import time
+from sys import argv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_SETTINGS", "TestingConfig")
+
+from sdc.crypto.encrypter import encrypt  # noqa: E402
+from sdc.crypto.key_store import KeyStore, validate_required_keys  # noqa: E402
+
+from frontstage.common.encrypter import KEY_PURPOSE, Encrypter  # noqa: E402
+
+KEYS_PATH = "tests/test_data/jwt-test-keys/test_key.json"
+PAYLOAD = {"case_id": "8cdc01f9-656a-4715-a148-ffed0dbe1b04", "tx_id": "2f0e5e4a-8f2a-4f11-a0a3-0b8a05c1ba34"}
+
+
+def show_help_message():
+    print("\nUsage:")
+    print("python benchmark_eq_token_encryption.py [LAUNCHES]")
+    print("\n Times encrypting an EQ launch token the way every launch used to, against the shared encrypter.\n")
+
+
+def per_launch_key_store(json_secret_keys):
+    """What every launch used to do, parse the keys into a new key store and encrypt with it"""
+    keys = json.loads(json_secret_keys)
+    validate_required_keys(keys, KEY_PURPOSE)
+    encrypt(PAYLOAD, key_store=KeyStore(keys), key_purpose=KEY_PURPOSE, encryption_for_service="eq_v3")
+
+
+def time_launches(launch, launches):
+    start = time.perf_counter()
+    for _ in range(launches):
+        launch()
+    return (time.perf_counter() - start) / launches
+
+
+if len(argv) > 2 or (len(argv) == 2 and not argv[1].isdigit()):
+    show_help_message()
+    exit(1)
+
+launches = int(argv[1]) if len(argv) == 2 else 20
+# Every encryption is logged, which would bury the results
+logging.disable(logging.INFO)
+with open(KEYS_PATH) as keys_file:
+    json_secret_keys = keys_file.read()
+encrypter = Encrypter(json_secret_keys)
+
+print(f"Average of {launches} launches, in milliseconds\n")
+print(f"| {'Encrypter':<30} | {'Time':>8} |")
+print(f"|{'-' * 32}|{'-' * 10}|")
+for name, launch in (
+    ("key store built per launch", lambda: per_launch_key_store(json_secret_keys)),
+    ("shared encrypter", lambda: encrypter.encrypt(PAYLOAD, "eq_v3")),
+):
+    print(f"| {name:<30} | {time_launches(launch, launches) * 1000:>8.2f} |")
@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from sys import argv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_SETTINGS", "TestingConfig")
+
+from frontstage.controllers import collection_exercise_controller  # noqa: E402
+
+EVENTS = 1000
+TAGS = ("mps", "go_live", "return_by", "reminder", "exercise_end")
+
+
+def show_help_message():
+    print("\nUsage:")
+    print("python benchmark_event_formatting.py [ITERATIONS]")
+    print(f"\n Times formatting {EVENTS} collection exercise events, as a long todo list does.\n")
+
+
+def synthetic_events():
+    """Events for collection exercises starting over the last 6 months, which share timestamps as real ones do"""
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    events = []
+    while len(events) < EVENTS:
+        go_live = now - timedelta(days=random.randint(0, 180), hours=random.choice((0, 9)))
+        for offset, tag in enumerate(TAGS):
+            timestamp = go_live + timedelta(days=offset * random.randint(7, 60))
+            events.append({"tag": tag, "timestamp": timestamp.isoformat()})
+    return events[:EVENTS]
+
+
+def clear_caches():
+    collection_exercise_controller._parse_timestamp.cache_clear()
+    collection_exercise_controller._format_event_date.cache_clear()
+    collection_exercise_controller._due_dates = None
+
+
+def time_formatting(events, iterations, cold):
+    best = None
+    for _ in range(iterations):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        for event in events:
+            collection_exercise_controller.convert_events_to_new_format([event])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if len(argv) > 2 or (len(argv) == 2 and not argv[1].isdigit()):
+    show_help_message()
+    exit(1)
+
+iterations = int(argv[1]) if len(argv) == 2 else 5
+random.seed(0)
+events = synthetic_events()
+
+print(f"Best of {iterations}, in milliseconds, for {EVENTS} events\n")
+print(f"| {'Caches':<40} | {'Time':>8} |")
+print(f"|{'-' * 42}|{'-' * 10}|")
+for name, cold in (("cleared, e.g. the first list of the day", True), ("already warm", False)):
+    print(f"| {name:<40} | {time_formatting(events, iterations, cold) * 1000:>8.2f} |")
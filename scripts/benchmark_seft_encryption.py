@@ -0,0 +1,83 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from sys import argv
+
+import gnupg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("APP_SETTINGS", "TestingConfig")
+
+from frontstage.controllers.gnu_encryptor import (  # noqa: E402
+    GNUEncrypter,
+    SequoiaEncrypter,
+)
+
+SIZES_IN_MB = (1, 5, 10, 20)
+
+
+def show_help_message():
+    print("\nUsage:")
+    print("python benchmark_seft_encryption.py [ITERATIONS]")
+    print("\n Times encrypting 1-20MB SEFT uploads with each encryption backend.\n")
+
+
+def generate_public_key(gnupghome):
+    gpg = gnupg.GPG(gnupghome=gnupghome)
+    key = gpg.gen_key(
+        gpg.gen_key_input(
+            name_email="benchmark@example.com",
+            key_type="EDDSA",
+            key_curve="ed25519",
+            subkey_type="ECDH",
+            subkey_curve="cv25519",
+            no_protection=True,
+        )
+    )
+    return key.fingerprint, gpg.export_keys(key.fingerprint)
+
+
+def time_encrypter(create_encrypter, data, fingerprint, output, iterations):
+    best = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        create_encrypter().encrypt_file(io.BytesIO(data), fingerprint, output)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if len(argv) > 2 or (len(argv) == 2 and not argv[1].isdigit()):
+    show_help_message()
+    exit(1)
+
+iterations = int(argv[1]) if len(argv) == 2 else 3
+working_dir = tempfile.mkdtemp()
+try:
+    fingerprint, public_key = generate_public_key(tempfile.mkdtemp(dir=working_dir))
+    output = os.path.join(working_dir, "encrypted")
+
+    gpg_encrypter = GNUEncrypter(public_key, gnupghome=tempfile.mkdtemp(dir=working_dir))
+    sequoia_encrypter = SequoiaEncrypter(public_key)
+    backends = {
+        # What every upload used to do, import the key before encrypting
+        "gpg, key imported per upload": lambda: GNUEncrypter(public_key, gnupghome=tempfile.mkdtemp(dir=working_dir)),
+        "gpg": lambda: gpg_encrypter,
+        "sequoia": lambda: sequoia_encrypter,
+    }
+
+    print(f"Best of {iterations}, in seconds\n")
+    print(f"| {'Backend':<30} | " + " | ".join(f"{size:>4}MB" for size in SIZES_IN_MB) + " |")
+    print(f"|{'-' * 32}|" + "|".join("-" * 8 for _ in SIZES_IN_MB) + "|")
+    # Spreadsheets are zip files so random data is about as compressible as a real upload
+    data = {size: os.urandom(size * 1024 * 1024) for size in SIZES_IN_MB}
+    for name, create_encrypter in backends.items():
+        timings = [
+            time_encrypter(create_encrypter, data[size], fingerprint, output, iterations) for size in SIZES_IN_MB
+        ]
+        print(f"| {name:<30} | " + " | ".join(f"{timing:>6.3f}" for timing in timings) + " |")
+finally:
+    shutil.rmtree(working_dir, ignore_errors=True)
@@ -1,4 +1,5 @@
 import json
+import time
 import unittest
 import uuid
 from datetime import datetime, timezone
@@ -8,7 +9,9 @@ import requests_mock
 from freezegun import freeze_time
 
 from frontstage import app
+from frontstage.common import local_cache
 from frontstage.common.eq_payload import EqPayload
+from frontstage.common.fan_out import DeadlineExceeded
 from frontstage.common.redis_cache import RedisCache
 from frontstage.controllers import collection_exercise_controller
 from frontstage.exceptions.exceptions import ApiError, InvalidEqPayLoad
@@ -461,6 +464,66 @@ class TestGenerateEqURL(unittest.TestCase):
             # and the payload doesn't have a cir_instrument_id
             self.assertNotIn("cir_instrument_id", payload_created.keys())
 
+    @requests_mock.mock()
+    @patch.object(RedisCache, "get_registry_instrument", return_value=None)
+    def test_create_payload_reuses_cached_events(self, mock_request, mock_redis):
+        # Given the services respond and collection exercise events are cached
+        mock_request.get(url_get_collection_exercise_events, json=collection_exercise_events)
+        mock_request.get(url_get_business_party, json=business_party)
+        mock_request.get(url_get_ci, json=collection_instrument_eq)
+        local_cache.clear_all()
+
+        # When two payloads are created for the same collection exercise
+        with app.app_context(), patch.dict(app.config, {"COLLECTION_EXERCISE_CACHE_TTL": 60}):
+            for _ in range(2):
+                EqPayload().create_payload(
+                    case, collection_exercise, respondent_party["id"], business_party["id"], survey_eq
+                )
+
+        # Then the events are only fetched once
+        events_requests = [r for r in mock_request.request_history if r.url == url_get_collection_exercise_events]
+        self.assertEqual(1, len(events_requests))
+        local_cache.clear_all()
+
+    @requests_mock.mock()
+    @patch.object(RedisCache, "get_registry_instrument", return_value=None)
+    def test_create_payload_records_timings(self, mock_request, mock_redis):
+        # Given the services respond
+        mock_request.get(url_get_collection_exercise_events, json=collection_exercise_events)
+        mock_request.get(url_get_business_party, json=business_party)
+        mock_request.get(url_get_ci, json=collection_instrument_eq)
+        timings = {}
+
+        # When a payload is created
+        with app.app_context():
+            payload_created = EqPayload().create_payload(
+                case, collection_exercise, respondent_party["id"], business_party["id"], survey_eq, timings=timings
+            )
+
+        # Then each fetch is timed
+        self.assertIn("schema_name", payload_created)
+        self.assertEqual({"collection_instrument", "registry_instrument", "business_party", "ce_events"}, set(timings))
+
+    @requests_mock.mock()
+    @patch.object(RedisCache, "get_registry_instrument", return_value=None)
+    def test_create_payload_deadline(self, mock_request, mock_redis):
+        # Given the business is slow to respond
+        def slow_business(request, context):
+            time.sleep(0.5)
+            return business_party
+
+        mock_request.get(url_get_collection_exercise_events, json=collection_exercise_events)
+        mock_request.get(url_get_business_party, json=slow_business)
+        mock_request.get(url_get_ci, json=collection_instrument_eq)
+
+        # When a payload is created with a shorter deadline
+        # Then it fails rather than waiting
+        with app.app_context(), patch.dict(app.config, {"EQ_LAUNCH_TIMEOUT": 0.1}):
+            with self.assertRaises(DeadlineExceeded):
+                EqPayload().create_payload(
+                    case, collection_exercise, respondent_party["id"], business_party["id"], survey_eq
+                )
+
 
 def _is_valid_uuid(uuid_string: str) -> bool:
     try:
@@ -1,9 +1,10 @@
 import unittest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 from freezegun import freeze_time
 
-from frontstage import app, redis
+from frontstage import app, jwt, redis
 from frontstage.common.session import Session
 
 TIME_TO_FREEZE = datetime(2024, 1, 1, 12, 0, 0)
@@ -60,3 +61,43 @@ class TestSession(unittest.TestCase):
         decoded_jwt = session_from_redis.get_decoded_jwt()
         self.assertEqual(decoded_jwt["party_id"], "party")
         self.assertEqual(session_from_redis.get_party_id(), "party")
+
+    def test_jwt_decoded_once(self):
+        session_key = Session.from_party_id("party").session_key
+
+        with patch("frontstage.jwt.decode", wraps=jwt.decode) as decode:
+            session = Session.from_session_key(session_key)
+            session.get_party_id()
+            session.get_formatted_expires_in()
+            session.refresh_session()
+            session.get_party_id()
+
+        decode.assert_called_once()
+        self.assertEqual(session.get_decoded_jwt(), jwt.decode(session.get_encoded_jwt()))
+
+    def test_from_request_session_key(self):
+        session_key = Session.from_party_id("party").session_key
+
+        with app.test_request_context():
+            session = Session.from_request_session_key(session_key)
+            self.assertIs(Session.from_request_session_key(session_key), session)
+            self.assertIsNot(Session.from_request_session_key("other"), session)
+
+        with app.test_request_context():
+            self.assertIsNot(Session.from_request_session_key(session_key), session)
+
+    @freeze_time(TIME_TO_FREEZE)
+    def test_refresh_session_below_threshold(self):
+        session = Session.from_party_id("party")
+        original_expiry = session.get_expires_in()
+
+        with freeze_time(TIME_TO_FREEZE + timedelta(minutes=2)):
+            with patch.object(redis, "setex") as setex:
+                self.assertFalse(session.refresh_session(threshold=3300))
+                setex.assert_not_called()
+        self.assertEqual(session.get_expires_in(), original_expiry)
+
+        future_time = TIME_TO_FREEZE + timedelta(minutes=6)
+        with freeze_time(future_time):
+            self.assertTrue(session.refresh_session(threshold=3300))
+        self.assertEqual(datetime.fromtimestamp(session.get_expires_in()), future_time + timedelta(minutes=60))
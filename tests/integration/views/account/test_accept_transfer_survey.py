@@ -155,6 +155,7 @@ class TestAcceptTransferSurvey(unittest.TestCase):
                 "business_ref": "49900000007",
                 "period": "December 2019",
                 "submit_by": "26 Mar 2021",
+                "submit_by_iso_date": "2021-03-26",
                 "collection_exercise_ref": "1912",
                 "added_survey": None,
                 "display_button": True,
@@ -190,6 +191,7 @@ class TestAcceptTransferSurvey(unittest.TestCase):
                 "business_ref": "49900000007",
                 "period": "December 2019",
                 "submit_by": "26 Mar 2021",
+                "submit_by_iso_date": "2021-03-26",
                 "collection_exercise_ref": "1912",
                 "added_survey": None,
                 "display_button": True,
@@ -237,6 +239,35 @@ class TestAcceptTransferSurvey(unittest.TestCase):
         )
         self.assertIn("To access your surveys you must first sign in.".encode(), response.data)
 
+    @requests_mock.mock()
+    @patch("frontstage.views.register.enter_account_details.render_template")
+    @patch("frontstage.controllers.party_controller.invalidate_respondents")
+    def test_post_accept_transfer_surveys_non_existing_account_invalidates_transferrer(
+        self, mock_request, invalidate_respondents, render_template
+    ):
+        render_template.return_value = "Thank you"
+        mock_request.get(url_banner_api, status_code=404)
+        mock_request.get(url_get_pending_transfers_by_batch, status_code=200, json=[dummy_pending_transfer])
+        mock_request.post(url_post_transfer_survey_respondent, status_code=201, json={})
+        data = {
+            "first_name": "test",
+            "last_name": "test",
+            "password": "Testtest!129",
+            "password_confirm": "Testtest!129",
+            "phone_number": "07456534567",
+        }
+
+        with patch.dict(app.config, {"WTF_CSRF_ENABLED": False}):
+            response = self.app.post(
+                f"/register/pending-surveys/create-account/enter-account-details?batch_no={batch_number}"
+                f"&email=test@test.com&is_transfer={True}",
+                data=data,
+            )
+
+        # The surveys have moved away from the respondent that transferred them, so their cache is stale
+        self.assertEqual(response.status_code, 200)
+        invalidate_respondents.assert_called_once_with(dummy_pending_transfer["shared_by"])
+
     @requests_mock.mock()
     def test_get_accept_transfer_surveys_fail(self, mock_request):
         mock_request.get(url_banner_api, status_code=404)
@@ -49,6 +49,7 @@ class TestSurveyList(unittest.TestCase):
                 "business_ref": "49900000007",
                 "period": "December 2019",
                 "submit_by": "26 Mar 2021",
+                "submit_by_iso_date": "2021-03-26",
                 "collection_exercise_ref": "1912",
                 "added_survey": None,
                 "display_button": True,
@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 import requests_mock
 
-from frontstage import app
+from frontstage import app, redis
 from tests.integration.mocked_services import (
     encoded_jwt_token,
     respondent_enrolments,
@@ -51,6 +51,121 @@ class TestSurveyList(unittest.TestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    @patch("frontstage.views.surveys.surveys_list.render_template")
+    @patch("frontstage.controllers.party_controller.get_case_list_page_for_respondent")
+    @patch("frontstage.controllers.party_controller.get_respondent_enrolments")
+    def test_survey_list_history_paginated(
+        self, mock_request, get_respondent_enrolments, get_case_list_page, render_template
+    ):
+        mock_request.get(url_banner_api, status_code=404)
+        get_respondent_enrolments.return_value = respondent_enrolments
+        get_case_list_page.return_value = (survey_list_history, 25, 2)
+        render_template.return_value = "Completed surveys"
+
+        with patch.dict(app.config, {"SURVEY_LIST_PAGE_SIZE": 10}):
+            response = self.app.get("/surveys/history?page=2")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(2, get_case_list_page.call_args.kwargs["page"])
+        self.assertEqual(
+            {
+                "currentPageNumber": 2,
+                "pages": [{"url": f"/surveys/history?page={page}"} for page in (1, 2, 3)],
+            },
+            render_template.call_args.kwargs["pagination"],
+        )
+
+    @patch("frontstage.views.surveys.surveys_list.render_template")
+    @patch("frontstage.controllers.party_controller.get_case_list_page_for_respondent")
+    @patch("frontstage.controllers.party_controller.get_respondent_enrolments")
+    def test_survey_list_paginated_past_the_end(
+        self, mock_request, get_respondent_enrolments, get_case_list_page, render_template
+    ):
+        mock_request.get(url_banner_api, status_code=404)
+        get_respondent_enrolments.return_value = respondent_enrolments
+        # The controller shows the last page instead
+        get_case_list_page.return_value = (survey_list_todo, 15, 2)
+        render_template.return_value = "Surveys to do"
+
+        with patch.dict(app.config, {"SURVEY_LIST_PAGE_SIZE": 10}):
+            response = self.app.get("/surveys/todo?page=9&business_party_id=business&survey_id=survey")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(9, get_case_list_page.call_args.kwargs["page"])
+        self.assertEqual(
+            {
+                "currentPageNumber": 2,
+                "pages": [
+                    {"url": f"/surveys/todo?page={page}&business_party_id=business&survey_id=survey"} for page in (1, 2)
+                ],
+            },
+            render_template.call_args.kwargs["pagination"],
+        )
+
+    @patch("frontstage.views.surveys.surveys_list.render_template")
+    @patch("frontstage.controllers.party_controller.get_case_list_for_respondent")
+    @patch("frontstage.controllers.party_controller.get_respondent_enrolments")
+    def test_survey_list_history_from_snapshot(
+        self, mock_request, get_respondent_enrolments, get_survey_list, render_template
+    ):
+        mock_request.get(url_banner_api, status_code=404)
+        get_respondent_enrolments.return_value = respondent_enrolments
+        get_survey_list.return_value = survey_list_history
+        render_template.return_value = "Completed surveys"
+        redis.flushall()
+
+        with patch.dict(app.config, {"SURVEY_LIST_SNAPSHOT_TTL": 30}):
+            self.app.get("/surveys/history")
+            response = self.app.get("/surveys/history")
+
+        self.assertEqual(response.status_code, 200)
+        get_respondent_enrolments.assert_called_once()
+        get_survey_list.assert_called_once()
+        self.assertEqual(
+            render_template.call_args_list[0].kwargs["sorted_surveys_list"],
+            render_template.call_args_list[1].kwargs["sorted_surveys_list"],
+        )
+
+    @patch("frontstage.views.surveys.surveys_list.render_template")
+    @patch("frontstage.controllers.case_controller.get_cases_for_list_type_by_party_id")
+    @patch("frontstage.controllers.party_controller.get_collection_exercises_for_surveys")
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    @patch("frontstage.controllers.party_controller.get_respondent_enrolments")
+    def test_survey_list_with_failed_business_is_not_kept_as_snapshot(
+        self,
+        mock_request,
+        get_respondent_enrolments,
+        get_collection_instruments,
+        get_collection_exercises,
+        get_cases,
+        render_template,
+    ):
+        mock_request.get(url_banner_api, status_code=404)
+        get_respondent_enrolments.return_value = respondent_enrolments
+        get_collection_exercises.return_value = {}
+        get_collection_instruments.return_value = {}
+        render_template.return_value = "Surveys to do"
+        business_ids = {enrolment["business_id"] for enrolment in respondent_enrolments}
+        failing_business_id = sorted(business_ids)[0]
+
+        def get_cases_for_business(business_id, *args):
+            # One business's cases fail the first time, e.g. the case service timed out
+            if business_id == failing_business_id and get_cases.call_count <= len(business_ids):
+                raise ConnectionError("Case service unavailable")
+            return []
+
+        get_cases.side_effect = get_cases_for_business
+        redis.flushall()
+
+        with patch.dict(app.config, {"SURVEY_LIST_SNAPSHOT_TTL": 30}):
+            self.app.get("/surveys/todo")
+            response = self.app.get("/surveys/todo")
+            self.app.get("/surveys/todo")
+
+        # Then the incomplete list isn't kept, so the refresh fetches it again, and the complete one is kept
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(2 * len(business_ids), get_cases.call_count)
+
     @patch("frontstage.controllers.party_controller.get_case_list_for_respondent")
     @patch("frontstage.controllers.party_controller.get_respondent_enrolments")
     def test_survey_list_todo_when_no_enrolments(self, mock_request, get_respondent_enrolments, get_survey_list):
@@ -51,3 +51,9 @@ class TestBannerController(unittest.TestCase):
                 actual = banner_controller.current_banner()
                 self.assertEqual(expected, actual)
                 self.assertIn("Failed to connect to banner", logs.output[0])
+
+    def test_fetch_banner_server_error_is_none(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, url_banner_api, status=500, content_type="application/json")
+            with app.app_context():
+                self.assertIsNone(banner_controller.fetch_banner())
@@ -263,12 +263,37 @@ class TestCaseControllers(unittest.TestCase):
                         case["id"], respondent_party["id"], message["category"], message["description"]
                     )
 
+    @patch("frontstage.controllers.case_controller.send_case_event")
+    def test_post_case_event_is_queued(self, send_case_event):
+        with app.app_context(), patch("frontstage.common.background_queue.case_event_queue") as case_event_queue:
+            case_controller.post_case_event(case["id"], respondent_party["id"], "EQ_LAUNCH", "Launched")
+
+            key, task = case_event_queue.return_value.submit.call_args.args
+            self.assertEqual(case["id"], key)
+            send_case_event.assert_not_called()
+            task()
+            send_case_event.assert_called_once_with(case["id"], respondent_party["id"], "EQ_LAUNCH", "Launched")
+
+    def test_case_event_retryable(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.POST, url_post_case_event_uuid, status=503)
+            rsps.add(rsps.POST, url_post_case_event_uuid, status=400)
+            with app.app_context():
+                server_error = ApiError(case_controller.logger, case_controller.requests.post(url_post_case_event_uuid))
+                client_error = ApiError(case_controller.logger, case_controller.requests.post(url_post_case_event_uuid))
+
+        self.assertTrue(case_controller._is_retryable(server_error))
+        self.assertFalse(case_controller._is_retryable(client_error))
+        self.assertTrue(case_controller._is_retryable(case_controller.requests.exceptions.ConnectionError()))
+        self.assertFalse(case_controller._is_retryable(InvalidCaseCategory("Banana")))
+
     @patch("frontstage.controllers.case_controller.get_case_categories")
     def test_validate_case_category_valid_category(self, get_case_event_categories):
         get_case_event_categories.return_value = categories
 
         try:
-            case_controller.validate_case_category(categories[0]["name"])
+            with app.app_context():
+                case_controller.validate_case_category(categories[0]["name"])
         except InvalidCaseCategory:
             self.fail("Unexpected validation fail for case category")
 
@@ -276,7 +301,7 @@ class TestCaseControllers(unittest.TestCase):
     def test_validate_case_category_invalid_category(self, get_case_event_categories):
         get_case_event_categories.return_value = categories
 
-        with self.assertRaises(InvalidCaseCategory):
+        with self.assertRaises(InvalidCaseCategory), app.app_context():
             case_controller.validate_case_category("Banana")
 
     @patch("frontstage.controllers.case_controller.get_cases_by_party_id")
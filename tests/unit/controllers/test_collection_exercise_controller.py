@@ -1,11 +1,14 @@
 import unittest
 from datetime import datetime, timedelta
+from unittest.mock import patch
 
 import responses
+from freezegun import freeze_time
 from iso8601 import ParseError
 
 from config import TestingConfig
 from frontstage import app
+from frontstage.common import local_cache
 from frontstage.controllers import collection_exercise_controller
 from frontstage.controllers.collection_exercise_controller import (
     due_date_converter,
@@ -15,6 +18,10 @@ from frontstage.exceptions.exceptions import ApiError
 from tests.integration.mocked_services import (
     collection_exercise,
     collection_exercise_by_survey,
+    collection_exercise_events,
+    collection_exercises_for_survey_ids,
+    url_get_collection_exercise,
+    url_get_collection_exercise_events,
     url_get_collection_exercises_by_surveys,
 )
 
@@ -25,6 +32,7 @@ class TestCollectionExerciseController(unittest.TestCase):
         app.config.from_object(app_config)
         self.app = app.test_client()
         self.app_config = self.app.application.config
+        local_cache.clear_all()
 
     def test_get_collection_exercises_for_survey_success(self):
         with responses.RequestsMock() as rsps:
@@ -57,6 +65,70 @@ class TestCollectionExerciseController(unittest.TestCase):
 
                 self.assertListEqual(collection_exercises, [])
 
+    def test_get_collection_exercise_cached(self):
+        with responses.RequestsMock() as rsps, app.app_context():
+            rsps.add(rsps.GET, url_get_collection_exercise, json=collection_exercise, status=200)
+            with patch.dict(app.config, {"COLLECTION_EXERCISE_CACHE_TTL": 30 * 24 * 60 * 60}):
+                with freeze_time("2018-07-12T00:00:00"):
+                    before = collection_exercise_controller.get_collection_exercise(collection_exercise["id"])
+                with freeze_time("2018-07-21T00:00:00"):
+                    after = collection_exercise_controller.get_collection_exercise(collection_exercise["id"])
+
+            # Fetched once, with the fields that depend on today's date worked out on each read
+            self.assertEqual(1, len(rsps.calls))
+            self.assertTrue(before["events"]["go_live"]["is_in_future"])
+            self.assertFalse(after["events"]["go_live"]["is_in_future"])
+            self.assertEqual("Due in 10 days", before["events"]["return_by"]["due_time"])
+            self.assertEqual("Due tomorrow", after["events"]["return_by"]["due_time"])
+            self.assertEqual(
+                before["events"]["return_by"]["formatted_date"], after["events"]["return_by"]["formatted_date"]
+            )
+            self.assertIsNot(before, after)
+
+    def test_get_collection_exercise_not_cached_without_ttl(self):
+        with responses.RequestsMock() as rsps, app.app_context():
+            rsps.add(rsps.GET, url_get_collection_exercise, json=collection_exercise, status=200)
+            collection_exercise_controller.get_collection_exercise(collection_exercise["id"])
+            collection_exercise_controller.get_collection_exercise(collection_exercise["id"])
+
+            self.assertEqual(2, len(rsps.calls))
+
+    def test_get_collection_exercise_events_cached(self):
+        with responses.RequestsMock() as rsps, app.app_context():
+            rsps.add(rsps.GET, url_get_collection_exercise_events, json=collection_exercise_events, status=200)
+            with patch.dict(app.config, {"COLLECTION_EXERCISE_CACHE_TTL": 60}):
+                collection_exercise_controller.get_collection_exercise_events(collection_exercise["id"])
+                events = collection_exercise_controller.get_collection_exercise_events(collection_exercise["id"])
+
+            self.assertEqual(1, len(rsps.calls))
+            self.assertEqual(collection_exercise_events, events)
+
+    def test_get_collection_exercises_for_surveys_cached_by_survey_set(self):
+        survey_ids = list(collection_exercises_for_survey_ids)
+        with responses.RequestsMock() as rsps, app.app_context():
+            rsps.add(rsps.GET, url_get_collection_exercises_by_surveys, json=collection_exercises_for_survey_ids)
+            with patch.dict(app.config, {"COLLECTION_EXERCISE_CACHE_TTL": 60}):
+                collection_exercise_controller.get_collection_exercises_for_surveys(survey_ids)
+                collection_exercises = collection_exercise_controller.get_collection_exercises_for_surveys(
+                    list(reversed(survey_ids))
+                )
+                collection_exercise_controller.get_collection_exercises_for_surveys(survey_ids, live_only=True)
+
+            self.assertEqual(2, len(rsps.calls))
+            self.assertEqual(set(survey_ids), set(collection_exercises))
+
+    def test_get_collection_exercises_for_surveys_no_exercises_cached(self):
+        with responses.RequestsMock() as rsps, app.app_context():
+            rsps.add(rsps.GET, url_get_collection_exercises_by_surveys, status=204)
+            with patch.dict(app.config, {"COLLECTION_EXERCISE_CACHE_TTL": 60}):
+                collection_exercise_controller.get_collection_exercises_for_surveys([collection_exercise["surveyId"]])
+                collection_exercises = collection_exercise_controller.get_collection_exercises_for_surveys(
+                    [collection_exercise["surveyId"]]
+                )
+
+            self.assertEqual(1, len(rsps.calls))
+            self.assertListEqual([], collection_exercises)
+
     def test_convert_events_to_new_format_successful(self):
         formatted_events = collection_exercise_controller.convert_events_to_new_format(collection_exercise["events"])
 
@@ -124,3 +196,14 @@ class TestCollectionExerciseController(unittest.TestCase):
         today = datetime.now() - timedelta(days=120)
         response = due_date_converter(today)
         self.assertEqual(None, response)
+
+    def test_due_date_convertor_changes_with_the_day(self):
+        event = datetime(2024, 3, 10, 9, 0)
+        with freeze_time("2024-03-08T10:00:00"):
+            self.assertEqual("Due in a month", due_date_converter(event + timedelta(days=30)))
+            self.assertEqual("Due in 2 days", due_date_converter(event + timedelta(days=1)))
+        with freeze_time("2024-03-08T08:00:00"):
+            self.assertEqual("Due in 3 days", due_date_converter(event + timedelta(days=1)))
+        with freeze_time("2024-03-10T08:00:00"):
+            self.assertEqual("Due today", due_date_converter(event))
+            self.assertEqual("Due in 28 days", due_date_converter(event + timedelta(days=28)))
@@ -14,7 +14,11 @@ from frontstage.controllers.collection_instrument_controller import (
     get_collection_instrument,
     upload_collection_instrument,
 )
-from frontstage.controllers.gcp_survey_response import SurveyResponseError
+from frontstage.controllers.gcp_survey_response import (
+    MAX_FILE_SIZE_ERROR,
+    FileTooLargeError,
+    SurveyResponseError,
+)
 from frontstage.exceptions.exceptions import ApiError, CiUploadError
 from tests.integration.mocked_services import (
     business_party,
@@ -71,6 +75,30 @@ class TestCollectionInstrumentController(unittest.TestCase):
                 with self.assertRaises(ApiError):
                     download_collection_instrument(collection_instrument_seft["id"], case["id"], business_party["id"])
 
+    @patch("frontstage.controllers.case_controller.post_case_event")
+    def test_download_collection_instrument_streamed(self, post_case_event):
+        body = b"spreadsheet" * 10000
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET,
+                url_download_ci,
+                body=body,
+                status=200,
+                headers={"Transfer-Encoding": "chunked"},
+                content_type="application/vnd.ms-excel",
+            )
+            with app.app_context(), patch.dict(app.config, {"CI_DOWNLOAD_CHUNK_SIZE": 1024}):
+                chunks, headers = download_collection_instrument(
+                    collection_instrument_seft["id"], case["id"], business_party["id"], stream=True
+                )
+                chunks = list(chunks)
+
+        self.assertEqual(b"".join(chunks), body)
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), 1024)
+        self.assertEqual(dict(headers)["Access-Control-Allow-Origin"], "http://localhost")
+        self.assertNotIn("transfer-encoding", {key.lower() for key, _ in headers})
+        self.assertEqual(post_case_event.call_args.kwargs["category"], "COLLECTION_INSTRUMENT_DOWNLOADED")
+
     def test_collection_instrument_success(self):
         with responses.RequestsMock() as rsps:
             rsps.add(rsps.GET, url_get_ci, json=collection_instrument_seft, status=200)
@@ -135,6 +163,21 @@ class TestCollectionInstrumentController(unittest.TestCase):
                     self.survey_file, self.survey_file_size, case, business_party, party["id"], survey
                 )
 
+    @patch("frontstage.controllers.case_controller.post_case_event")
+    @patch("frontstage.controllers.gcp_survey_response.GcpSurveyResponse.upload_seft_survey_response")
+    def test_upload_collection_instrument_larger_than_content_length(
+        self, upload_seft_survey_response, post_case_event
+    ):
+        upload_seft_survey_response.side_effect = FileTooLargeError()
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, url_get_collection_exercise, json=collection_exercise, status=200)
+            with app.app_context():
+                validation_errors = upload_collection_instrument(
+                    self.survey_file, self.survey_file_size, case, business_party, party["id"], survey
+                )
+        self.assertEqual(validation_errors, [MAX_FILE_SIZE_ERROR])
+        self.assertEqual("UNSUCCESSFUL_RESPONSE_UPLOAD", post_case_event.call_args.kwargs["category"])
+
     @patch("frontstage.controllers.case_controller.post_case_event")
     @patch("frontstage.controllers.gcp_survey_response.GcpSurveyResponse.create_file_name_for_upload")
     @patch("frontstage.controllers.gcp_survey_response.GcpSurveyResponse.upload_seft_survey_response")
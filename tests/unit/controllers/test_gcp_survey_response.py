@@ -1,6 +1,9 @@
+import hashlib
+import io
 import json
+import shutil
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import responses
 
@@ -11,6 +14,7 @@ from frontstage.controllers.gcp_survey_response import (
     FILE_NAME_LENGTH_ERROR,
     MAX_FILE_SIZE_ERROR,
     MIN_FILE_SIZE_ERROR,
+    FileTooLargeError,
     GcpSurveyResponse,
     SurveyResponseError,
 )
@@ -25,6 +29,42 @@ from tests.integration.mocked_services import (
 )
 
 
+class FakeBlob:
+    """Stands in for a GCS blob, reading what's uploaded the way a resumable upload does, a chunk at a time"""
+
+    def __init__(self, name, chunk_size=None):
+        self.name = name
+        self.chunk_size = chunk_size
+        self.data = b""
+        self.largest_read = 0
+        self.content_type = None
+
+    def upload_from_file(self, file_obj, size=None, content_type=None):
+        self.content_type = content_type
+        while chunk := file_obj.read(self.chunk_size):
+            self.largest_read = max(self.largest_read, len(chunk))
+            self.data += chunk
+        assert len(self.data) == size
+
+
+class FakeBucket:
+    def __init__(self):
+        self.blobs = {}
+
+    def blob(self, name, chunk_size=None):
+        self.blobs[name] = FakeBlob(name, chunk_size)
+        return self.blobs[name]
+
+
+class FakeEncrypter:
+    """Encrypts by copying the file, the point is that it's given a file and writes to a path"""
+
+    def encrypt_file(self, file, _, output):
+        with open(output, "wb") as encrypted:
+            encrypted.write(b"-----BEGIN PGP MESSAGE-----\n")
+            shutil.copyfileobj(file, encrypted)
+
+
 class TestGcpSurveyResponse(TestCase):
     """Survey response unit tests"""
 
@@ -115,6 +155,18 @@ class TestGcpSurveyResponse(TestCase):
             publisher.publish.assert_called_with("projects/test-project/topics/test-topic", data=data, tx_id=self.tx_id)
             self.assertIsNone(result)
 
+    def test_failed_send_to_pub_sub_without_spool(self):
+        with app.app_context():
+            publisher = MagicMock()
+            publisher.topic_path.return_value = "projects/test-project/topics/test-topic"
+            publisher.publish.return_value.result.side_effect = TimeoutError("Deadline exceeded")
+            survey_response = GcpSurveyResponse(self.config)
+            survey_response.publisher = publisher
+
+            # SDX would never hear of the file in the bucket, so the respondent is told the upload failed
+            with self.assertRaises(TimeoutError):
+                survey_response.put_message_into_pubsub(self.pubsub_payload, self.tx_id)
+
     @responses.activate
     def test_create_file_name_success(self):
         responses.add(responses.GET, url_get_collection_exercise, json=collection_exercise, status=200)
@@ -181,3 +233,40 @@ class TestGcpSurveyResponse(TestCase):
                 "valid_file_name", "txt", app.config["MAX_UPLOAD_SIZE"] + 1
             )
         self.assertEqual(validation_errors, [FILE_EXTENSION_ERROR, MAX_FILE_SIZE_ERROR])
+
+    @patch("frontstage.controllers.gcp_survey_response.get_encrypter", FakeEncrypter)
+    def test_put_file_into_gcp_bucket_streams(self):
+        contents = b"x" * (3 * 256 * 1024 + 10)
+        bucket = FakeBucket()
+        survey_response = GcpSurveyResponse(dict(self.config, SEFT_UPLOAD_CHUNK_SIZE=256 * 1024))
+        survey_response.storage_client = MagicMock()
+        survey_response.storage_client.bucket.return_value = bucket
+
+        with app.app_context():
+            results = survey_response.put_file_into_gcp_bucket(io.BytesIO(contents), "file.xlsx.gpg")
+
+        blob = bucket.blobs["file.xlsx.gpg"]
+        expected = b"-----BEGIN PGP MESSAGE-----\n" + contents
+        self.assertEqual(blob.data, expected)
+        self.assertEqual(blob.chunk_size, 256 * 1024)
+        self.assertLessEqual(blob.largest_read, 256 * 1024)
+        self.assertEqual(results, {"md5sum": hashlib.md5(expected).hexdigest(), "fileSizeInBytes": len(expected)})
+
+    @patch("frontstage.controllers.gcp_survey_response.get_encrypter", FakeEncrypter)
+    def test_put_file_into_gcp_bucket_larger_than_max_upload_size(self):
+        bucket = FakeBucket()
+        survey_response = GcpSurveyResponse(dict(self.config, SEFT_UPLOAD_CHUNK_SIZE=256 * 1024))
+        survey_response.storage_client = MagicMock()
+        survey_response.storage_client.bucket.return_value = bucket
+
+        with app.app_context(), patch.dict(app.config, {"MAX_UPLOAD_SIZE": 1000}):
+            # A file of exactly the limit is put in the bucket
+            survey_response.put_file_into_gcp_bucket(io.BytesIO(b"x" * 1000), "file.xlsx.gpg")
+            self.assertEqual(1000 + 28, len(bucket.blobs["file.xlsx.gpg"].data))
+
+            # One that's larger, whatever Content-Length said, isn't read past the limit or uploaded
+            file = io.BytesIO(b"x" * 300 * 1024)
+            with self.assertRaises(FileTooLargeError):
+                survey_response.put_file_into_gcp_bucket(file, "large.xlsx.gpg")
+            self.assertLessEqual(file.tell(), 1001)
+            self.assertEqual(b"", bucket.blobs["large.xlsx.gpg"].data)
@@ -0,0 +1,127 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import gnupg
+
+from frontstage import app
+from frontstage.controllers import gnu_encryptor
+from frontstage.controllers.gnu_encryptor import (
+    GNUEncrypter,
+    SequoiaEncrypter,
+    get_encrypter,
+)
+
+
+class TestGNUEncrypter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A throwaway key pair, the private half stays in this keyring so the encrypted data can be checked
+        cls.private_home = tempfile.mkdtemp()
+        cls.gpg = gnupg.GPG(gnupghome=cls.private_home)
+        key = cls.gpg.gen_key(
+            cls.gpg.gen_key_input(
+                name_email="test@example.com",
+                key_type="EDDSA",
+                key_curve="ed25519",
+                subkey_type="ECDH",
+                subkey_curve="cv25519",
+                no_protection=True,
+            )
+        )
+        cls.fingerprint = key.fingerprint
+        cls.public_key = cls.gpg.export_keys(cls.fingerprint)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.private_home)
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.output_dir, "encrypted")
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+        app.extensions.pop("seft_encrypter", None)
+
+    def test_gpg_imports_key_into_its_own_keyring(self):
+        encrypter = GNUEncrypter(self.public_key)
+
+        self.assertNotEqual(encrypter.gnupghome, self.private_home)
+        self.assertEqual([self.fingerprint], encrypter.gpg.list_keys().fingerprints)
+
+    def test_gpg_encrypt_file(self):
+        encrypter = GNUEncrypter(self.public_key)
+
+        encrypter.encrypt_file(io.BytesIO(b"spreadsheet"), self.fingerprint, self.output)
+
+        with open(self.output, "rb") as encrypted:
+            self.assertEqual(b"spreadsheet", self.gpg.decrypt_file(encrypted).data)
+
+    def test_gpg_encrypt_file_unknown_recipient(self):
+        encrypter = GNUEncrypter(self.public_key)
+
+        with self.assertRaises(ValueError):
+            encrypter.encrypt_file(io.BytesIO(b"spreadsheet"), "0" * 40, self.output)
+
+    def test_gpg_encrypters_share_the_process_keyring(self):
+        encrypter = GNUEncrypter(self.public_key)
+
+        self.assertEqual(encrypter.gnupghome, GNUEncrypter(self.public_key).gnupghome)
+        self.assertEqual([self.fingerprint], encrypter.gpg.list_keys().fingerprints)
+
+    def test_gpg_keyring_per_process(self):
+        gnupghome = GNUEncrypter(self.public_key).gnupghome
+
+        with patch("frontstage.controllers.gnu_encryptor.os.getpid", return_value=os.getpid() + 1), patch(
+            "frontstage.controllers.gnu_encryptor.atexit.register"
+        ) as register:
+            other_gnupghome = GNUEncrypter(self.public_key).gnupghome
+        gnu_encryptor._gnupghome = None
+
+        self.assertNotEqual(gnupghome, other_gnupghome)
+        register.assert_called_once_with(shutil.rmtree, other_gnupghome, ignore_errors=True)
+        shutil.rmtree(other_gnupghome)
+
+    def test_sequoia_encrypt_file(self):
+        encrypter = SequoiaEncrypter(self.public_key)
+
+        encrypter.encrypt_file(io.BytesIO(b"spreadsheet"), self.fingerprint, self.output)
+
+        with open(self.output, "rb") as encrypted:
+            self.assertEqual(b"spreadsheet", self.gpg.decrypt_file(encrypted).data)
+        self.assertEqual(["encrypted"], os.listdir(self.output_dir))
+
+    def test_sequoia_encrypt(self):
+        encrypter = SequoiaEncrypter(self.public_key)
+
+        encrypted = encrypter.encrypt("payload", self.fingerprint[-16:])
+
+        self.assertTrue(encrypted.startswith("-----BEGIN PGP MESSAGE-----"))
+        self.assertEqual(b"payload", self.gpg.decrypt(encrypted).data)
+
+    def test_sequoia_encrypt_file_unknown_recipient(self):
+        encrypter = SequoiaEncrypter(self.public_key)
+
+        with self.assertRaises(ValueError):
+            encrypter.encrypt_file(io.BytesIO(b"spreadsheet"), "0" * 40, self.output)
+        self.assertEqual([], os.listdir(self.output_dir))
+
+    def test_get_encrypter_sequoia_backend(self):
+        config = {"ONS_GNU_PUBLIC_CRYPTOKEY": self.public_key, "SEFT_ENCRYPTION_BACKEND": "sequoia"}
+        with app.app_context(), patch.dict(app.config, config):
+            encrypter = get_encrypter()
+
+        self.assertIsInstance(encrypter, SequoiaEncrypter)
+        self.assertEqual(self.fingerprint, encrypter.cert.fingerprint.upper())
+
+    def test_get_encrypter_is_created_once(self):
+        with app.app_context(), patch.dict(app.config, {"ONS_GNU_PUBLIC_CRYPTOKEY": self.public_key}):
+            with patch("frontstage.controllers.gnu_encryptor.GNUEncrypter", wraps=GNUEncrypter) as encrypter_class:
+                encrypter = get_encrypter()
+
+                self.assertIs(encrypter, get_encrypter())
+                encrypter_class.assert_called_once_with(self.public_key)
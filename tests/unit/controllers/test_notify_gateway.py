@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 from unittest.mock import MagicMock
 
@@ -25,7 +26,8 @@ class TestNotifyController(unittest.TestCase):
         # Given a mocked notify gateway
         notify = NotifyGateway(self.app_config)
         notify.publisher = publisher
-        result = notify.request_to_notify("test@email.com")
+        with app.app_context():
+            result = notify.request_to_notify("test@email.com")
         data = b'{"notify": {"email_address": "test@email.com", ' b'"template_id": "request_password_change_id"}}'
 
         publisher.publish.assert_called()
@@ -40,7 +42,8 @@ class TestNotifyController(unittest.TestCase):
         notify = NotifyGateway(self.app_config)
         notify.publisher = publisher
         personalisation = {"first_name": "testy", "last_name": "surname"}
-        result = notify.request_to_notify("test@email.com", personalisation)
+        with app.app_context():
+            result = notify.request_to_notify("test@email.com", personalisation)
         data = (
             b'{"notify": {"email_address": "test@email.com", "template_id": "request_password_change_id",'
             b' "personalisation": {"first_name": "testy", "last_name": "surname"}}}'
@@ -49,15 +52,43 @@ class TestNotifyController(unittest.TestCase):
         publisher.publish.assert_called_with("projects/test-project-id/topics/ras-rm-notify-test", data=data)
         self.assertIsNone(result)
 
-    def test_request_to_notify_with_pubsub_timeout_error(self):
-        """Tests if the future.result() raises a TimeoutError then the function raises a RasNotifyError"""
-        future = unittest.mock.MagicMock()
-        future.result.side_effect = TimeoutError("bad")
+    def test_request_to_notify_does_not_wait_for_pubsub(self):
+        """Tests the message is only queued, so a slow or failing publish doesn't hold up the request"""
         publisher = unittest.mock.MagicMock()
-        publisher.publish.return_value = future
 
         # Given a mocked notify gateway
         notify = NotifyGateway(self.app_config)
         notify.publisher = publisher
-        with self.assertRaises(RasNotifyError):
-            notify.request_to_notify("test@email.com")
+        with tempfile.TemporaryDirectory() as spool_dir, app.app_context():
+            with unittest.mock.patch.object(app.extensions["publish_queue"], "spool_dir", spool_dir):
+                notify.request_to_notify("test@email.com")
+
+        publisher.publish.return_value.add_done_callback.assert_called_once()
+        publisher.publish.return_value.result.assert_not_called()
+
+    def test_request_to_notify_failed_delivery_without_spool(self):
+        """Tests that without a spool to keep it in, a message that isn't delivered raises a RasNotifyError"""
+        publisher = unittest.mock.MagicMock()
+        publisher.publish.return_value.result.side_effect = TimeoutError("Deadline exceeded")
+
+        # Given a mocked notify gateway
+        notify = NotifyGateway(self.app_config)
+        notify.publisher = publisher
+        with app.app_context():
+            self.assertIsNone(app.extensions["publish_queue"].spool_dir)
+            with self.assertRaises(RasNotifyError):
+                notify.request_to_notify("test@email.com")
+
+    def test_request_to_notify_unable_to_queue(self):
+        """Tests if the message can't be queued or spooled then the function raises a RasNotifyError"""
+        publisher = unittest.mock.MagicMock()
+        publisher.publish.side_effect = Exception("Flow control limit exceeded")
+
+        # Given a mocked notify gateway
+        notify = NotifyGateway(self.app_config)
+        notify.publisher = publisher
+        with app.app_context(), unittest.mock.patch.object(
+            app.extensions["publish_queue"], "_spool", side_effect=OSError("No space left on device")
+        ):
+            with self.assertRaises(RasNotifyError):
+                notify.request_to_notify("test@email.com")
@@ -1,3 +1,4 @@
+import time
 import unittest
 from collections import namedtuple
 from unittest.mock import patch
@@ -7,11 +8,14 @@ import responses
 from requests import ConnectionError, Timeout
 
 from config import TestingConfig
-from frontstage import app
+from frontstage import app, redis
+from frontstage.common import http_client
 from frontstage.controllers import party_controller
 from frontstage.controllers.party_controller import (
     display_button,
     get_case_list_for_respondent,
+    get_case_list_page_for_respondent,
+    sort_case_list,
 )
 from frontstage.exceptions.exceptions import ApiError, ServiceUnavailableException
 from tests.integration.mocked_services import (
@@ -44,6 +48,9 @@ registration_data = {
 RESPONDENT_ID = "f956e8ae-6e0f-4414-b0cf-a07c1aa3e37b"
 BUSINESS_ID = "252ffe73-8c97-4ef5-899e-3df092454d31"
 SURVEY_ID = "f82bf312-d677-484b-be57-c83148446095"
+url_confirm_pending_surveys = (
+    f"{app.config['PARTY_URL']}/party-api/v1/pending-survey/confirm-pending-surveys/batch-number"
+)
 IS_RESPONDENT_ENROLLED_URL = (
     f"{app.config['PARTY_URL']}/party-api/v1/enrolments/is_respondent_enrolled/{RESPONDENT_ID}"
     f"/business_id/{BUSINESS_ID}/survey_id/{SURVEY_ID}"
@@ -121,6 +128,44 @@ class TestPartyController(unittest.TestCase):
                 party_controller.get_respondent_enrolments(RESPONDENT_ID)
         self.assertEqual(["Party service has timed out"], exception.exception.errors)
 
+    @requests_mock.Mocker()
+    def test_get_respondent_enrolments_cached(self, request_mock):
+        request_mock.get(url_get_respondent_enrolments, json=respondent_enrolments)
+        redis.flushall()
+        with app.app_context(), patch.dict(app.config, {"ENROLMENT_CACHE_TTL": 30}):
+            party_controller.get_respondent_enrolments(RESPONDENT_ID)
+            party = party_controller.get_respondent_enrolments(RESPONDENT_ID)
+            party_controller.get_respondent_enrolments(RESPONDENT_ID, {"business_id": BUSINESS_ID})
+
+        self.assertEqual(respondent_enrolments, party)
+        # Filtered enrolments are cached separately
+        self.assertEqual(2, request_mock.call_count)
+        self.assertEqual({"status": "ENABLED", "business_id": BUSINESS_ID}, request_mock.last_request.json())
+
+    @requests_mock.Mocker()
+    def test_get_respondent_enrolments_after_invalidation(self, request_mock):
+        request_mock.get(url_get_respondent_enrolments, json=respondent_enrolments)
+        request_mock.post(url_post_add_survey, status_code=200)
+        redis.flushall()
+        with app.app_context(), patch.dict(app.config, {"ENROLMENT_CACHE_TTL": 30}):
+            party_controller.get_respondent_enrolments(RESPONDENT_ID)
+            party_controller.add_survey(RESPONDENT_ID, case["iac"])
+            party_controller.get_respondent_enrolments(RESPONDENT_ID)
+            party_controller.get_respondent_enrolments(RESPONDENT_ID)
+
+        self.assertEqual(2, len([call for call in request_mock.request_history if call.method == "GET"]))
+
+    @requests_mock.Mocker()
+    def test_confirm_pending_survey_invalidates_respondents(self, request_mock):
+        request_mock.post(url_confirm_pending_surveys, status_code=200)
+        with app.app_context(), patch("frontstage.controllers.party_controller.enrolments") as enrolments, patch(
+            "frontstage.controllers.party_controller.survey_list_snapshot"
+        ) as survey_list_snapshot:
+            party_controller.confirm_pending_survey("batch-number", [RESPONDENT_ID, respondent_party["id"]])
+
+        enrolments.invalidate.assert_called_once_with(RESPONDENT_ID, respondent_party["id"])
+        survey_list_snapshot.invalidate.assert_called_once_with(RESPONDENT_ID, respondent_party["id"])
+
     @requests_mock.Mocker()
     def test_is_respondent_enrolled(self, request_mock):
         request_mock.get(IS_RESPONDENT_ENROLLED_URL, json={"enrolled": True})
@@ -288,6 +333,16 @@ class TestPartyController(unittest.TestCase):
                         respondent_party["id"], respondent_party["emailAddress"], status="ACTIVE"
                     )
 
+    def test_sort_case_list(self):
+        cases = [
+            {"case_id": "1", "submit_by_iso_date": "2018-02-09"},
+            {"case_id": "2", "submit_by_iso_date": "2019-01-31"},
+            {"case_id": "3", "submit_by_iso_date": "2018-02-09"},
+            {"case_id": "4", "submit_by_iso_date": "2018-12-01"},
+        ]
+
+        self.assertEqual(["2", "4", "1", "3"], [case["case_id"] for case in sort_case_list(iter(cases))])
+
     def test_display_button(self):
         Combination = namedtuple("Combination", ["status", "ci_type", "expected"])
         combinations = [
@@ -307,10 +362,10 @@ class TestPartyController(unittest.TestCase):
         for combination in combinations:
             self.assertEqual(display_button(combination.status, combination.ci_type), combination.expected)
 
-    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instrument")
-    def test_get_case_list_for_respondent_todo(self, get_collection_instrument):
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_for_respondent_todo(self, get_collection_instruments):
         # Given party, collection instrument, collection exercise (lower down) and case (lower down) are mocked
-        get_collection_instrument.side_effect = [{"type": "SEFT"}, {"type": "EQ"}, {"type": "EQ"}, {"type": "EQ"}]
+        get_collection_instruments.side_effect = _get_collection_instruments_by_id
 
         expected_response = [
             {
@@ -327,6 +382,7 @@ class TestPartyController(unittest.TestCase):
                 "business_ref": "49910000014",
                 "period": "3001",
                 "submit_by": "09 Feb 2018",
+                "submit_by_iso_date": "2018-02-09",
                 "formatted_submit_by": "9th February 2018",
                 "due_in": None,
                 "collection_exercise_ref": "3001",
@@ -348,6 +404,7 @@ class TestPartyController(unittest.TestCase):
                 "business_ref": "49900000005",
                 "period": "December",
                 "submit_by": "09 Feb 2018",
+                "submit_by_iso_date": "2018-02-09",
                 "formatted_submit_by": "9th February 2018",
                 "due_in": None,
                 "collection_exercise_ref": "1912",
@@ -369,6 +426,7 @@ class TestPartyController(unittest.TestCase):
                 "business_ref": "49900000004",
                 "period": "December",
                 "submit_by": "09 Feb 2018",
+                "submit_by_iso_date": "2018-02-09",
                 "formatted_submit_by": "9th February 2018",
                 "due_in": None,
                 "collection_exercise_ref": "1912",
@@ -394,10 +452,147 @@ class TestPartyController(unittest.TestCase):
                     # Then the correct list is returned
                     self.assertEqual(list(survey_list_details_for_party), expected_response)
 
-    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instrument")
-    def test_get_case_list_for_respondents_without_enrolments(self, get_collection_instrument):
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_for_respondent_skips_business_when_cases_fail(self, get_collection_instruments):
+        get_collection_instruments.side_effect = _get_collection_instruments_by_id
+
+        def get_cases(business_id, *args):
+            if business_id == "bebee450-46da-4f8b-a7a6-d4632087f2a3":
+                raise ConnectionError("Case service unavailable")
+            return _get_case_return_value_by_business_id(business_id)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET, url_get_collection_exercises_by_surveys, json=collection_exercises_for_survey_ids, status=200
+            )
+            with app.app_context():
+                with patch("frontstage.controllers.case_controller.get_cases_for_list_type_by_party_id", get_cases):
+                    failures = []
+                    survey_list_details_for_party = get_case_list_for_respondent(
+                        self.enrolment_data(), "todo", None, None, failures
+                    )
+
+                    self.assertEqual(
+                        [survey["case_id"] for survey in survey_list_details_for_party],
+                        ["000d3115-2e95-4033-8307-0daa8b0a3123", "e11d8652-bd92-46ca-a984-a586966c7c16"],
+                    )
+                    self.assertEqual([("cases", "bebee450-46da-4f8b-a7a6-d4632087f2a3")], failures)
+
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_collection_instruments_within_deadline(self, get_collection_instruments):
+        deadlines = []
+
+        def get_collection_instruments_by_id(collection_instrument_ids):
+            deadlines.append(http_client.request_deadline.get())
+            return _get_collection_instruments_by_id(collection_instrument_ids)
+
+        get_collection_instruments.side_effect = get_collection_instruments_by_id
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET, url_get_collection_exercises_by_surveys, json=collection_exercises_for_survey_ids, status=200
+            )
+            with app.app_context(), patch.dict(app.config, {"SURVEY_LIST_TIMEOUT": 5}):
+                with patch(
+                    "frontstage.controllers.case_controller.get_cases_for_list_type_by_party_id",
+                    _get_case_return_value_by_business_id,
+                ):
+                    start = time.monotonic()
+                    list(get_case_list_for_respondent(self.enrolment_data(), "todo", None, None))
+                    get_case_list_page_for_respondent(self.enrolment_data(), "todo", None, None, page=1, page_size=2)
+
+        # The collection instruments share the survey list's deadline, rather than starting their own
+        self.assertEqual(2, len(deadlines))
+        for deadline in deadlines:
+            self.assertLessEqual(deadline, start + 5 + 1)
+            self.assertGreater(deadline, start)
+        self.assertIsNone(http_client.request_deadline.get())
+
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_page_for_respondent(self, get_collection_instruments):
+        get_collection_instruments.side_effect = _get_collection_instruments_by_id
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET, url_get_collection_exercises_by_surveys, json=collection_exercises_for_survey_ids, status=200
+            )
+            with app.app_context():
+                with patch(
+                    "frontstage.controllers.case_controller.get_cases_for_list_type_by_party_id",
+                    _get_case_return_value_by_business_id,
+                ):
+                    whole_list = sort_case_list(get_case_list_for_respondent(self.enrolment_data(), "todo", None, None))
+                    get_collection_instruments.reset_mock()
+
+                    # When the second page of two cases is asked for
+                    page, total, page_number = get_case_list_page_for_respondent(
+                        self.enrolment_data(), "todo", None, None, page=2, page_size=2
+                    )
+
+                    # Then it's the rest of the whole list, with only its collection instrument fetched
+                    self.assertEqual(3, total)
+                    self.assertEqual(2, page_number)
+                    self.assertEqual(whole_list[2:], page)
+                    get_collection_instruments.assert_called_once()
+                    self.assertEqual(1, len(get_collection_instruments.call_args.args[0]))
+
+                    # When a page past the end is asked for, then it's the last page
+                    self.assertEqual(
+                        (whole_list[2:], 3, 2),
+                        get_case_list_page_for_respondent(
+                            self.enrolment_data(), "todo", None, None, page=5, page_size=2
+                        ),
+                    )
+
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_page_for_respondent_collection_instrument_fails(self, get_collection_instruments):
+        def get_collection_instruments_by_id(collection_instrument_ids):
+            # The lookup of the first collection instrument fails
+            return {
+                collection_instrument_id: collection_instrument
+                for collection_instrument_id, collection_instrument in _get_collection_instruments_by_id(
+                    collection_instrument_ids
+                ).items()
+                if collection_instrument_id != collection_instrument_ids[0]
+            }
+
+        get_collection_instruments.side_effect = get_collection_instruments_by_id
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET, url_get_collection_exercises_by_surveys, json=collection_exercises_for_survey_ids, status=200
+            )
+            with app.app_context():
+                with patch(
+                    "frontstage.controllers.case_controller.get_cases_for_list_type_by_party_id",
+                    _get_case_return_value_by_business_id,
+                ):
+                    failures = []
+                    page, total, _ = get_case_list_page_for_respondent(
+                        self.enrolment_data(), "todo", None, None, page=1, page_size=2, failures=failures
+                    )
+
+        # Then the case left off the page isn't counted in the list either, and is reported as a failure
+        self.assertEqual(1, len(page))
+        self.assertEqual(2, total)
+        self.assertEqual(["collection_instrument"], [kind for kind, _ in failures])
+
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_for_respondent_collection_exercises_fail(self, get_collection_instruments):
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, url_get_collection_exercises_by_surveys, status=500)
+            with app.app_context():
+                with patch(
+                    "frontstage.controllers.case_controller.get_cases_for_list_type_by_party_id",
+                    _get_case_return_value_by_business_id,
+                ):
+                    with self.assertRaises(ApiError):
+                        list(get_case_list_for_respondent(self.enrolment_data(), "todo", None, None))
+
+    @patch("frontstage.controllers.party_controller.RedisCache.get_collection_instruments")
+    def test_get_case_list_for_respondents_without_enrolments(self, get_collection_instruments):
         # Given party, collection instrument and case (lower down) are mocked
-        get_collection_instrument.side_effect = [{"type": "SEFT"}, {"type": "EQ"}, {"type": "EQ"}, {"type": "EQ"}]
+        get_collection_instruments.return_value = {}
 
         expected_response = []
 
@@ -537,3 +732,11 @@ def _get_case_return_value_by_business_id(*args):
         ]
     else:
         return []
+
+
+def _get_collection_instruments_by_id(collection_instrument_ids):
+    """returns the collection instruments for the ids, only the 37cffd1b instrument is a SEFT"""
+    return {
+        collection_instrument_id: {"type": "SEFT" if collection_instrument_id.startswith("37cffd1b") else "EQ"}
+        for collection_instrument_id in collection_instrument_ids
+    }
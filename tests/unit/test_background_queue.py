@@ -0,0 +1,125 @@
+import threading
+import unittest
+
+from frontstage import app
+from frontstage.common.background_queue import BackgroundQueue
+
+
+class TestBackgroundQueue(unittest.TestCase):
+    def create_queue(self, workers=2, maxsize=100, max_retries=2, put_timeout=1, backoff_factor=0):
+        return BackgroundQueue(
+            app,
+            "test",
+            workers=workers,
+            maxsize=maxsize,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            put_timeout=put_timeout,
+            flush_timeout=5,
+        )
+
+    def test_tasks_for_a_key_run_in_order(self):
+        background_queue = self.create_queue()
+        ran = []
+
+        for number in range(50):
+            background_queue.submit("case-1", lambda number=number: ran.append(("case-1", number)))
+            background_queue.submit("case-2", lambda number=number: ran.append(("case-2", number)))
+        background_queue.close()
+
+        self.assertEqual(list(range(50)), [number for key, number in ran if key == "case-1"])
+        self.assertEqual(list(range(50)), [number for key, number in ran if key == "case-2"])
+        self.assertEqual(100, background_queue.stats()["completed"])
+
+    def test_failed_task_is_retried(self):
+        background_queue = self.create_queue()
+        attempts = []
+
+        def task():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError()
+
+        background_queue.submit("case-1", task)
+        background_queue.close()
+
+        self.assertEqual(3, len(attempts))
+        stats = background_queue.stats()
+        self.assertEqual(2, stats["retried"])
+        self.assertEqual(1, stats["completed"])
+
+    def test_retry_does_not_hold_up_other_keys(self):
+        background_queue = self.create_queue(workers=1, backoff_factor=0.2)
+        ran = []
+        failed = threading.Event()
+        retried = threading.Event()
+
+        def task():
+            ran.append("case-1")
+            if not failed.is_set():
+                failed.set()
+                raise ConnectionError()
+            retried.set()
+
+        # The first task for case-1 fails, so the next waits for it to be retried, but case-2's task doesn't
+        background_queue.submit("case-1", task)
+        background_queue.submit("case-1", lambda: ran.append("case-1 next"))
+        background_queue.submit("case-2", lambda: ran.append("case-2"))
+        retried.wait(5)
+        background_queue.close()
+
+        self.assertEqual(["case-1", "case-2", "case-1", "case-1 next"], ran)
+        stats = background_queue.stats()
+        self.assertEqual(1, stats["retried"])
+        self.assertEqual(3, stats["completed"])
+        self.assertEqual(0, stats["waiting"])
+
+    def test_task_not_retried_when_not_retryable(self):
+        background_queue = self.create_queue()
+        attempts = []
+
+        def task():
+            attempts.append(1)
+            raise ValueError()
+
+        background_queue.submit("case-1", task, retryable=lambda exception: not isinstance(exception, ValueError))
+        background_queue.close()
+
+        self.assertEqual(1, len(attempts))
+        self.assertEqual(1, background_queue.stats()["failed"])
+
+    def test_task_dropped_when_queue_full(self):
+        background_queue = self.create_queue(workers=1, maxsize=1, put_timeout=0.01)
+        blocked = threading.Event()
+        release = threading.Event()
+
+        def blocking_task():
+            blocked.set()
+            release.wait(5)
+
+        background_queue.submit("case-1", blocking_task)
+        blocked.wait(5)
+        background_queue.submit("case-1", lambda: None)
+        background_queue.submit("case-1", lambda: None)
+        release.set()
+        background_queue.close()
+
+        stats = background_queue.stats()
+        self.assertEqual(1, stats["dropped"])
+        self.assertEqual(2, stats["completed"])
+
+    def test_no_workers_runs_in_caller(self):
+        background_queue = self.create_queue(workers=0)
+
+        with self.assertRaises(ValueError):
+            background_queue.submit("case-1", lambda: int("not a number"))
+        self.assertEqual(0, background_queue.stats()["workers"])
+
+    def test_tasks_run_in_app_context(self):
+        background_queue = self.create_queue()
+        config = []
+
+        background_queue.submit("case-1", lambda: config.append(app.config["CASE_URL"]))
+        background_queue.close()
+
+        self.assertEqual([app.config["CASE_URL"]], config)
@@ -0,0 +1,104 @@
+import time
+import unittest
+from concurrent.futures import Future
+from threading import Event, Thread
+from unittest.mock import patch
+
+from frontstage import app
+from frontstage.common import http_client
+from frontstage.common.banner_cache import BannerCache
+
+
+class TestBannerCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = BannerCache(app)
+        self.cache.ttl = 60
+        self.cache.stale_ttl = 300
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_banner_is_cached(self, fetch_banner):
+        fetch_banner.return_value = "Maintenance tonight"
+
+        self.assertEqual(self.cache.get(), "Maintenance tonight")
+        self.assertEqual(self.cache.get(), "Maintenance tonight")
+        fetch_banner.assert_called_once()
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_stale_banner_served_while_refreshing(self, fetch_banner):
+        fetch_banner.return_value = "old"
+        self.cache.get()
+        self.cache.fresh_until = time.monotonic() - 1
+        fetch_banner.return_value = "new"
+
+        refreshed = Event()
+        background_refresh = self.cache._background_refresh
+
+        def refresh_then_signal():
+            background_refresh()
+            refreshed.set()
+
+        with patch.object(self.cache, "_background_refresh", refresh_then_signal):
+            self.assertEqual(self.cache.get(), "old")
+            self.assertTrue(refreshed.wait(5))
+        self.assertEqual(self.cache.get(), "new")
+        self.assertEqual(fetch_banner.call_count, 2)
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_concurrent_cold_renders_fetch_once(self, fetch_banner):
+        fetching, release = Event(), Event()
+
+        def slow_fetch():
+            fetching.set()
+            release.wait(5)
+            return "banner"
+
+        fetch_banner.side_effect = slow_fetch
+        results = []
+        leader = Thread(target=lambda: results.append(self.cache.get()))
+        leader.start()
+        self.assertTrue(fetching.wait(5))
+
+        # These arrive while the first render is still waiting on the banner service
+        followers = [Thread(target=lambda: results.append(self.cache.get())) for _ in range(5)]
+        for follower in followers:
+            follower.start()
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        self.assertEqual(["banner"] * 6, results)
+        fetch_banner.assert_called_once()
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_failed_cold_fetch_is_raised_to_waiting_renders(self, fetch_banner):
+        fetch = self.cache.fetching = Future()
+        fetch.set_exception(ConnectionError("Banner service unavailable"))
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get()
+        fetch_banner.assert_not_called()
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_failed_refresh_keeps_banner(self, fetch_banner):
+        fetch_banner.return_value = "banner"
+        self.cache.get()
+        fetch_banner.return_value = None
+
+        self.assertEqual(self.cache.refresh(), "banner")
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_failure_without_banner_is_empty(self, fetch_banner):
+        fetch_banner.return_value = None
+
+        self.assertEqual(self.cache.get(), "")
+        self.assertEqual(self.cache.get(), "")
+        fetch_banner.assert_called_once()
+
+    @patch("frontstage.controllers.banner_controller.fetch_banner")
+    def test_fetch_has_a_deadline(self, fetch_banner):
+        fetch_banner.side_effect = http_client.request_deadline.get
+
+        deadline = self.cache.refresh()
+
+        self.assertLessEqual(deadline, time.monotonic() + self.cache.timeout)
+        self.assertIsNone(http_client.request_deadline.get())
@@ -0,0 +1,59 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from frontstage import app
+from frontstage.common.case_category_cache import CaseCategoryCache
+
+
+class TestCaseCategoryCache(unittest.TestCase):
+    def setUp(self):
+        self.fetch = MagicMock(return_value=["EQ_LAUNCH", "SUCCESSFUL_RESPONSE_UPLOAD"])
+        self.cache = CaseCategoryCache(app, self.fetch)
+        self.cache.ttl = 60
+
+    def wait_for_refresh(self):
+        for _ in range(50):
+            if not self.cache.refreshing:
+                break
+            time.sleep(0.01)
+
+    def test_categories_are_cached(self):
+        self.assertEqual(frozenset({"EQ_LAUNCH", "SUCCESSFUL_RESPONSE_UPLOAD"}), self.cache.get())
+        self.assertIn("EQ_LAUNCH", self.cache.get())
+        self.fetch.assert_called_once()
+
+    def test_expired_categories_served_while_refreshing(self):
+        self.cache.get()
+        self.cache.fresh_until = time.monotonic() - 1
+        self.fetch.return_value = ["EQ_LAUNCH", "NEW_CATEGORY"]
+
+        self.assertNotIn("NEW_CATEGORY", self.cache.get())
+        self.wait_for_refresh()
+        self.assertIn("NEW_CATEGORY", self.cache.get())
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_failed_refresh_keeps_categories(self):
+        self.cache.get()
+        self.cache.fresh_until = time.monotonic() - 1
+        self.fetch.side_effect = Exception("Case service unavailable")
+
+        self.cache.get()
+        self.wait_for_refresh()
+
+        self.assertIn("EQ_LAUNCH", self.cache.get())
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_failure_without_categories_is_raised(self):
+        self.fetch.side_effect = Exception("Case service unavailable")
+
+        with self.assertRaises(Exception):
+            self.cache.get()
+
+    def test_no_ttl_always_fetches(self):
+        self.cache.ttl = 0
+
+        self.cache.get()
+        self.cache.get()
+
+        self.assertEqual(2, self.fetch.call_count)
@@ -0,0 +1,54 @@
+import base64
+import json
+import unittest
+from unittest.mock import patch
+
+from frontstage import app
+from frontstage.common.encrypter import Encrypter, get_encrypter
+
+json_secret_keys = open("./tests/test_data/jwt-test-keys/test_key.json").read()
+payload = {"case_id": "8cdc01f9-656a-4715-a148-ffed0dbe1b04", "tx_id": "2f0e5e4a-8f2a-4f11-a0a3-0b8a05c1ba34"}
+
+
+def _rotated_keys():
+    keys = json.loads(json_secret_keys)
+    keys["keys"] = {f"rotated-{kid}": key for kid, key in keys["keys"].items()}
+    return json.dumps(keys)
+
+
+def _kid(token):
+    header = token.split(".")[0]
+    return json.loads(base64.urlsafe_b64decode(header + "=" * (-len(header) % 4)))["kid"]
+
+
+class TestEncrypter(unittest.TestCase):
+    def test_reload_uses_new_keys(self):
+        encrypter = Encrypter(json_secret_keys)
+        self.assertEqual("33385b3cf03bd8975a7d4b8a937d33d8a7e03158", _kid(encrypter.encrypt(payload, "eq_v3")))
+
+        encrypter.reload(_rotated_keys())
+
+        self.assertEqual("rotated-33385b3cf03bd8975a7d4b8a937d33d8a7e03158", _kid(encrypter.encrypt(payload, "eq_v3")))
+
+    def test_failed_reload_keeps_keys(self):
+        encrypter = Encrypter(json_secret_keys)
+
+        with self.assertRaises(Exception):
+            encrypter.reload(json.dumps({"keys": {}}))
+
+        self.assertEqual(json_secret_keys, encrypter.json_secret_keys)
+        encrypter.encrypt(payload, "eq_v3")
+
+    def test_get_encrypter_is_shared(self):
+        with app.app_context():
+            self.assertIs(get_encrypter(), get_encrypter())
+
+    def test_get_encrypter_reloads_changed_keys(self):
+        with app.app_context():
+            encrypter = get_encrypter()
+            with patch.dict(app.config, {"JSON_SECRET_KEYS": _rotated_keys()}):
+                self.assertIs(encrypter, get_encrypter())
+                self.assertEqual(
+                    "rotated-33385b3cf03bd8975a7d4b8a937d33d8a7e03158", _kid(encrypter.encrypt(payload, "eq_v3"))
+                )
+            get_encrypter()
@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+
+from frontstage import app
+from frontstage.common import http_client
+from frontstage.common.fan_out import DeadlineExceeded, FanOut
+
+
+class TestFanOut(unittest.TestCase):
+    def test_gather_returns_results_and_failures(self):
+        def fail():
+            raise ValueError("failed")
+
+        with app.app_context():
+            fan_out = FanOut()
+            fan_out.submit("a", lambda x: x * 2, 2)
+            fan_out.submit("b", fail)
+            fan_out.submit("c", lambda: app.config["TESTING"])
+            results, failures = fan_out.gather()
+
+        self.assertEqual(results, {"a": 4, "c": True})
+        self.assertIsInstance(failures["b"], ValueError)
+
+    def test_concurrency_is_limited_per_fan_out(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def call():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+
+        with app.app_context():
+            fan_out = FanOut(max_concurrency=2)
+            for key in range(6):
+                fan_out.submit(key, call)
+            results, failures = fan_out.gather()
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(failures, {})
+        self.assertLessEqual(max(peak), 2)
+
+    def test_calls_submitted_while_iterating_are_waited_for(self):
+        with app.app_context():
+            fan_out = FanOut()
+            fan_out.submit("first", lambda: "first")
+            completed = []
+            for key, result, _ in fan_out.as_completed():
+                completed.append(key)
+                if key == "first":
+                    fan_out.submit("second", lambda: "second")
+
+        self.assertEqual(completed, ["first", "second"])
+
+    def test_deadline_exceeded(self):
+        with app.app_context():
+            fan_out = FanOut(timeout=0.05)
+            fan_out.submit("fast", lambda: "fast")
+            fan_out.submit("slow", time.sleep, 0.5)
+            results, failures = fan_out.gather()
+
+        self.assertEqual(results, {"fast": "fast"})
+        self.assertIsInstance(failures["slow"], DeadlineExceeded)
+
+    def test_deadline_is_propagated_to_calls(self):
+        with app.app_context():
+            fan_out = FanOut(timeout=5)
+            fan_out.submit("deadline", http_client.request_deadline.get)
+            results, _ = fan_out.gather()
+
+        self.assertEqual(results["deadline"], fan_out.deadline)
+        self.assertIsNone(http_client.request_deadline.get())
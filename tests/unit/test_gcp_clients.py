@@ -0,0 +1,61 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from frontstage import app
+from frontstage.common import gcp_clients
+from frontstage.common.gcp_clients import GcpClients
+
+EMULATORS = {"STORAGE_EMULATOR_HOST": "http://localhost:9023", "PUBSUB_EMULATOR_HOST": "localhost:8085"}
+
+
+class TestGcpClients(unittest.TestCase):
+    def setUp(self):
+        self.clients = GcpClients(app.config)
+
+    def tearDown(self):
+        self.clients.close()
+
+    @patch.dict(os.environ, EMULATORS)
+    def test_storage_client_is_created_once(self):
+        client = self.clients.storage_client()
+
+        self.assertIs(client, self.clients.storage_client())
+        self.assertEqual("http://localhost:9023", client._connection.API_BASE_URL)
+        self.assertEqual(
+            app.config["GCS_HTTP_POOL_MAXSIZE"],
+            client._http.get_adapter("https://").poolmanager.connection_pool_kw["maxsize"],
+        )
+
+    @patch.dict(os.environ, EMULATORS)
+    def test_publisher_is_created_once(self):
+        publisher = self.clients.publisher()
+
+        self.assertIs(publisher, self.clients.publisher())
+        self.assertEqual("localhost:8085", publisher.transport._host)
+
+    @patch.dict(os.environ, EMULATORS)
+    def test_app_clients_are_shared(self):
+        with app.app_context():
+            self.assertIs(gcp_clients.publisher(), gcp_clients.publisher())
+            self.assertIs(gcp_clients.storage_client(), gcp_clients.storage_client())
+            app.extensions["gcp_clients"].close()
+
+    def test_channel_keepalive_is_configured(self):
+        config = dict(app.config, PUBSUB_GRPC_KEEPALIVE_TIME_MS=1000, PUBSUB_GRPC_KEEPALIVE_TIMEOUT_MS=500)
+        clients = GcpClients(config)
+
+        with patch("frontstage.common.gcp_clients.PublisherGrpcTransport.create_channel") as create_channel:
+            clients._create_channel(
+                "pubsub.googleapis.com", options=[("grpc.max_send_message_length", -1)], credentials=None
+            )
+
+        create_channel.assert_called_once_with(
+            "pubsub.googleapis.com",
+            options=[
+                ("grpc.max_send_message_length", -1),
+                ("grpc.keepalive_time_ms", 1000),
+                ("grpc.keepalive_timeout_ms", 500),
+            ],
+            credentials=None,
+        )
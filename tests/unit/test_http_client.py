@@ -0,0 +1,110 @@
+import time
+import unittest
+from threading import Thread
+from unittest.mock import patch
+
+import responses
+from requests.exceptions import Timeout
+
+from config import TestingConfig
+from frontstage import app
+from frontstage.common import http_client
+from frontstage.common.http_client import HttpClient
+
+url_party = f"{TestingConfig.PARTY_URL}/party-api/v1/respondents/party_id/123"
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.client = HttpClient(app.config)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_service_session_is_reused(self):
+        self.assertIs(self.client.service("party"), self.client.service("party"))
+        self.assertIsNot(self.client.service("party"), self.client.service("case"))
+
+    def test_default_settings(self):
+        session = self.client.service("party")
+
+        self.assertEqual(session.timeout, (app.config["HTTP_CONNECT_TIMEOUT"], app.config["HTTP_READ_TIMEOUT"]))
+        self.assertEqual(session.adapter.max_retries.total, app.config["HTTP_MAX_RETRIES"])
+        self.assertEqual(session.adapter._pool_maxsize, app.config["HTTP_POOL_MAXSIZE"])
+
+    def test_service_overrides(self):
+        session = self.client.service("banner")
+
+        self.assertEqual(session.timeout[1], app.config["HTTP_SERVICE_OVERRIDES"]["banner"]["read_timeout"])
+        self.assertEqual(session.adapter.max_retries.total, 0)
+
+    @patch("requests.Session.request")
+    def test_default_timeout_applied(self, mock_request):
+        session = self.client.service("party")
+        session.get(url_party)
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], session.timeout)
+
+        session.get(url_party, timeout=1)
+        self.assertEqual(mock_request.call_args.kwargs["timeout"], 1)
+
+    def test_stats_without_requests(self):
+        self.client.service("party")
+
+        self.assertEqual(
+            self.client.stats(),
+            {
+                "party": {
+                    "host_pools": 0,
+                    "requests": 0,
+                    "pool_hits": 0,
+                    "pool_misses": 0,
+                    "connection_reuse_ratio": 0.0,
+                }
+            },
+        )
+
+    def test_stats_waits_for_sessions_being_added(self):
+        self.client.service("party")
+        stats = {}
+
+        # While another thread holds the lock to add a session, stats can't read the sessions
+        with self.client.lock:
+            thread = Thread(target=lambda: stats.update(self.client.stats()))
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            self.client.sessions["case"] = self.client._create_session("case")
+        thread.join()
+
+        self.assertEqual({"party", "case"}, set(stats))
+
+    def test_module_service_uses_app_client(self):
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, url_party, json={"id": "123"}, status=200)
+            with app.app_context():
+                response = http_client.service("party").get(url_party)
+                self.assertIs(http_client.service("party"), app.extensions["http_client"].service("party"))
+
+        self.assertEqual(response.json(), {"id": "123"})
+
+    @patch("requests.Session.request")
+    def test_timeout_capped_by_deadline(self, mock_request):
+        session = self.client.service("party")
+        token = http_client.request_deadline.set(time.monotonic() + 1)
+        try:
+            session.get(url_party)
+        finally:
+            http_client.request_deadline.reset(token)
+
+        connect_timeout, read_timeout = mock_request.call_args.kwargs["timeout"]
+        self.assertLessEqual(read_timeout, 1)
+        self.assertLessEqual(connect_timeout, 1)
+
+    def test_deadline_already_passed(self):
+        session = self.client.service("party")
+        token = http_client.request_deadline.set(time.monotonic() - 1)
+        try:
+            with self.assertRaises(Timeout):
+                session.get(url_party)
+        finally:
+            http_client.request_deadline.reset(token)
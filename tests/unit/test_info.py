@@ -13,3 +13,11 @@ class TestInfo(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('"name": "ras-frontstage"'.encode(), response.data)
         self.assertIn('"test": "test"'.encode(), response.data)
+
+    def test_metrics(self):
+        response = self.app.get("/info/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("http", response.json)
+        self.assertIn("collection-instrument", response.json["local_cache"])
+        self.assertIn("in_use", response.json["redis"])
@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import patch
+
+from frontstage.common import local_cache
+from frontstage.common.local_cache import MISSING, LocalCache
+
+
+class TestLocalCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LocalCache("test", max_entries=2, ttl=10)
+
+    def test_get_and_set(self):
+        self.assertIs(self.cache.get("a"), MISSING)
+        self.cache.set("a", {"value": 1})
+
+        self.assertEqual(self.cache.get("a"), {"value": 1})
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_none_is_cached(self):
+        self.cache.set("a", None)
+
+        self.assertIsNone(self.cache.get("a"))
+
+    @patch("frontstage.common.local_cache.time.monotonic")
+    def test_entries_expire(self, monotonic):
+        monotonic.return_value = 100
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=30)
+        monotonic.return_value = 111
+
+        self.assertIs(self.cache.get("a"), MISSING)
+        self.assertEqual(self.cache.get("b"), 2)
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIs(self.cache.get("b"), MISSING)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+    def test_module_stats_and_clear_all(self):
+        self.cache.set("a", 1)
+
+        self.assertEqual(local_cache.stats()["test"]["entries"], 1)
+        local_cache.clear_all()
+        self.assertIs(self.cache.get("a"), MISSING)
@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from threading import Condition, Thread, current_thread
+from unittest.mock import patch
+
+from frontstage import app
+from frontstage.common.publish_queue import PublishQueue
+
+
+class FakePublisher:
+    """Records what's published and hands back futures the test resolves"""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.published = []
+        self.threads = []
+        self.condition = Condition()
+
+    def publish(self, topic_path, data, **attributes):
+        if self.limit is not None and len(self.published) >= self.limit:
+            raise Exception("Flow control limit exceeded")
+        future = Future()
+        with self.condition:
+            self.published.append((topic_path, data, attributes, future))
+            self.threads.append(current_thread().name)
+            self.condition.notify_all()
+        return future
+
+    def wait_for(self, count):
+        """Waits for count messages to have been published, e.g. by the replay thread"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: len(self.published) >= count, timeout=5):
+                raise AssertionError(f"Only {len(self.published)} of {count} messages were published")
+
+
+class TestPublishQueue(unittest.TestCase):
+    def setUp(self):
+        self.spool_dir = os.path.join(tempfile.mkdtemp(), "spool")
+        self.queue = PublishQueue(
+            dict(PUBSUB_SPOOL_DIR=self.spool_dir, PUBSUB_SPOOL_REPLAY_INTERVAL=60, PUBSUB_PUBLISH_TIMEOUT=5)
+        )
+        self.publisher = FakePublisher()
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.spool_dir))
+
+    def test_publish_does_not_wait_for_delivery(self):
+        self.queue.publish(self.publisher, "topic", b"message", tx_id="1")
+
+        self.assertEqual([("topic", b"message", {"tx_id": "1"})], [p[:3] for p in self.publisher.published])
+        self.assertEqual(1, self.queue.stats()["pending"])
+
+        self.publisher.published[0][3].set_result("msg-1")
+
+        stats = self.queue.stats()
+        self.assertEqual(0, stats["pending"])
+        self.assertEqual(1, stats["published"])
+        self.assertEqual(0, stats["spool_files"])
+
+    def test_failed_delivery_is_spooled_and_replayed(self):
+        self.queue.publish(self.publisher, "topic", b"message", tx_id="1")
+        self.publisher.published[0][3].set_exception(TimeoutError("Deadline exceeded"))
+
+        stats = self.queue.stats()
+        self.assertEqual(1, stats["failed"])
+        self.assertEqual(1, stats["spool_files"])
+
+        # The next successful delivery replays the spool, on the queue's replay thread
+        self.queue.publish(self.publisher, "topic", b"another message")
+        self.publisher.published[1][3].set_result("msg-2")
+        self.publisher.wait_for(3)
+
+        self.assertEqual("pubsub-spool-replay", self.publisher.threads[2])
+        self.assertEqual(("topic", b"message", {"tx_id": "1"}), self.publisher.published[2][:3])
+        self.assertEqual(0, self.queue.stats()["spool_files"])
+        self.publisher.published[2][3].set_result("msg-3")
+
+        stats = self.queue.stats()
+        self.assertEqual(1, stats["replayed"])
+        self.assertEqual([], os.listdir(self.spool_dir))
+
+    def test_failed_replay_stays_in_spool(self):
+        self.queue.publish(FakePublisher(limit=0), "topic", b"message")
+        self.assertEqual(1, self.queue.stats()["spooled"])
+
+        self.queue.replay_spool(self.publisher)
+        self.publisher.published[0][3].set_exception(TimeoutError("Deadline exceeded"))
+
+        stats = self.queue.stats()
+        self.assertEqual(1, stats["spooled"])
+        self.assertEqual(1, stats["spool_files"])
+
+    def test_buffer_full_is_spooled(self):
+        publisher = FakePublisher(limit=1)
+
+        self.queue.publish(publisher, "topic", b"first")
+        self.queue.publish(publisher, "topic", b"second")
+
+        self.assertEqual(1, len(publisher.published))
+        self.assertEqual(1, self.queue.stats()["spool_files"])
+
+    def test_spool_is_private(self):
+        self.queue.publish(FakePublisher(limit=0), "topic", b"message")
+
+        self.assertEqual(0o700, os.stat(self.spool_dir).st_mode & 0o777)
+        (file_name,) = os.listdir(self.spool_dir)
+        self.assertEqual(0o600, os.stat(os.path.join(self.spool_dir, file_name)).st_mode & 0o777)
+
+    def test_no_spool_dir_waits_for_delivery(self):
+        queue = PublishQueue(dict(PUBSUB_SPOOL_DIR=None, PUBSUB_SPOOL_REPLAY_INTERVAL=60, PUBSUB_PUBLISH_TIMEOUT=5))
+        publisher = FakePublisher()
+        published = []
+        thread = Thread(target=lambda: published.append(queue.publish(publisher, "topic", b"message")))
+
+        thread.start()
+        publisher.wait_for(1)
+        thread.join(0.1)
+        self.assertTrue(thread.is_alive())
+        publisher.published[0][3].set_result("msg-1")
+        thread.join(5)
+
+        self.assertEqual([None], published)
+        self.assertEqual(1, queue.stats()["published"])
+
+    def test_no_spool_dir_failed_delivery_is_raised(self):
+        queue = PublishQueue(dict(PUBSUB_SPOOL_DIR=None, PUBSUB_SPOOL_REPLAY_INTERVAL=60, PUBSUB_PUBLISH_TIMEOUT=5))
+        publisher = FakePublisher()
+        future = Future()
+        future.set_exception(TimeoutError("Deadline exceeded"))
+
+        # Without a spool there's nowhere to keep the message, so the caller hears of it and can try again
+        with patch.object(publisher, "publish", return_value=future), self.assertRaises(TimeoutError):
+            queue.publish(publisher, "topic", b"message")
+        with self.assertRaises(Exception):
+            queue.publish(FakePublisher(limit=0), "topic", b"message")
+
+        stats = queue.stats()
+        self.assertEqual(1, stats["failed"])
+        self.assertEqual(0, stats["pending"])
+        self.assertEqual(0, stats["spooled"])
+
+    def test_claimed_by_stopped_process_is_recovered(self):
+        self.queue.publish(FakePublisher(limit=0), "topic", b"stopped")
+        self.queue.publish(FakePublisher(limit=0), "topic", b"running")
+        stopped, running = sorted(os.listdir(self.spool_dir))
+        os.rename(os.path.join(self.spool_dir, stopped), os.path.join(self.spool_dir, f"{stopped}.100"))
+        os.rename(os.path.join(self.spool_dir, running), os.path.join(self.spool_dir, f"{running}.200"))
+
+        with patch("frontstage.common.publish_queue._is_running", side_effect=lambda pid: pid == 200):
+            PublishQueue(
+                dict(PUBSUB_SPOOL_DIR=self.spool_dir, PUBSUB_SPOOL_REPLAY_INTERVAL=60, PUBSUB_PUBLISH_TIMEOUT=5)
+            )
+
+        self.assertEqual([stopped, f"{running}.200"], sorted(os.listdir(self.spool_dir)))
+
+    def test_metrics(self):
+        response = app.test_client().get("/info/metrics")
+
+        self.assertIn("published", response.json["pubsub"])
@@ -4,7 +4,9 @@ from unittest.mock import patch
 
 import responses
 
-from frontstage import app
+from frontstage import app, redis
+from frontstage.common import local_cache
+from frontstage.common.local_cache import MISSING
 from frontstage.common.redis_cache import RedisCache
 
 test_uuid = "5d640989-e20d-4367-b341-f067e5343097"
@@ -14,6 +16,7 @@ test_form_type = "0001"
 class TestRedisCache(unittest.TestCase):
     def setUp(self):
         self.app = app.test_client()
+        local_cache.clear_all()
 
     @patch("redis.StrictRedis.get")
     @patch("frontstage.common.redis_cache.RedisCache.save")
@@ -71,3 +74,91 @@ class TestRedisCache(unittest.TestCase):
                 cache = RedisCache()
                 cache.get_registry_instrument(test_uuid, test_form_type)
                 redis_save.assert_called_once()
+
+    def test_collection_instruments_bulk(self):
+        cached_id = "cached-ci"
+        missing_id = "missing-ci"
+        redis.flushdb()
+        redis.set(f"frontstage:collection-instrument:{cached_id}", json.dumps({"id": cached_id, "type": "SEFT"}))
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET,
+                f"http://localhost:8002/collection-instrument-api/1.0.2/{missing_id}",
+                json={"id": missing_id, "type": "EQ"},
+                status=200,
+            )
+            with app.app_context():
+                with patch.object(redis, "mget", wraps=redis.mget) as mget:
+                    result = RedisCache().get_collection_instruments([cached_id, missing_id, cached_id])
+                    mget.assert_called_once()
+
+        self.assertEqual(
+            result, {cached_id: {"id": cached_id, "type": "SEFT"}, missing_id: {"id": missing_id, "type": "EQ"}}
+        )
+        saved = json.loads(redis.get(f"frontstage:collection-instrument:{missing_id}"))
+        self.assertEqual(saved["type"], "EQ")
+        self.assertGreater(redis.ttl(f"frontstage:collection-instrument:{missing_id}"), 0)
+
+    def test_collection_instruments_bulk_leaves_out_failures(self):
+        redis.flushdb()
+        with responses.RequestsMock() as rsps:
+            rsps.add(rsps.GET, f"http://localhost:8002/collection-instrument-api/1.0.2/{test_uuid}", status=500)
+            with app.app_context():
+                result = RedisCache().get_collection_instruments([test_uuid])
+
+        self.assertEqual(result, {})
+        self.assertIsNone(redis.get(f"frontstage:collection-instrument:{test_uuid}"))
+
+    @patch("redis.StrictRedis.get")
+    def test_collection_instrument_served_from_local_cache(self, redis_get):
+        redis_get.return_value = b'{"type": "SEFT"}'
+        with app.app_context():
+            first = RedisCache().get_collection_instrument(test_uuid)
+            second = RedisCache().get_collection_instrument(test_uuid)
+
+        self.assertEqual(first, {"type": "SEFT"})
+        self.assertIs(first, second)
+        redis_get.assert_called_once()
+
+    def test_collection_instruments_bulk_only_reads_redis_for_local_misses(self):
+        redis.flushdb()
+        RedisCache.collection_instruments.set("local-ci", {"id": "local-ci", "type": "EQ"})
+        redis.set("frontstage:collection-instrument:redis-ci", json.dumps({"id": "redis-ci", "type": "SEFT"}))
+        with app.app_context():
+            with patch.object(redis, "mget", wraps=redis.mget) as mget:
+                result = RedisCache().get_collection_instruments(["local-ci", "redis-ci"])
+                mget.assert_called_once_with(["frontstage:collection-instrument:redis-ci"])
+
+        self.assertEqual(set(result), {"local-ci", "redis-ci"})
+        self.assertEqual(RedisCache.collection_instruments.get("redis-ci"), {"id": "redis-ci", "type": "SEFT"})
+
+    def test_registry_instrument_not_found_is_cached_briefly(self):
+        redis.flushdb()
+        redis_key = f"frontstage:registry-instrument:{test_uuid}:{test_form_type}"
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                rsps.GET,
+                f"{app.config["COLLECTION_INSTRUMENT_URL"]}"
+                f"/collection-instrument-api/1.0.2/registry-instrument/exercise-id/"
+                f"{test_uuid}/formtype/{test_form_type}",
+                status=404,
+            )
+            with app.app_context():
+                self.assertIsNone(RedisCache().get_registry_instrument(test_uuid, test_form_type))
+                self.assertIsNone(RedisCache().get_registry_instrument(test_uuid, test_form_type))
+                rsps.assert_call_count(rsps.calls[0].request.url, 1)
+
+        self.assertEqual(redis.get(redis_key), b"null")
+        self.assertLessEqual(redis.ttl(redis_key), RedisCache.COLLECTION_REGISTRY_NOT_FOUND_EXPIRY_IN_SECONDS)
+
+    def test_invalidate_registry_instrument(self):
+        redis.flushdb()
+        redis_key = f"frontstage:registry-instrument:{test_uuid}:{test_form_type}"
+        redis.set(redis_key, json.dumps({"form_type": test_form_type}))
+        with app.app_context():
+            cache = RedisCache()
+            cache.get_registry_instrument(test_uuid, test_form_type)
+            cache.invalidate_registry_instrument(test_uuid, test_form_type)
+
+        self.assertIsNone(redis.get(redis_key))
+        self.assertIs(RedisCache.registry_instruments.get((test_uuid, test_form_type)), MISSING)
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+
+import redis as redis_py
+from redis.exceptions import ConnectionError
+
+from frontstage import app, redis
+from frontstage.common import local_cache, redis_client, survey_list_snapshot
+from frontstage.common.redis_cache import RedisCache
+from frontstage.common.session import Session
+from frontstage.exceptions.exceptions import SessionStoreUnavailable
+
+
+class TestRedisClient(unittest.TestCase):
+    def tearDown(self):
+        redis_client.sessions.reset()
+        redis_client.cache.reset()
+
+    def test_create_redis(self):
+        client = redis_client.create_redis(app.config)
+        pool = client.connection_pool
+
+        self.assertIsInstance(pool, redis_py.BlockingConnectionPool)
+        self.assertEqual(pool.max_connections, app.config["REDIS_MAX_CONNECTIONS"])
+        self.assertEqual(pool.timeout, app.config["REDIS_POOL_TIMEOUT"])
+        self.assertEqual(pool.connection_kwargs["socket_timeout"], app.config["REDIS_SOCKET_TIMEOUT"])
+        self.assertEqual(pool.connection_kwargs["health_check_interval"], app.config["REDIS_HEALTH_CHECK_INTERVAL"])
+        self.assertEqual(pool.connection_kwargs["retry"]._retries, app.config["REDIS_MAX_RETRIES"])
+
+    def test_stats(self):
+        client = redis_client.create_redis(app.config)
+
+        self.assertEqual(
+            redis_client.stats(client),
+            {
+                "max_connections": app.config["REDIS_MAX_CONNECTIONS"],
+                "connections": 0,
+                "in_use": 0,
+                "available": 0,
+                "breakers": {
+                    "sessions": redis_client.sessions.stats(),
+                    "cache": redis_client.cache.stats(),
+                },
+            },
+        )
+
+    def test_consecutive_failures_enter_degraded_mode(self):
+        with app.app_context(), patch.dict(app.config, {"REDIS_DEGRADED_THRESHOLD": 3}):
+            redis_client.cache.record_failure()
+            redis_client.cache.record_failure()
+            self.assertFalse(redis_client.cache.degraded())
+
+            redis_client.cache.record_failure()
+
+        self.assertTrue(redis_client.cache.degraded())
+        self.assertFalse(redis_client.sessions.degraded())
+
+    def test_success_resets_failures(self):
+        with app.app_context(), patch.dict(app.config, {"REDIS_DEGRADED_THRESHOLD": 2}):
+            redis_client.cache.record_failure()
+            redis_client.cache.record_success()
+            redis_client.cache.record_failure()
+
+        self.assertFalse(redis_client.cache.degraded())
+
+    def test_session_read_fails_fast_when_degraded(self):
+        with app.app_context(), patch.dict(app.config, {"REDIS_DEGRADED_THRESHOLD": 2}):
+            with patch.object(redis, "get", side_effect=ConnectionError) as get:
+                for _ in range(3):
+                    with self.assertRaises(SessionStoreUnavailable):
+                        Session.from_session_key("key")
+                self.assertEqual(2, get.call_count)
+
+    def test_cache_errors_do_not_reject_sessions(self):
+        session = Session.from_party_id("party")
+
+        with app.app_context():
+            with patch.object(redis, "hmget", side_effect=ConnectionError), patch.dict(
+                app.config, {"SURVEY_LIST_SNAPSHOT_TTL": 30}
+            ):
+                for _ in range(app.config["REDIS_DEGRADED_THRESHOLD"] + 1):
+                    survey_list_snapshot.get("party", "todo")
+            self.assertTrue(redis_client.cache.degraded())
+
+            self.assertEqual("party", Session.from_session_key(session.session_key).get_party_id())
+
+    def test_failed_session_refresh_keeps_session(self):
+        session = Session.from_party_id("party")
+        encoded_jwt = session.get_encoded_jwt()
+
+        with app.app_context():
+            with patch.object(redis, "setex", side_effect=ConnectionError):
+                self.assertFalse(session.refresh_session())
+
+        self.assertEqual(session.get_encoded_jwt(), encoded_jwt)
+        self.assertEqual(redis.get(session.session_key), encoded_jwt.encode())
+
+    @patch("frontstage.common.redis_cache.get_collection_instrument")
+    def test_cache_skips_redis_when_degraded(self, get_collection_instrument):
+        get_collection_instrument.return_value = {"type": "EQ"}
+        local_cache.clear_all()
+
+        with app.app_context(), patch.dict(app.config, {"REDIS_DEGRADED_THRESHOLD": 1}):
+            redis_client.cache.record_failure()
+            with patch.object(redis, "get") as get, patch.object(redis, "set") as set_:
+                self.assertEqual(RedisCache().get_collection_instrument("ci"), {"type": "EQ"})
+                get.assert_not_called()
+                set_.assert_not_called()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import Mock
+
+from frontstage import app
+from frontstage.common.request_memo import request_memoized
+
+
+class TestRequestMemo(unittest.TestCase):
+    def setUp(self):
+        self.lookup = Mock(side_effect=lambda *args, **kwargs: {"args": args, "kwargs": kwargs})
+        self.memoized = request_memoized(self.lookup)
+
+    def test_calls_collapse_within_a_request(self):
+        with app.test_request_context():
+            first = self.memoized("a", flag=True)
+            second = self.memoized("a", flag=True)
+            self.memoized("b")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.lookup.call_count, 2)
+
+    def test_memo_does_not_outlive_the_request(self):
+        with app.test_request_context():
+            self.memoized("a")
+        with app.test_request_context():
+            self.memoized("a")
+
+        self.assertEqual(self.lookup.call_count, 2)
+
+    def test_not_memoized_outside_a_request(self):
+        with app.app_context():
+            self.memoized("a")
+            self.memoized("a")
+
+        self.assertEqual(self.lookup.call_count, 2)
+
+    def test_exceptions_are_not_memoized(self):
+        self.lookup.side_effect = [ValueError("failed"), "ok"]
+        with app.test_request_context():
+            with self.assertRaises(ValueError):
+                self.memoized("a")
+            self.assertEqual(self.memoized("a"), "ok")
+
+    def test_unhashable_arguments_are_not_memoized(self):
+        with app.test_request_context():
+            self.memoized(["a"])
+            self.memoized(["a"])
+
+        self.assertEqual(self.lookup.call_count, 2)
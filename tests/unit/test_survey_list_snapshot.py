@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+
+from frontstage import app, redis
+from frontstage.common import party_cache, survey_list_snapshot
+
+party_id = "07d672bc-497b-448f-a406-a20a7e6013d7"
+other_party_id = "f956e8ae-6e0f-4414-b0cf-a07c1aa3e37b"
+todo = [{"case_id": "8cdc01f9-656a-4715-a148-ffed0dbe1b04"}]
+
+
+class TestSurveyListSnapshot(unittest.TestCase):
+    def setUp(self):
+        redis.flushall()
+        self.app_context = app.app_context()
+        self.app_context.push()
+        self.config = patch.dict(app.config, {"SURVEY_LIST_SNAPSHOT_TTL": 30})
+        self.config.start()
+
+    def tearDown(self):
+        self.config.stop()
+        self.app_context.pop()
+
+    def test_saved_snapshot_is_used(self):
+        survey_list_snapshot.save(party_id, "todo", todo, survey_list_snapshot.version(party_id))
+
+        self.assertEqual(todo, survey_list_snapshot.get(party_id, "todo"))
+        self.assertIsNone(survey_list_snapshot.get(party_id, "history"))
+        self.assertIsNone(survey_list_snapshot.get(other_party_id, "todo"))
+
+    def test_snapshots_expire_with_the_first_snapshot_saved(self):
+        survey_list_snapshot.save(party_id, "todo", todo, survey_list_snapshot.version(party_id))
+        redis.expire(f"frontstage:survey-list:{party_id}", 5)
+
+        # Saving another snapshot doesn't keep the first one for longer than the TTL
+        survey_list_snapshot.save(party_id, "history", todo, survey_list_snapshot.version(party_id))
+
+        self.assertEqual(5, redis.ttl(f"frontstage:survey-list:{party_id}"))
+
+    def test_invalidated_snapshot_is_not_used(self):
+        survey_list_snapshot.save(party_id, "todo", todo, survey_list_snapshot.version(party_id))
+        survey_list_snapshot.save(other_party_id, "todo", todo, survey_list_snapshot.version(other_party_id))
+
+        survey_list_snapshot.invalidate(party_id)
+
+        self.assertIsNone(survey_list_snapshot.get(party_id, "todo"))
+        self.assertEqual(todo, survey_list_snapshot.get(other_party_id, "todo"))
+
+    def test_snapshot_started_before_invalidation_is_not_used(self):
+        # The list was being built when the respondent's surveys changed, so may not include the change
+        version = survey_list_snapshot.version(party_id)
+        survey_list_snapshot.invalidate(party_id)
+        survey_list_snapshot.save(party_id, "todo", todo, version)
+
+        self.assertIsNone(survey_list_snapshot.get(party_id, "todo"))
+
+        survey_list_snapshot.save(party_id, "todo", todo, survey_list_snapshot.version(party_id))
+        self.assertEqual(todo, survey_list_snapshot.get(party_id, "todo"))
+
+    def test_invalidation_does_not_depend_on_clocks(self):
+        # A pod whose clock is ahead saves a snapshot, which another pod then invalidates
+        with patch("time.time", return_value=10**10):
+            survey_list_snapshot.save(party_id, "todo", todo, survey_list_snapshot.version(party_id))
+        survey_list_snapshot.invalidate(party_id)
+
+        self.assertIsNone(survey_list_snapshot.get(party_id, "todo"))
+
+    def test_no_ttl_disables_snapshots(self):
+        app.config["SURVEY_LIST_SNAPSHOT_TTL"] = 0
+
+        self.assertIsNone(survey_list_snapshot.version(party_id))
+        survey_list_snapshot.save(party_id, "todo", todo, 0)
+
+        self.assertIsNone(survey_list_snapshot.get(party_id, "todo"))
+        self.assertEqual([], redis.keys("frontstage:survey-list:*"))
+
+    def test_stats_count_hits_and_misses(self):
+        before = survey_list_snapshot.snapshots.stats()
+
+        survey_list_snapshot.get(party_id, "todo")
+        survey_list_snapshot.save(party_id, "todo", todo, survey_list_snapshot.version(party_id))
+        survey_list_snapshot.get(party_id, "todo")
+        survey_list_snapshot.invalidate(party_id)
+        survey_list_snapshot.get(party_id, "todo")
+
+        stats = survey_list_snapshot.snapshots.stats()
+        self.assertEqual(1, stats["hits"] - before["hits"])
+        self.assertEqual(2, stats["misses"] - before["misses"])
+        self.assertEqual(1, stats["invalidated_misses"] - before["invalidated_misses"])
+        self.assertEqual(1, stats["invalidations"] - before["invalidations"])
+        self.assertEqual(stats, party_cache.stats()["survey-list"])